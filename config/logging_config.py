@@ -14,39 +14,69 @@ except ImportError:
     DEBUG_MODE = True
     LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Size-only rotation threshold for log files (50 MB)
+LOG_ROTATION_BYTES = 50 * 1024 * 1024
 
-def setup_logging():
+# Log formats (markup tags are only rendered when colorizing)
+COLOR_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+PLAIN_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+
+
+# Set once sinks are installed so repeated setup_logging() calls are no-ops
+_configured = False
+
+
+def setup_logging(force: bool = False):
     """
     Configure loguru logger with file and console output
+
+    Args:
+        force: Reinstall the sinks even if logging is already configured
     """
+    global _configured
+    if _configured and not force:
+        return logger
+    _configured = True
+
     # Remove default handler
     logger.remove()
 
-    # Console handler with color
+    # Console handler, colored only when attached to a terminal
     log_level = "DEBUG" if DEBUG_MODE else "INFO"
+    is_tty = sys.stdout.isatty()
     logger.add(
         sys.stdout,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+        format=COLOR_FORMAT if is_tty else PLAIN_FORMAT,
         level=log_level,
-        colorize=True
+        colorize=is_tty
     )
 
-    # File handler for all logs
+    # File handlers write from loguru's background queue (enqueue=True) through
+    # a page-sized buffer, keeping formatting, disk I/O and the gzip step of
+    # rotation off the caller's path
+
+    # File handler for all logs at the console level, so lazy DEBUG messages
+    # are never rendered when DEBUG_MODE is off
     logger.add(
         LOG_DIR / "app.log",
-        rotation="10 MB",
-        retention="7 days",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        level="DEBUG"
+        rotation=LOG_ROTATION_BYTES,
+        retention=7,
+        compression="gz",
+        format=PLAIN_FORMAT,
+        level=log_level,
+        enqueue=True,
+        buffering=8192
     )
 
     # File handler for errors only
     logger.add(
         LOG_DIR / "errors.log",
-        rotation="10 MB",
-        retention="30 days",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        level="ERROR"
+        rotation=LOG_ROTATION_BYTES,
+        retention=30,
+        compression="gz",
+        format=PLAIN_FORMAT,
+        level="ERROR",
+        enqueue=True
     )
 
     logger.info("Logging configured successfully")
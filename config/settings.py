@@ -1,55 +1,213 @@
 """
 Configuration Management for AI Security Decision Explainer
+
+Environment-driven settings are parsed once per process into a frozen
+``Settings`` instance (see ``get_settings``). Existing imports such as
+``from config.settings import DATA_DIR`` keep working through the
+module-level ``__getattr__``.
 """
 import os
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
+from types import MappingProxyType
+from dotenv import dotenv_values, find_dotenv
 
-# Load environment variables
-load_dotenv()
+# Importing this file under another name (e.g. with config/ itself on sys.path)
+# would create a second module with its own Settings cache and directory setup
+if __name__ != "config.settings":
+    raise ImportError(f"config/settings.py must be imported as 'config.settings', not {__name__!r}")
 
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent.parent
 
-# OpenAI API Configuration
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
-
-# ML Configuration
-RANDOM_SEED = int(os.getenv("RANDOM_SEED", "42"))
-TEST_SIZE = float(os.getenv("TEST_SIZE", "0.2"))
-CONFIDENCE_THRESHOLD = float(os.getenv("CONFIDENCE_THRESHOLD", "0.7"))
-
-# Dashboard Configuration
-DASHBOARD_HOST = os.getenv("DASHBOARD_HOST", "127.0.0.1")
-DASHBOARD_PORT = int(os.getenv("DASHBOARD_PORT", "8000"))
-DEBUG_MODE = os.getenv("DEBUG_MODE", "True").lower() == "true"
-
-# Data Paths
-DATA_DIR = PROJECT_ROOT / os.getenv("DATA_DIR", "data")
-MODEL_DIR = PROJECT_ROOT / os.getenv("MODEL_DIR", "data/models")
-LOG_DIR = PROJECT_ROOT / os.getenv("LOG_DIR", "logs")
-
-# Create directories if they don't exist
-DATA_DIR.mkdir(parents=True, exist_ok=True)
-MODEL_DIR.mkdir(parents=True, exist_ok=True)
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-
-# Data file paths
-RAW_DATA_DIR = DATA_DIR / "raw"
-PROCESSED_DATA_DIR = DATA_DIR / "processed"
-RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
-PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
-
-ALERTS_CSV_PATH = RAW_DATA_DIR / "alerts.csv"
-PROCESSED_FEATURES_PATH = PROCESSED_DATA_DIR / "features.csv"
-FEATURE_METADATA_PATH = PROCESSED_DATA_DIR / "feature_metadata.pkl"
-PROCESSED_ALERTS_PATH = PROCESSED_DATA_DIR / "processed_alerts.txt"
-
-# Model file paths
-MODEL_PATH = MODEL_DIR / "random_forest_model.pkl"
-SCALER_PATH = MODEL_DIR / "feature_scaler.pkl"
-ENCODER_PATH = MODEL_DIR / "feature_encoder.pkl"
+
+@lru_cache(maxsize=1)
+def _dotenv() -> dict:
+    """Parse the .env file once; a .env in the working directory wins over the project one"""
+    path = find_dotenv(usecwd=True) or PROJECT_ROOT / ".env"
+    return {key: value for key, value in dotenv_values(path).items() if value is not None}
+
+
+def _environ() -> dict:
+    """Process environment layered over .env values, without mutating os.environ"""
+    return {**_dotenv(), **os.environ}
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Environment-driven configuration values"""
+
+    # OpenAI API Configuration
+    OPENAI_API_KEY: str
+    OPENAI_MODEL: str
+
+    # ML Configuration
+    RANDOM_SEED: int
+    TEST_SIZE: float
+    CONFIDENCE_THRESHOLD: float
+    SHAP_USE_GPU: bool
+
+    # Dashboard Configuration
+    DASHBOARD_HOST: str
+    DASHBOARD_PORT: int
+    DEBUG_MODE: bool
+
+    # Data Paths (files and subdirectories are derived on first access below)
+    DATA_DIR: Path
+    MODEL_DIR: Path
+    LOG_DIR: Path
+
+    # Real-Time Processing Configuration
+    REALTIME_CHECK_INTERVAL: int  # seconds
+    REALTIME_ENABLED: bool
+
+    # Notification Configuration
+    SMTP_SERVER: str
+    SMTP_PORT: int
+    SMTP_USERNAME: str
+    SMTP_PASSWORD: str
+    FROM_EMAIL: str
+    ALERT_EMAIL_RECIPIENTS: str
+
+    # Slack Configuration
+    SLACK_WEBHOOK_URL: str
+    SLACK_ENABLED: bool
+
+    # Microsoft Teams Configuration
+    TEAMS_WEBHOOK_URL: str
+    TEAMS_ENABLED: bool
+
+    # Data directories
+    @cached_property
+    def RAW_DATA_DIR(self) -> Path:
+        return self.DATA_DIR / "raw"
+
+    @cached_property
+    def PROCESSED_DATA_DIR(self) -> Path:
+        return self.DATA_DIR / "processed"
+
+    # Data file paths
+    @cached_property
+    def ALERTS_CSV_PATH(self) -> Path:
+        return self.RAW_DATA_DIR / "alerts.csv"
+
+    @cached_property
+    def ALERTS_PARQUET_PATH(self) -> Path:
+        return self.RAW_DATA_DIR / "alerts.parquet"
+
+    @cached_property
+    def PROCESSED_FEATURES_PATH(self) -> Path:
+        return self.PROCESSED_DATA_DIR / "features.csv"
+
+    @cached_property
+    def FEATURE_METADATA_PATH(self) -> Path:
+        return self.PROCESSED_DATA_DIR / "feature_metadata.pkl"
+
+    @cached_property
+    def PROCESSED_ALERTS_PATH(self) -> Path:
+        return self.PROCESSED_DATA_DIR / "processed_alerts.txt"
+
+    @cached_property
+    def LLM_CACHE_PATH(self) -> Path:
+        return self.PROCESSED_DATA_DIR / "llm_cache.sqlite"
+
+    @cached_property
+    def SHAP_CACHE_DIR(self) -> Path:
+        return self.PROCESSED_DATA_DIR / "shap_cache"
+
+    # Model file paths
+    @cached_property
+    def MODEL_PATH(self) -> Path:
+        return self.MODEL_DIR / "random_forest_model.pkl"
+
+    @cached_property
+    def SCALER_PATH(self) -> Path:
+        return self.MODEL_DIR / "feature_scaler.pkl"
+
+    @cached_property
+    def ENCODER_PATH(self) -> Path:
+        return self.MODEL_DIR / "feature_encoder.pkl"
+
+    @classmethod
+    def from_env(cls) -> 'Settings':
+        """Build settings from environment variables (and the .env file)"""
+        env = _environ()
+
+        slack_webhook_url = env.get("SLACK_WEBHOOK_URL", "")
+        teams_webhook_url = env.get("TEAMS_WEBHOOK_URL", "")
+
+        return cls(
+            OPENAI_API_KEY=env.get("OPENAI_API_KEY", ""),
+            OPENAI_MODEL=env.get("OPENAI_MODEL", "gpt-4"),
+
+            RANDOM_SEED=int(env.get("RANDOM_SEED", "42")),
+            TEST_SIZE=float(env.get("TEST_SIZE", "0.2")),
+            CONFIDENCE_THRESHOLD=float(env.get("CONFIDENCE_THRESHOLD", "0.7")),
+            SHAP_USE_GPU=env.get("SHAP_USE_GPU", "False").lower() == "true",
+
+            DASHBOARD_HOST=env.get("DASHBOARD_HOST", "127.0.0.1"),
+            DASHBOARD_PORT=int(env.get("DASHBOARD_PORT", "8000")),
+            DEBUG_MODE=env.get("DEBUG_MODE", "True").lower() == "true",
+
+            DATA_DIR=PROJECT_ROOT / env.get("DATA_DIR", "data"),
+            MODEL_DIR=PROJECT_ROOT / env.get("MODEL_DIR", "data/models"),
+            LOG_DIR=PROJECT_ROOT / env.get("LOG_DIR", "logs"),
+
+            REALTIME_CHECK_INTERVAL=int(env.get("REALTIME_CHECK_INTERVAL", "60")),
+            REALTIME_ENABLED=env.get("REALTIME_ENABLED", "False").lower() == "true",
+
+            SMTP_SERVER=env.get("SMTP_SERVER", "smtp.gmail.com"),
+            SMTP_PORT=int(env.get("SMTP_PORT", "587")),
+            SMTP_USERNAME=env.get("SMTP_USERNAME", ""),
+            SMTP_PASSWORD=env.get("SMTP_PASSWORD", ""),
+            FROM_EMAIL=env.get("FROM_EMAIL", "security-ai@yourcompany.com"),
+            ALERT_EMAIL_RECIPIENTS=env.get("ALERT_EMAIL_RECIPIENTS", "soc-team@yourcompany.com"),
+
+            SLACK_WEBHOOK_URL=slack_webhook_url,
+            SLACK_ENABLED=bool(slack_webhook_url),
+
+            TEAMS_WEBHOOK_URL=teams_webhook_url,
+            TEAMS_ENABLED=bool(teams_webhook_url),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings instance"""
+    return Settings.from_env()
+
+
+# Directories created on first access to any *_DIR / *_PATH setting
+_DIR_SETTINGS = ("DATA_DIR", "MODEL_DIR", "LOG_DIR", "RAW_DATA_DIR", "PROCESSED_DATA_DIR")
+_created = set()
+
+
+def _ensure_dirs(settings: Settings):
+    """Create the data/model/log directories once per process"""
+    if os.environ.get("SKIP_DIR_INIT", _dotenv().get("SKIP_DIR_INIT")) == "1":
+        return
+
+    for name in _DIR_SETTINGS:
+        path = getattr(settings, name)
+        if path not in _created:
+            path.mkdir(parents=True, exist_ok=True)
+            _created.add(path)
+
+
+def __getattr__(name):
+    """Delegate module attribute access to the cached Settings instance"""
+    settings = get_settings()
+    try:
+        value = getattr(settings, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    if name.endswith(("_DIR", "_PATH")):
+        _ensure_dirs(settings)
+
+    return value
+
 
 # Synthetic Data Generation Configuration
 NUM_ALERTS = 10000
@@ -61,16 +219,22 @@ MALICIOUS_RATIO = 0.15
 N_ESTIMATORS_OPTIONS = [100, 200, 300]
 MAX_DEPTH_OPTIONS = [10, 20, None]
 MIN_SAMPLES_SPLIT_OPTIONS = [2, 5, 10]
+RF_MAX_SAMPLES = 0.7  # Fraction of training rows bootstrapped per tree
 
 # XAI Configuration
 TOP_N_FEATURES = 10  # Number of top features to display
 
 # LLM Configuration
 LLM_MAX_TOKENS = 300
-LLM_TEMPERATURE = 0.3
+LLM_TEMPERATURE = 0.0  # Deterministic, cacheable explanations
+LLM_PROMPT_TOP_FEATURES = 5  # SHAP features included in the prompt
+LLM_BATCH_SIZE = 5  # Alerts explained per request in batch mode
+LLM_BATCH_MAX_PROMPT_TOKENS = 6000  # Estimated alert-context tokens per batched request
+LLM_CACHE_MAX_ENTRIES = 10000  # Oldest responses are evicted beyond this
 
+# Lookup tables below are read-only views built once at import
 # Feature name mapping (technical -> human-readable)
-FEATURE_NAME_MAPPING = {
+FEATURE_NAME_MAPPING = MappingProxyType({
     "failed_login_attempts": "Failed Authentication Count",
     "successful_login_after_failures": "Successful Login After Failures",
     "process_hash_known": "Known Process Hash",
@@ -89,7 +253,7 @@ FEATURE_NAME_MAPPING = {
     "login_risk_score": "Login Risk Score",
     "privilege_risk": "Privilege Risk Score",
     "threat_indicator_count": "Total Threat Indicators",
-}
+})
 
 # Alert labels
 LABEL_BENIGN = "benign"
@@ -99,47 +263,27 @@ LABEL_MALICIOUS = "malicious"
 ALERT_LABELS = [LABEL_BENIGN, LABEL_SUSPICIOUS, LABEL_MALICIOUS]
 
 # Color coding for dashboard
-LABEL_COLORS = {
+LABEL_COLORS = MappingProxyType({
     LABEL_BENIGN: "#28a745",      # Green
     LABEL_SUSPICIOUS: "#ffc107",  # Yellow
     LABEL_MALICIOUS: "#dc3545"    # Red
-}
-
-# Real-Time Processing Configuration
-REALTIME_CHECK_INTERVAL = int(os.getenv("REALTIME_CHECK_INTERVAL", "60"))  # seconds
-REALTIME_ENABLED = os.getenv("REALTIME_ENABLED", "False").lower() == "true"
-
-# Notification Configuration
-SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
-SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
-FROM_EMAIL = os.getenv("FROM_EMAIL", "security-ai@yourcompany.com")
-ALERT_EMAIL_RECIPIENTS = os.getenv("ALERT_EMAIL_RECIPIENTS", "soc-team@yourcompany.com")
-
-# Slack Configuration
-SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL", "")
-SLACK_ENABLED = bool(SLACK_WEBHOOK_URL)
-
-# Microsoft Teams Configuration
-TEAMS_WEBHOOK_URL = os.getenv("TEAMS_WEBHOOK_URL", "")
-TEAMS_ENABLED = bool(TEAMS_WEBHOOK_URL)
+})
 
 # Alert Routing Rules
-NOTIFICATION_RULES = {
-    LABEL_MALICIOUS: {
-        "channels": ["email", "slack", "teams"],
+NOTIFICATION_RULES = MappingProxyType({
+    LABEL_MALICIOUS: MappingProxyType({
+        "channels": ("email", "slack", "teams"),
         "priority": "critical",
         "immediate": True
-    },
-    LABEL_SUSPICIOUS: {
-        "channels": ["slack", "email"],
+    }),
+    LABEL_SUSPICIOUS: MappingProxyType({
+        "channels": ("slack", "email"),
         "priority": "warning",
         "immediate": False
-    },
-    LABEL_BENIGN: {
-        "channels": [],  # No notifications
+    }),
+    LABEL_BENIGN: MappingProxyType({
+        "channels": (),  # No notifications
         "priority": "info",
         "immediate": False
-    }
-}
+    })
+})
@@ -5,34 +5,256 @@ Sends notifications via Email, Slack, Teams, and SMS
 Created by Kavi
 """
 
-import smtplib
-import requests
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from loguru import logger
-from typing import Dict, List
-import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+import contextlib
+import queue
+import sys
+import threading
+import time
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import NOTIFICATION_RULES, get_settings
+
+
+def _build_mime(from_email: str, to_addresses: List[str], subject: str, body: str, html: bool) -> bytes:
+    """
+    Render an email to wire-format bytes
+
+    Args:
+        from_email: Sender address
+        to_addresses: Recipient addresses
+        subject: Email subject
+        body: Email body
+        html: Whether body is HTML
+
+    Returns:
+        CRLF-terminated message bytes ready for SMTP.sendmail
+    """
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+
+    msg = MIMEMultipart('alternative')
+    msg['From'] = from_email
+    msg['To'] = ', '.join(to_addresses)
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'html' if html else 'plain'))
+
+    return msg.as_bytes(policy=msg.policy.clone(linesep='\r\n'))
 
 
 class AlertNotifier:
     """Sends notifications through multiple channels"""
 
-    def __init__(self):
-        """Initialize notification channels"""
+    # Static parts of the webhook payloads, built once and merged per alert
+    _SLACK_COLORS = {
+        'malicious': '#FF0054',  # Red
+        'suspicious': '#FFBE0B',  # Yellow
+        'benign': '#06FFA5'  # Green
+    }
+    _SLACK_EMOJIS = {
+        'malicious': '🚨',
+        'suspicious': '⚠️',
+        'benign': '✅'
+    }
+    _SLACK_MESSAGE = {
+        "username": "AI Security Explainer",
+        "icon_emoji": ":shield:",
+    }
+    _SLACK_ATTACHMENT = {
+        "footer": "Created by Kavi",
+        "footer_icon": "https://platform.slack-edge.com/img/default_application_icon.png",
+    }
+
+    _TEAMS_COLORS = {
+        'malicious': 'attention',  # Red
+        'suspicious': 'warning',  # Yellow
+        'benign': 'good'  # Green
+    }
+    _TEAMS_MESSAGE = {
+        "@type": "MessageCard",
+        "@context": "https://schema.org/extensions",
+        "potentialAction": [
+            {
+                "@type": "OpenUri",
+                "name": "View Dashboard",
+                "targets": [
+                    {"os": "default", "uri": "http://your-dashboard-url"}
+                ]
+            }
+        ]
+    }
+
+    def __init__(self, background: bool = True):
+        """
+        Initialize notification channels
+
+        Args:
+            background: Deliver Slack/Teams webhooks from a background thread
+                        so notify_all doesn't block on network I/O
+        """
+        settings = get_settings()
+
         # Email configuration
-        self.smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
-        self.smtp_port = int(os.getenv('SMTP_PORT', '587'))
-        self.smtp_username = os.getenv('SMTP_USERNAME', '')
-        self.smtp_password = os.getenv('SMTP_PASSWORD', '')
-        self.from_email = os.getenv('FROM_EMAIL', 'security-ai@yourcompany.com')
+        self.smtp_server = settings.SMTP_SERVER
+        self.smtp_port = settings.SMTP_PORT
+        self.smtp_username = settings.SMTP_USERNAME
+        self.smtp_password = settings.SMTP_PASSWORD
+        self.from_email = settings.FROM_EMAIL
+        self.alert_email_recipients = [
+            address.strip() for address in settings.ALERT_EMAIL_RECIPIENTS.split(',') if address.strip()
+        ]
 
         # Slack configuration
-        self.slack_webhook = os.getenv('SLACK_WEBHOOK_URL', '')
+        self.slack_webhook = settings.SLACK_WEBHOOK_URL
 
         # Microsoft Teams configuration
-        self.teams_webhook = os.getenv('TEAMS_WEBHOOK_URL', '')
+        self.teams_webhook = settings.TEAMS_WEBHOOK_URL
+
+        # Shared HTTP session for webhook POSTs (created on first use)
+        self._session = None
+
+        # Background delivery queue for webhook notifications
+        self._queue = queue.Queue(maxsize=1024)
+        self._worker = None
+        if background and (self.slack_webhook or self.teams_webhook):
+            self._worker = threading.Thread(target=self._drain, name="alert-notifier", daemon=True)
+            self._worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    def send_email(self, to_addresses: List[str], subject: str, body: str, html: bool = False):
+    def close(self, timeout: float = None):
+        """
+        Deliver pending notifications, stop the worker and close the HTTP session
+
+        Args:
+            timeout: Maximum seconds to wait for pending notifications
+        """
+        if self._worker is not None:
+            self.flush(timeout)
+            self._queue.put(None)
+            self._worker.join(timeout)
+            self._worker = None
+
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until all queued notifications have been delivered
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the queue drained, False if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+
+        return True
+
+    def _drain(self):
+        """Worker loop: deliver queued (channel, alert_data) items"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+
+                channel, alert_data = item
+                self._send(channel, alert_data)
+
+            except Exception as e:
+                logger.error(f"Notification worker error: {e}")
+
+            finally:
+                self._queue.task_done()
+
+    def _send(self, channel: str, alert_data: Dict):
+        """Send one webhook notification synchronously"""
+        if channel == 'slack':
+            self.send_slack_message(alert_data)
+        elif channel == 'teams':
+            self.send_teams_message(alert_data)
+
+    def _dispatch(self, channel: str, alert_data: Dict):
+        """Queue a webhook notification, or send it inline without a worker"""
+        if self._worker is None:
+            self._send(channel, alert_data)
+            return
+
+        try:
+            self._queue.put_nowait((channel, alert_data))
+        except queue.Full:
+            logger.warning(f"Notification queue full, sending {channel} message inline")
+            self._send(channel, alert_data)
+
+    def _get_session(self):
+        """
+        Get the keep-alive HTTP session used for Slack/Teams webhooks
+
+        Reusing one session avoids a DNS lookup, TCP connect and TLS
+        handshake on every notification.
+        """
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util import Retry
+
+            retry = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(['POST'])
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._session = session
+
+        return self._session
+
+    def _post_json(self, url: str, message: Dict):
+        """POST a webhook payload serialized with orjson"""
+        import orjson
+
+        response = self._get_session().post(
+            url,
+            data=orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY),
+            headers={"Content-Type": "application/json"},
+            timeout=10
+        )
+        response.raise_for_status()
+
+    @contextlib.contextmanager
+    def _smtp_session(self):
+        """Yield a connected, authenticated SMTP session"""
+        # Imported lazily: most notifications only go to one channel
+        import smtplib
+
+        with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            server.starttls()
+            server.login(self.smtp_username, self.smtp_password)
+            yield server
+
+    def send_email(self, to_addresses: List[str], subject: str, body: str, html: bool = False, server=None):
         """
         Send email notification
 
@@ -41,29 +263,44 @@ class AlertNotifier:
             subject: Email subject
             body: Email body
             html: Whether body is HTML
+            server: Optional already-open SMTP session (see send_emails_batch)
         """
         try:
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.from_email
-            msg['To'] = ', '.join(to_addresses)
-            msg['Subject'] = subject
-
-            if html:
-                msg.attach(MIMEText(body, 'html'))
-            else:
-                msg.attach(MIMEText(body, 'plain'))
+            msg = _build_mime(self.from_email, to_addresses, subject, body, html)
 
             # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
+            if server is None:
+                with self._smtp_session() as server:
+                    server.sendmail(self.from_email, to_addresses, msg)
+            else:
+                server.sendmail(self.from_email, to_addresses, msg)
 
             logger.success(f"📧 Email sent to {', '.join(to_addresses)}")
 
         except Exception as e:
             logger.error(f"Failed to send email: {e}")
 
+    def send_emails_batch(self, messages: List[Tuple[List[str], str, str]], html: bool = False):
+        """
+        Send several emails over a single SMTP session
+
+        Connecting, STARTTLS and AUTH happen once for the whole batch
+        instead of once per message.
+
+        Args:
+            messages: List of (to_addresses, subject, body) tuples
+            html: Whether bodies are HTML
+        """
+        if not messages:
+            return
+
+        try:
+            with self._smtp_session() as server:
+                for to_addresses, subject, body in messages:
+                    self.send_email(to_addresses, subject, body, html=html, server=server)
+        except Exception as e:
+            logger.error(f"Failed to open SMTP session: {e}")
+
     def send_slack_message(self, alert_data: Dict):
         """
         Send Slack notification
@@ -78,67 +315,30 @@ class AlertNotifier:
         try:
             verdict = alert_data['verdict']
             confidence = alert_data['confidence']
-
-            # Determine color based on verdict
-            color_map = {
-                'malicious': '#FF0054',  # Red
-                'suspicious': '#FFBE0B',  # Yellow
-                'benign': '#06FFA5'  # Green
-            }
-            color = color_map.get(verdict, '#00F5FF')
-
-            # Determine emoji
-            emoji_map = {
-                'malicious': '🚨',
-                'suspicious': '⚠️',
-                'benign': '✅'
-            }
-            emoji = emoji_map.get(verdict, '🔔')
+            details = alert_data.get('alert_data', {})
+            emoji = self._SLACK_EMOJIS.get(verdict, '🔔')
 
             message = {
-                "username": "AI Security Explainer",
-                "icon_emoji": ":shield:",
+                **self._SLACK_MESSAGE,
                 "attachments": [
                     {
-                        "color": color,
+                        **self._SLACK_ATTACHMENT,
+                        "color": self._SLACK_COLORS.get(verdict, '#00F5FF'),
                         "title": f"{emoji} Security Alert: {verdict.upper()}",
                         "text": alert_data.get('explanation', ''),
                         "fields": [
-                            {
-                                "title": "Alert ID",
-                                "value": alert_data.get('alert_id', 'N/A'),
-                                "short": True
-                            },
-                            {
-                                "title": "Confidence",
-                                "value": f"{confidence*100:.1f}%",
-                                "short": True
-                            },
-                            {
-                                "title": "Source IP",
-                                "value": alert_data.get('alert_data', {}).get('source_ip', 'N/A'),
-                                "short": True
-                            },
-                            {
-                                "title": "Process",
-                                "value": alert_data.get('alert_data', {}).get('process_executed', 'N/A'),
-                                "short": True
-                            },
-                            {
-                                "title": "Recommended Action",
-                                "value": alert_data.get('recommended_action', 'Monitor'),
-                                "short": False
-                            }
+                            {"title": "Alert ID", "value": alert_data.get('alert_id', 'N/A'), "short": True},
+                            {"title": "Confidence", "value": f"{confidence*100:.1f}%", "short": True},
+                            {"title": "Source IP", "value": details.get('source_ip', 'N/A'), "short": True},
+                            {"title": "Process", "value": details.get('process_executed', 'N/A'), "short": True},
+                            {"title": "Recommended Action", "value": alert_data.get('recommended_action', 'Monitor'), "short": False}
                         ],
-                        "footer": "Created by Kavi",
-                        "footer_icon": "https://platform.slack-edge.com/img/default_application_icon.png",
                         "ts": int(alert_data.get('timestamp', 0))
                     }
                 ]
             }
 
-            response = requests.post(self.slack_webhook, json=message, timeout=10)
-            response.raise_for_status()
+            self._post_json(self.slack_webhook, message)
 
             logger.success("💬 Slack notification sent")
 
@@ -159,20 +359,12 @@ class AlertNotifier:
         try:
             verdict = alert_data['verdict']
             confidence = alert_data['confidence']
-
-            # Determine color
-            color_map = {
-                'malicious': 'attention',  # Red
-                'suspicious': 'warning',  # Yellow
-                'benign': 'good'  # Green
-            }
-            theme_color = color_map.get(verdict, 'accent')
+            details = alert_data.get('alert_data', {})
 
             message = {
-                "@type": "MessageCard",
-                "@context": "https://schema.org/extensions",
+                **self._TEAMS_MESSAGE,
                 "summary": f"Security Alert: {verdict.upper()}",
-                "themeColor": theme_color,
+                "themeColor": self._TEAMS_COLORS.get(verdict, 'accent'),
                 "title": f"🛡️ AI Security Alert: {verdict.upper()}",
                 "sections": [
                     {
@@ -180,8 +372,8 @@ class AlertNotifier:
                         "facts": [
                             {"name": "Alert ID:", "value": alert_data.get('alert_id', 'N/A')},
                             {"name": "Confidence:", "value": f"{confidence*100:.1f}%"},
-                            {"name": "Source IP:", "value": alert_data.get('alert_data', {}).get('source_ip', 'N/A')},
-                            {"name": "Process:", "value": alert_data.get('alert_data', {}).get('process_executed', 'N/A')},
+                            {"name": "Source IP:", "value": details.get('source_ip', 'N/A')},
+                            {"name": "Process:", "value": details.get('process_executed', 'N/A')},
                             {"name": "Action:", "value": alert_data.get('recommended_action', 'Monitor')}
                         ]
                     },
@@ -189,20 +381,10 @@ class AlertNotifier:
                         "activityTitle": "AI Explanation",
                         "text": alert_data.get('explanation', '')
                     }
-                ],
-                "potentialAction": [
-                    {
-                        "@type": "OpenUri",
-                        "name": "View Dashboard",
-                        "targets": [
-                            {"os": "default", "uri": "http://your-dashboard-url"}
-                        ]
-                    }
                 ]
             }
 
-            response = requests.post(self.teams_webhook, json=message, timeout=10)
-            response.raise_for_status()
+            self._post_json(self.teams_webhook, message)
 
             logger.success("📢 Teams notification sent")
 
@@ -216,22 +398,20 @@ class AlertNotifier:
         Args:
             alert_data: Alert information
             channels: List of channels to use ['email', 'slack', 'teams']
-                     If None, uses all available channels
+                     If None, uses the NOTIFICATION_RULES channels for the verdict
         """
         verdict = alert_data['verdict']
 
-        # Default channels based on severity
+        # Default channels based on severity (none for benign)
         if channels is None:
-            if verdict == 'malicious':
-                channels = ['email', 'slack', 'teams']
-            elif verdict == 'suspicious':
-                channels = ['slack', 'email']
-            else:
-                channels = []  # Don't notify for benign
+            rule = NOTIFICATION_RULES.get(verdict)
+            channels = rule['channels'] if rule else ()
+
+        if not channels:
+            return
 
         # Send to each channel
-        if 'email' in channels and self.smtp_username:
-            recipients = os.getenv('ALERT_EMAIL_RECIPIENTS', 'soc-team@yourcompany.com').split(',')
+        if 'email' in channels and self.smtp_username and self.alert_email_recipients:
             subject = f"🚨 Security Alert: {verdict.upper()}"
 
             body = f"""
@@ -257,20 +437,17 @@ This alert was generated by AI Security Decision Explainer
 Created by Kavi
             """
 
-            self.send_email(recipients, subject, body)
+            self.send_email(self.alert_email_recipients, subject, body)
 
         if 'slack' in channels:
-            self.send_slack_message(alert_data)
+            self._dispatch('slack', alert_data)
 
         if 'teams' in channels:
-            self.send_teams_message(alert_data)
+            self._dispatch('teams', alert_data)
 
 
 # Example usage
 if __name__ == "__main__":
-    # Test notification
-    notifier = AlertNotifier()
-
     test_alert = {
         'alert_id': 'test-123',
         'timestamp': '2024-01-01T12:00:00',
@@ -292,4 +469,5 @@ if __name__ == "__main__":
     print("  - TEAMS_WEBHOOK_URL")
 
     # Send test notifications
-    notifier.notify_all(test_alert, channels=['slack'])
+    with AlertNotifier() as notifier:
+        notifier.notify_all(test_alert, channels=['slack'])
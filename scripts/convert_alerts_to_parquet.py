@@ -0,0 +1,53 @@
+"""
+Convert Alerts CSV to Parquet
+
+Standalone script to write the columnar copy of the alerts CSV that
+AlertLoader reads instead of the CSV text.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ingestion.alert_loader import AlertLoader
+from config.settings import ALERTS_CSV_PATH
+from config.logging_config import logger
+
+
+def main():
+    """Convert the alerts CSV to parquet"""
+    logger.info("=" * 60)
+    logger.info("CONVERTING ALERTS TO PARQUET")
+    logger.info("=" * 60)
+
+    try:
+        if not ALERTS_CSV_PATH.exists():
+            logger.error(f"Alerts file not found: {ALERTS_CSV_PATH}")
+            logger.error("Please run 'python scripts/generate_data.py' first")
+            sys.exit(1)
+
+        # Always parse the CSV itself; an existing parquet copy may be stale
+        df = AlertLoader._read_csv(ALERTS_CSV_PATH)
+        AlertLoader._validate_columns(df)
+
+        parquet_path = ALERTS_CSV_PATH.with_suffix(".parquet")
+        AlertLoader.write_parquet(df, parquet_path)
+
+        csv_mb = ALERTS_CSV_PATH.stat().st_size / 1024 / 1024
+        parquet_mb = parquet_path.stat().st_size / 1024 / 1024
+        logger.info("Wrote {} alerts to {}", len(df), parquet_path)
+        logger.info("Size: {:.2f} MB CSV -> {:.2f} MB parquet", csv_mb, parquet_mb)
+
+        logger.info("\n" + "=" * 60)
+        logger.info("Conversion successful!")
+        logger.info("=" * 60)
+
+    except Exception as e:
+        logger.error(f"Error converting alerts: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
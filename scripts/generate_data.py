@@ -23,15 +23,20 @@ def main():
     try:
         alerts = generate_and_save_alerts()
 
-        logger.info(f"\nGeneration complete!")
-        logger.info(f"Total alerts: {len(alerts)}")
-        logger.info(f"\nLabel distribution:")
-        for label, count in alerts['label'].value_counts().items():
-            percentage = (count / len(alerts)) * 100
-            logger.info(f"  {label}: {count} ({percentage:.1f}%)")
-
-        logger.info("\nSample alerts:")
-        logger.info(alerts.head(3).to_string())
+        logger.info("\nGeneration complete!")
+        logger.info("Total alerts: {}", len(alerts))
+
+        # One record for the whole distribution instead of one per label
+        label_counts = alerts['label'].value_counts()
+        label_pct = label_counts / len(alerts) * 100
+        distribution = "\n".join(
+            f"  {label}: {count} ({pct:.1f}%)"
+            for label, count, pct in zip(label_counts.index, label_counts, label_pct)
+        )
+        logger.info("\nLabel distribution:\n{}", distribution)
+
+        # Rendering the sample table is only worth it when DEBUG is enabled
+        logger.opt(lazy=True).debug("\nSample alerts:\n{}", lambda: alerts.head(3).to_string())
 
         logger.info("\n" + "=" * 60)
         logger.info("Data generation successful!")
@@ -5,10 +5,13 @@ Continuously monitors for new alerts and processes them through the AI pipeline
 Created by Kavi
 """
 
+import io
 import time
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+from typing import List
 from loguru import logger
 import sys
 
@@ -21,12 +24,22 @@ from src.ml_engine.model_trainer import ModelTrainer
 from src.ml_engine.model_predictor import ModelPredictor
 from src.xai.shap_explainer import SHAPExplainer
 from src.llm_engine.claude_client import ClaudeExplainer
-from config.settings import ALERTS_CSV_PATH, ALERT_LABELS, PROCESSED_ALERTS_PATH
+from src.utils.bloom_filter import BloomFilter
+from config.settings import ALERTS_CSV_PATH, PROCESSED_ALERTS_PATH, LLM_BATCH_SIZE
 
 
 class RealTimeProcessor:
     """Real-time alert processing engine"""
 
+    # Maximum alerts run through the pipeline together
+    BATCH_SIZE = 256
+
+    # Concurrent LLM requests per batch
+    LLM_WORKERS = 8
+
+    # Benign verdicts above this confidence reuse a baseline SHAP explanation
+    SHAP_SKIP_CONFIDENCE = 0.95
+
     def __init__(self):
         """Initialize the processor"""
         logger.info("🚀 Initializing Real-Time AI Security Processor")
@@ -44,7 +57,7 @@ class RealTimeProcessor:
 
         # Initialize explainers
         self.model = self.model_trainer.model
-        self.predictor = ModelPredictor(self.model)
+        self.predictor = ModelPredictor(self.model, self.model_trainer.onnx_path)
         self.shap_explainer = SHAPExplainer(
             self.model,
             self.feature_extractor.feature_columns,
@@ -52,86 +65,260 @@ class RealTimeProcessor:
         )
         self.claude_explainer = ClaudeExplainer()
 
-        # Track processed alerts
-        self.processed_alerts = set()
+        # Canned explanation of the first batch of saturated benigns, frozen
+        # once (see explain_batch)
+        self._benign_profile = None
+
+        # Track processed alerts (Bloom filter; positives confirmed on disk)
+        self.processed_alerts = BloomFilter(capacity=100_000, error_rate=0.001)
+        self._pending_ids = []
         self.load_processed_alerts()
 
+        # Incremental CSV tailing state (see read_new_alerts)
+        self._csv_offset = 0
+        self._csv_header = b''
+        self._csv_last_line = b''
+
         logger.success("✅ Real-time processor initialized")
 
     def load_processed_alerts(self):
         """Load list of already processed alert IDs"""
         if PROCESSED_ALERTS_PATH.exists():
             with open(PROCESSED_ALERTS_PATH, 'r') as f:
-                self.processed_alerts = set(line.strip() for line in f)
+                self.processed_alerts.update(line.strip() for line in f if line.strip())
             logger.info(f"📋 Loaded {len(self.processed_alerts)} processed alerts")
 
+    def confirm_processed(self, candidate_ids: set) -> set:
+        """
+        Exact check of Bloom filter hits against the processed-alerts file
+
+        Args:
+            candidate_ids: IDs the filter reported as possibly processed
+
+        Returns:
+            Subset of candidate_ids that really were processed
+        """
+        confirmed = candidate_ids.intersection(self._pending_ids)
+        if PROCESSED_ALERTS_PATH.exists() and len(confirmed) < len(candidate_ids):
+            with open(PROCESSED_ALERTS_PATH, 'r') as f:
+                confirmed.update(line.strip() for line in f if line.strip() in candidate_ids)
+        return confirmed
+
     def mark_as_processed(self, alert_id: str):
-        """Mark an alert as processed"""
+        """Mark an alert as processed (persisted on the next flush_processed)"""
         self.processed_alerts.add(alert_id)
+        self._pending_ids.append(alert_id)
+
+    def flush_processed(self):
+        """Append buffered processed alert IDs to the file in a single write"""
+        if not self._pending_ids:
+            return
 
-        # Append to file
         with open(PROCESSED_ALERTS_PATH, 'a') as f:
-            f.write(f"{alert_id}\n")
+            f.write("\n".join(self._pending_ids) + "\n")
+        self._pending_ids.clear()
 
-    def process_alert(self, alert_row: pd.Series) -> dict:
+    def read_new_alerts(self) -> pd.DataFrame:
+        """
+        Read alerts appended to the CSV since the previous call
+
+        Only the bytes after the last consumed offset are parsed. The file is
+        re-read from the start when it shrinks or no longer contains the line
+        we stopped at (i.e. it was regenerated), and that full read is then
+        filtered against the already-processed IDs.
+
+        Returns:
+            DataFrame of unprocessed alerts (possibly empty)
+        """
+        if not ALERTS_CSV_PATH.exists():
+            return pd.DataFrame()
+
+        with open(ALERTS_CSV_PATH, 'rb') as f:
+            size = f.seek(0, io.SEEK_END)
+
+            full_reload = self._csv_offset == 0 or size < self._csv_offset
+            if not full_reload:
+                f.seek(self._csv_offset - len(self._csv_last_line))
+                full_reload = f.read(len(self._csv_last_line)) != self._csv_last_line
+
+            if full_reload:
+                f.seek(0)
+                self._csv_header = f.readline()
+                self._csv_offset = f.tell()
+                self._csv_last_line = self._csv_header
+
+            chunk = f.read(size - self._csv_offset)
+
+        # Leave a partially written last line for the next poll
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return pd.DataFrame()
+        chunk = chunk[:end]
+
+        self._csv_offset += end
+        self._csv_last_line = chunk[chunk.rfind(b'\n', 0, end - 1) + 1:]
+
+        df = pd.read_csv(io.BytesIO(self._csv_header + chunk))
+
+        missing_cols = set(AlertLoader.REQUIRED_COLUMNS) - set(df.columns)
+        if missing_cols:
+            raise ValueError(f"Missing required columns: {missing_cols}")
+
+        if full_reload and len(df):
+            # Filter misses are definitely new; hits are confirmed exactly so a
+            # false positive never drops an unprocessed alert
+            maybe = self.processed_alerts.contains_many(df['alert_id'])
+            processed = self.confirm_processed(set(df['alert_id'][maybe]))
+            df = df[~df['alert_id'].isin(processed)]
+
+        return df
+
+    def process_alert(self, alert: pd.DataFrame) -> dict:
         """
         Process a single alert through the AI pipeline
 
         Args:
-            alert_row: Alert data as pandas Series
+            alert: One-row DataFrame slice, e.g. df.iloc[[i]], so dtypes
+                survive without rebuilding a frame from a Series
 
         Returns:
             Complete analysis result
         """
-        alert_id = alert_row['alert_id']
+        return self.process_alert_batch(alert)[0]
+
+    def process_alert_batch(self, alerts: pd.DataFrame) -> List[dict]:
+        """
+        Process a batch of alerts through the AI pipeline
+
+        Feature extraction, model inference and SHAP run once over the whole
+        batch; only the LLM explanation is generated per alert.
+
+        Args:
+            alerts: DataFrame of alerts
 
-        logger.info(f"🔍 Processing alert: {alert_id}")
+        Returns:
+            List of complete analysis results, in row order
+        """
+        logger.info(f"🔍 Processing {len(alerts)} alert(s)")
 
         # Step 1: Extract features
-        alert_df = alert_row.to_frame().T
-        X = self.feature_extractor.transform(alert_df)
+        X = self.feature_extractor.transform(alerts)
 
         # Step 2: ML prediction
-        prediction = self.predictor.predict(X)
-        verdict = prediction['prediction']
-        confidence = prediction['confidence']
-
-        logger.info(f"   Verdict: {verdict.upper()} (confidence: {confidence:.1%})")
+        predictions = self.predictor.predict(X)
+        if isinstance(predictions, dict):
+            predictions = [predictions]
 
         # Step 3: SHAP explanation
-        predicted_class_idx = ALERT_LABELS.index(verdict)
-        xai_explanation = self.shap_explainer.explain_prediction(
-            X, verdict, predicted_class_idx
+        xai_explanations = self.explain_batch(X, predictions)
+
+        # Step 4: LLM explanations are network-bound, so their requests overlap
+        records = alerts.to_dict('records')
+        for record, prediction in zip(records, predictions):
+            logger.info(
+                f"   {record['alert_id']}: {prediction['prediction'].upper()} "
+                f"(confidence: {prediction['confidence']:.1%})"
+            )
+        llm_explanations = self.claude_explainer.generate_explanations_batch(
+            list(zip(predictions, xai_explanations, records)),
+            concurrency=self.LLM_WORKERS,
+            batch_size=LLM_BATCH_SIZE
         )
 
-        # Step 4: LLM explanation
-        try:
-            llm_explanation = self.claude_explainer.generate_explanation(
-                prediction,
-                xai_explanation,
-                alert_row.to_dict()
-            )
-        except Exception as e:
-            logger.warning(f"   LLM generation failed: {e}. Using fallback.")
-            llm_explanation = self.claude_explainer._generate_fallback_explanation(
-                prediction, xai_explanation
+        return [
+            self._compile_result(*args)
+            for args in zip(records, predictions, xai_explanations, llm_explanations)
+        ]
+
+    def explain_batch(self, X: pd.DataFrame, predictions: List[dict]) -> List[dict]:
+        """
+        SHAP explanations for a batch, skipping SHAP for saturated benigns
+
+        Benign verdicts above SHAP_SKIP_CONFIDENCE (most SOC traffic) get a
+        canned explanation: the mean SHAP values of the first such alerts
+        seen, with those alerts' mean feature values and risks, frozen once
+        and flagged 'generic_profile'. It describes a typical confident
+        benign, never the alert itself. All other alerts get exact SHAP.
+
+        Args:
+            X: Feature matrix
+            predictions: Prediction results, in row order
+
+        Returns:
+            List of explanation dictionaries, in row order
+        """
+        saturated = np.array([
+            p['prediction'] == 'benign' and p['confidence'] > self.SHAP_SKIP_CONFIDENCE
+            for p in predictions
+        ])
+        exact = ~saturated if self._benign_profile is not None else np.ones(len(X), dtype=bool)
+
+        verdicts = [p['prediction'] for p in predictions]
+        indices = [self.predictor.class_index[v] for v in verdicts]
+        feature_values = X.to_numpy(dtype=float)
+        explanations = [None] * len(X)
+
+        rows = np.flatnonzero(exact)
+        if len(rows):
+            shap_values = self.shap_explainer.predicted_class_shap_values(
+                feature_values[rows], [indices[i] for i in rows]
             )
+            for values, i in zip(shap_values, rows):
+                explanations[i] = self.shap_explainer.explanation_from_values(
+                    values, feature_values[i], verdicts[i], indices[i]
+                )
+
+            benign_rows = saturated[rows]
+            if self._benign_profile is None and benign_rows.any():
+                profile = self.shap_explainer.explanation_from_values(
+                    shap_values[benign_rows].mean(axis=0),
+                    feature_values[rows[benign_rows]].mean(axis=0),
+                    'benign',
+                    self.predictor.class_index['benign']
+                )
+                profile['explanation_method'] = 'SHAP (benign baseline)'
+                profile['generic_profile'] = True
+                self._benign_profile = profile
+
+        for i in np.flatnonzero(~exact):
+            explanations[i] = dict(self._benign_profile)
+
+        return explanations
+
+    def _compile_result(self, alert_data: dict, prediction: dict, xai_explanation: dict,
+                        llm_explanation: dict) -> dict:
+        """
+        Compile the analysis result for one alert
+
+        Args:
+            alert_data: Original alert data
+            prediction: Prediction results for the alert
+            xai_explanation: SHAP explanation for the alert
+            llm_explanation: LLM (or fallback) explanation for the alert
+
+        Returns:
+            Complete analysis result
+        """
+        alert_id = alert_data['alert_id']
+        verdict = prediction['prediction']
+        confidence = prediction['confidence']
 
         # Compile result
-        result = {
+        return {
             'alert_id': alert_id,
             'timestamp': datetime.now().isoformat(),
-            'alert_data': alert_row.to_dict(),
+            'alert_data': alert_data,
             'verdict': verdict,
             'confidence': confidence,
             'probabilities': prediction['probabilities'],
             'top_features': xai_explanation['top_contributing_features'][:5],
+            # Saturated benigns carry the shared benign profile, not their own factors
+            'explanation_method': xai_explanation['explanation_method'],
+            'generic_profile': xai_explanation.get('generic_profile', False),
             'explanation': llm_explanation['explanation_text'],
             'recommended_action': llm_explanation['recommended_action']
         }
 
-        return result
-
     def send_notifications(self, result: dict):
         """
         Send notifications based on alert severity
@@ -202,35 +389,38 @@ class RealTimeProcessor:
         try:
             while True:
                 try:
-                    # Load current alerts
-                    df = AlertLoader.load_csv(ALERTS_CSV_PATH)
-
-                    # Find unprocessed alerts
-                    new_alerts = df[~df['alert_id'].isin(self.processed_alerts)]
+                    # Read only alerts appended since the last check
+                    new_alerts = self.read_new_alerts()
 
                     if len(new_alerts) > 0:
                         logger.info(f"📬 Found {len(new_alerts)} new alerts")
 
-                        for idx, alert in new_alerts.iterrows():
-                            # Process alert
-                            result = self.process_alert(alert)
+                        # Chunked so notifications go out while a large backlog is processed
+                        for start in range(0, len(new_alerts), self.BATCH_SIZE):
+                            batch = new_alerts.iloc[start:start + self.BATCH_SIZE]
+                            for result in self.process_alert_batch(batch):
+                                # Send notifications
+                                self.send_notifications(result)
 
-                            # Send notifications
-                            self.send_notifications(result)
+                                # Mark as processed
+                                self.mark_as_processed(result['alert_id'])
 
-                            # Mark as processed
-                            self.mark_as_processed(alert['alert_id'])
+                            self.flush_processed()
 
                     else:
                         logger.debug("No new alerts")
 
                 except Exception as e:
                     logger.error(f"Error processing alerts: {e}", exc_info=True)
+                    self.flush_processed()
+                    # Re-scan from the start next time; processed IDs are skipped
+                    self._csv_offset = 0
 
                 # Wait before next check
                 time.sleep(interval_seconds)
 
         except KeyboardInterrupt:
+            self.flush_processed()
             logger.info("\n⏹️  Stopping real-time processor")
             logger.info("👋 Goodbye!")
 
@@ -3,9 +3,15 @@ Run Dashboard Server
 
 Standalone script to start the FastAPI dashboard server.
 """
+import os
 import sys
 from pathlib import Path
 
+# Cap BLAS/OpenMP threads per worker before numpy gets imported; several
+# workers each running full-width thread pools just contend for the cores
+os.environ.setdefault("OMP_NUM_THREADS", "2")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "2")
+
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -14,6 +20,9 @@ import uvicorn
 from config.settings import DASHBOARD_HOST, DASHBOARD_PORT, DEBUG_MODE, MODEL_DIR, PROCESSED_DATA_DIR
 from config.logging_config import logger
 
+# Worker processes outside debug mode (reload requires a single process)
+WORKERS = min(os.cpu_count() or 1, 4)
+
 
 def check_prerequisites():
     """Check if model and data are ready"""
@@ -53,6 +62,7 @@ def main():
     logger.info(f"Host: {DASHBOARD_HOST}")
     logger.info(f"Port: {DASHBOARD_PORT}")
     logger.info(f"Debug mode: {DEBUG_MODE}")
+    logger.info(f"Workers: {1 if DEBUG_MODE else WORKERS}")
     logger.info("\n" + "=" * 60)
     logger.info(f"Dashboard URL: http://{DASHBOARD_HOST}:{DASHBOARD_PORT}")
     logger.info(f"API Docs: http://{DASHBOARD_HOST}:{DASHBOARD_PORT}/docs")
@@ -60,13 +70,27 @@ def main():
     logger.info("\nPress CTRL+C to stop the server\n")
 
     try:
-        uvicorn.run(
-            "src.dashboard.app:app",
-            host=DASHBOARD_HOST,
-            port=DASHBOARD_PORT,
-            reload=DEBUG_MODE,
-            log_level="info"
-        )
+        if DEBUG_MODE:
+            uvicorn.run(
+                "src.dashboard.app:app",
+                host=DASHBOARD_HOST,
+                port=DASHBOARD_PORT,
+                reload=True,
+                log_level="info"
+            )
+        else:
+            # loop/http "auto" pick uvloop and httptools (uvicorn[standard])
+            # where available and fall back to asyncio/h11 elsewhere
+            uvicorn.run(
+                "src.dashboard.app:app",
+                host=DASHBOARD_HOST,
+                port=DASHBOARD_PORT,
+                workers=WORKERS,
+                loop="auto",
+                http="auto",
+                access_log=False,
+                log_level="info"
+            )
     except KeyboardInterrupt:
         logger.info("\nShutting down dashboard...")
     except Exception as e:
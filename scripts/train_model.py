@@ -31,7 +31,12 @@ def main():
             logger.error("Please run 'python scripts/generate_data.py' first")
             sys.exit(1)
 
-        df = AlertLoader.load_csv(ALERTS_CSV_PATH)
+        # Only the columns feature engineering reads
+        training_columns = [
+            col for col in AlertLoader.REQUIRED_COLUMNS
+            if col not in FeatureExtractor.UNUSED_COLUMNS
+        ]
+        df = AlertLoader.load_csv(ALERTS_CSV_PATH, columns=training_columns)
         logger.info(f"Loaded {len(df)} alerts")
 
         # Step 2: Feature engineering
@@ -4,6 +4,7 @@ FastAPI Dashboard Application
 Main application for the AI Security Decision Explainer dashboard.
 """
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
@@ -21,7 +22,8 @@ app = FastAPI(
     title="AI Security Decision Explainer",
     description="Trust-first AI security system for SOC environments",
     version="1.0.0",
-    debug=DEBUG_MODE
+    debug=DEBUG_MODE,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -57,11 +59,23 @@ async def startup_event():
     # Load ML components
     try:
         from src.ml_engine.model_trainer import ModelTrainer
+        from src.ml_engine.model_predictor import ModelPredictor
         from src.feature_engineering.feature_extractor import FeatureExtractor
+        from src.xai.shap_explainer import SHAPExplainer
 
         logger.info("Loading ML model and feature extractor...")
         app.state.model_trainer = ModelTrainer.load()
         app.state.feature_extractor = FeatureExtractor.load()
+
+        # Built once and shared by all requests
+        model = app.state.model_trainer.model
+        app.state.predictor = ModelPredictor(model, app.state.model_trainer.onnx_path)
+        app.state.shap_explainer = SHAPExplainer(
+            model,
+            app.state.feature_extractor.feature_columns,
+            app.state.feature_extractor.feature_metadata
+        )
+        app.state.metrics_response = routes.format_metrics(app.state.model_trainer.training_metrics)
         logger.info("ML components loaded successfully")
 
     except FileNotFoundError as e:
@@ -69,6 +83,28 @@ async def startup_event():
         logger.warning("Please train the model first using scripts/train_model.py")
         app.state.model_trainer = None
         app.state.feature_extractor = None
+        app.state.predictor = None
+        app.state.shap_explainer = None
+        app.state.metrics_response = None
+
+    # Parquet copy of the alerts so /api/analyze can read single row groups
+    from config.settings import ALERTS_CSV_PATH
+    from src.ingestion.alert_loader import AlertLoader
+
+    if ALERTS_CSV_PATH.exists() and AlertLoader.parquet_sibling(ALERTS_CSV_PATH) is None:
+        try:
+            AlertLoader.write_parquet(
+                AlertLoader.load_csv(ALERTS_CSV_PATH),
+                ALERTS_CSV_PATH.with_suffix(".parquet")
+            )
+            logger.info("Wrote parquet copy of alerts for fast lookups")
+        except Exception as e:
+            logger.warning(f"Could not write alerts parquet copy: {e}")
+
+    # LLM client (offline without an API key; explanations use templates)
+    from src.llm_engine.claude_client import ClaudeExplainer
+
+    app.state.claude_explainer = ClaudeExplainer()
 
     logger.info("Dashboard ready!")
 
@@ -78,6 +114,9 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down AI Security Decision Explainer...")
 
+    if getattr(app.state, "claude_explainer", None) is not None:
+        await app.state.claude_explainer.aclose()
+
 
 @app.get("/health")
 async def health_check():
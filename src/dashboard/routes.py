@@ -4,16 +4,17 @@ FastAPI Routes for Dashboard
 API endpoints for alert analysis and dashboard operations.
 """
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from loguru import logger
+import asyncio
+import pandas as pd
 
 from src.ingestion.alert_loader import AlertLoader
-from src.ml_engine.model_predictor import ModelPredictor
-from src.xai.shap_explainer import SHAPExplainer
 from src.llm_engine.claude_client import ClaudeExplainer
 from config.settings import ALERTS_CSV_PATH, ALERT_LABELS
 
@@ -23,6 +24,142 @@ templates = Jinja2Templates(directory=str(dashboard_dir / "templates"))
 
 router = APIRouter()
 
+# Columns returned by /api/alerts ('label' is exposed as 'true_label')
+ALERT_LIST_COLUMNS = ['alert_id', 'timestamp', 'source_ip', 'destination_ip', 'label']
+
+
+@lru_cache(maxsize=4)
+def _load_alerts_cached(path: str, mtime_ns: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Parse an alerts file once per modification time
+
+    Args:
+        path: Alerts CSV path
+        mtime_ns: File modification time (part of the cache key only)
+
+    Returns:
+        Tuple of (alerts DataFrame, same alerts indexed by alert_id)
+    """
+    df = AlertLoader.load_csv(path)
+    return df, AlertLoader.build_index(df)
+
+
+@lru_cache(maxsize=4)
+def _load_alert_list_cached(path: str, mtime_ns: int) -> pd.DataFrame:
+    """First 100 alerts, reading only ALERT_LIST_COLUMNS, once per modification time"""
+    return AlertLoader.load_csv(path, columns=ALERT_LIST_COLUMNS).head(100)
+
+
+def load_alerts() -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Load the dashboard alerts, re-parsing only when the file has changed"""
+    if not ALERTS_CSV_PATH.exists():
+        raise FileNotFoundError(f"Alert file not found: {ALERTS_CSV_PATH}")
+    return _load_alerts_cached(str(ALERTS_CSV_PATH), ALERTS_CSV_PATH.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _parquet_row_groups(path: str, mtime_ns: int) -> Dict[str, int]:
+    """
+    Map alert_id -> row group of a parquet alerts file, once per modification time
+
+    Only the alert_id column is decoded.
+
+    Args:
+        path: Alerts parquet path
+        mtime_ns: File modification time (part of the cache key only)
+
+    Returns:
+        Dictionary of alert ID to row group index (first occurrence wins)
+    """
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    row_groups = {}
+    for rg in range(parquet_file.num_row_groups):
+        ids = parquet_file.read_row_group(rg, columns=['alert_id']).column(0).to_pylist()
+        for alert_id in ids:
+            row_groups.setdefault(alert_id, rg)
+    return row_groups
+
+
+def get_alert(alert_id: str) -> pd.DataFrame:
+    """
+    Look up one alert by ID
+
+    Reads just the alert's row group when an up-to-date parquet copy of the
+    alerts CSV exists, otherwise probes the cached alerts index.
+
+    Returns:
+        One-row DataFrame with the original column dtypes, ready for
+        FeatureExtractor.transform without a Series reshape
+
+    Raises:
+        KeyError: If alert ID not found
+    """
+    parquet_path = AlertLoader.parquet_sibling(ALERTS_CSV_PATH) if ALERTS_CSV_PATH.exists() else None
+    if parquet_path is not None:
+        import pyarrow.parquet as pq
+
+        rg = _parquet_row_groups(str(parquet_path), parquet_path.stat().st_mtime_ns)[alert_id]
+        group = AlertLoader.arrow_to_pandas(pq.ParquetFile(parquet_path).read_row_group(rg))
+        return group[group['alert_id'] == alert_id].iloc[:1]
+
+    _, by_id = load_alerts()
+
+    # Duplicate IDs keep the first row like AlertLoader.get_alert_by_id
+    return by_id.loc[[alert_id]].iloc[:1]
+
+
+def format_metrics(metrics: Dict) -> Dict:
+    """
+    Format training metrics for the /api/metrics response
+
+    Args:
+        metrics: ModelTrainer.training_metrics
+
+    Returns:
+        API response dictionary
+    """
+    return {
+        "success": True,
+        "metrics": {
+            "accuracy": metrics.get('accuracy', 0),
+            "precision_weighted": metrics.get('precision_weighted', 0),
+            "recall_weighted": metrics.get('recall_weighted', 0),
+            "f1_weighted": metrics.get('f1_weighted', 0),
+            "per_class": {
+                label: {
+                    "precision": metrics.get(f'precision_{label}', 0),
+                    "recall": metrics.get(f'recall_{label}', 0),
+                    "f1": metrics.get(f'f1_{label}', 0)
+                }
+                for label in ALERT_LABELS
+            }
+        }
+    }
+
+
+async def explain_in_executor(explainer, X: pd.DataFrame, prediction: str, predicted_class_idx: int) -> Dict:
+    """
+    Run a SHAP explanation in the default executor
+
+    The shared startup explainer does the work off the event loop, so
+    other requests keep being served while SHAP runs.
+
+    Args:
+        explainer: SHAPExplainer built at startup
+        X: Feature DataFrame (single row)
+        prediction: Predicted class label
+        predicted_class_idx: Index of predicted class
+
+    Returns:
+        SHAPExplainer.explain_prediction result
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, explainer.explain_prediction, X, prediction, predicted_class_idx
+    )
+
 
 # Request/Response models
 class AnalyzeRequest(BaseModel):
@@ -52,27 +189,23 @@ async def get_alerts() -> Dict:
         Dictionary with alerts list
     """
     try:
-        # Load alerts from CSV
-        df = AlertLoader.load_csv(ALERTS_CSV_PATH)
-
-        # Convert to list of dictionaries (first 100 for performance)
-        alerts_subset = df.head(100)
-        alerts_list = []
-
-        for _, row in alerts_subset.iterrows():
-            alerts_list.append({
-                "alert_id": row['alert_id'],
-                "timestamp": row['timestamp'],
-                "source_ip": row['source_ip'],
-                "destination_ip": row['destination_ip'],
-                "true_label": row['label']
-            })
-
-        return {
+        # Load the display columns of the first 100 alerts
+        if not ALERTS_CSV_PATH.exists():
+            raise FileNotFoundError(f"Alert file not found: {ALERTS_CSV_PATH}")
+        df = _load_alert_list_cached(str(ALERTS_CSV_PATH), ALERTS_CSV_PATH.stat().st_mtime_ns)
+
+        # Convert to list of dictionaries
+        alerts_list = (
+            df.rename(columns={'label': 'true_label'})
+            .to_dict(orient='records')
+        )
+
+        # Returned as a response so FastAPI skips jsonable_encoder
+        return ORJSONResponse({
             "success": True,
             "count": len(alerts_list),
             "alerts": alerts_list
-        }
+        })
 
     except Exception as e:
         logger.error(f"Error loading alerts: {e}")
@@ -111,36 +244,31 @@ async def analyze_alert(request: Request, data: AnalyzeRequest) -> Dict:
         logger.info(f"Analyzing alert: {alert_id}")
 
         # Step 1: Load alert
-        df = AlertLoader.load_csv(ALERTS_CSV_PATH)
-        alert_row = AlertLoader.get_alert_by_id(df, alert_id)
-        alert_data = alert_row.to_dict()
+        try:
+            alert_df = get_alert(alert_id)
+        except KeyError:
+            logger.error(f"Alert not found: {alert_id}")
+            raise HTTPException(status_code=404, detail=f"Alert not found: {alert_id}")
+        alert_data = alert_df.iloc[0].to_dict()
 
         logger.info(f"Alert loaded: {alert_data['source_ip']} -> {alert_data['destination_ip']}")
 
         # Step 2: Engineer features
         feature_extractor = request.app.state.feature_extractor
-        alert_df = alert_row.to_frame().T
         X = feature_extractor.transform(alert_df)
 
         logger.info("Features extracted")
 
         # Step 3: ML prediction
-        model = request.app.state.model_trainer.model
-        predictor = ModelPredictor(model)
-        prediction = predictor.predict(X)
+        prediction = request.app.state.predictor.predict(X)
 
         logger.info(f"Prediction: {prediction['prediction']} (confidence: {prediction['confidence']:.2%})")
 
         # Step 4: SHAP explanation
-        predicted_class_idx = ALERT_LABELS.index(prediction['prediction'])
+        predicted_class_idx = request.app.state.predictor.class_index[prediction['prediction']]
 
-        shap_explainer = SHAPExplainer(
-            model,
-            feature_extractor.feature_columns,
-            feature_extractor.feature_metadata
-        )
-
-        xai_explanation = shap_explainer.explain_prediction(
+        xai_explanation = await explain_in_executor(
+            request.app.state.shap_explainer,
             X,
             prediction['prediction'],
             predicted_class_idx
@@ -149,9 +277,10 @@ async def analyze_alert(request: Request, data: AnalyzeRequest) -> Dict:
         logger.info("SHAP explanation generated")
 
         # Step 5: Claude explanation
+        claude = request.app.state.claude_explainer
         try:
-            claude = ClaudeExplainer()
-            llm_explanation = claude.generate_explanation(
+            # Awaited so the event loop keeps serving requests during the LLM round-trip
+            llm_explanation = await claude.agenerate_explanation(
                 prediction,
                 xai_explanation,
                 alert_data
@@ -160,7 +289,7 @@ async def analyze_alert(request: Request, data: AnalyzeRequest) -> Dict:
 
         except Exception as e:
             logger.warning(f"Claude API error: {e}. Using fallback.")
-            llm_explanation = claude._generate_fallback_explanation(prediction, xai_explanation)
+            llm_explanation = ClaudeExplainer._generate_fallback_explanation(prediction, xai_explanation)
 
         # Combine all results
         result = {
@@ -190,17 +319,18 @@ async def analyze_alert(request: Request, data: AnalyzeRequest) -> Dict:
             "explanation": {
                 "text": llm_explanation['explanation_text'],
                 "recommended_action": llm_explanation['recommended_action'],
+                "key_factors": llm_explanation.get('key_factors', []),
                 "llm_model": llm_explanation['model_metadata']['llm_model']
             }
         }
 
         logger.info(f"Analysis complete for alert {alert_id}")
 
-        return result
+        # orjson serializes the numpy scalars in alert_data directly
+        return ORJSONResponse(result)
 
-    except ValueError as e:
-        logger.error(f"Alert not found: {alert_id}")
-        raise HTTPException(status_code=404, detail=f"Alert not found: {alert_id}")
+    except HTTPException:
+        raise
 
     except Exception as e:
         logger.error(f"Error analyzing alert: {e}", exc_info=True)
@@ -222,26 +352,12 @@ async def get_model_metrics(request: Request) -> Dict:
         )
 
     try:
-        metrics = request.app.state.model_trainer.training_metrics
-
-        # Format metrics for API response
-        return {
-            "success": True,
-            "metrics": {
-                "accuracy": metrics.get('accuracy', 0),
-                "precision_weighted": metrics.get('precision_weighted', 0),
-                "recall_weighted": metrics.get('recall_weighted', 0),
-                "f1_weighted": metrics.get('f1_weighted', 0),
-                "per_class": {
-                    label: {
-                        "precision": metrics.get(f'precision_{label}', 0),
-                        "recall": metrics.get(f'recall_{label}', 0),
-                        "f1": metrics.get(f'f1_{label}', 0)
-                    }
-                    for label in ALERT_LABELS
-                }
-            }
-        }
+        # Formatted once per loaded model (see startup_event)
+        if getattr(request.app.state, 'metrics_response', None) is None:
+            request.app.state.metrics_response = format_metrics(
+                request.app.state.model_trainer.training_metrics
+            )
+        return request.app.state.metrics_response
 
     except Exception as e:
         logger.error(f"Error getting metrics: {e}")
@@ -3,13 +3,18 @@ Feature Engineering for Security Alerts
 
 Transforms raw alerts into ML-ready features while preserving security context.
 """
+import os
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from datetime import datetime
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, OneHotEncoder
 from category_encoders import TargetEncoder
 from typing import Tuple, Dict
-import pickle
+import joblib
+from joblib import Parallel, delayed
+import threading
 from pathlib import Path
 from loguru import logger
 
@@ -21,11 +26,38 @@ class FeatureExtractor:
     Extracts and engineers features from raw security alerts
     """
 
+    # Raw alert columns dropped without being used for any feature
+    UNUSED_COLUMNS = ['source_ip', 'destination_ip', 'process_executed', 'encryption_protocol']
+
+    # Output dtypes: 0/1 flags and small counts as int8, wider integers as
+    # int32, everything else (scaled/encoded values) as float32
+    INT8_FEATURES = [
+        'successful_login_after_failures', 'process_hash_known',
+        'admin_privilege_escalation', 'off_hours_activity',
+        'geo_impossible_travel', 'user_agent_anomaly',
+        'threat_intel_match', 'lateral_movement_detected',
+        'is_weekend', 'is_night_shift', 'privilege_risk',
+        'threat_indicator_count', 'uncommon_port'
+    ]
+    INT32_FEATURES = ['destination_port', 'login_risk_score']
+
+    # Batches of at least this many rows build their feature groups in
+    # parallel threads; below it the thread overhead outweighs the gain
+    PARALLEL_MIN_ROWS = 50_000
+
+    # Ports not flagged as uncommon, sorted for searchsorted lookups
+    COMMON_PORTS = np.array(sorted([80, 443, 22, 3389, 445]), dtype=np.int64)
+
     def __init__(self):
         self.scaler = StandardScaler()
         self.minmax_scaler = MinMaxScaler()
         self.target_encoder = TargetEncoder()
         self.onehot_encoder = OneHotEncoder(sparse_output=False, handle_unknown='ignore')
+        self._onehot_lookup = None  # see _get_onehot_lookup
+        self._country_lookup = None  # see _get_country_lookup
+        self._scaler_params = None  # see _get_scaler_params
+        self._feature_dtypes = None  # see _get_feature_dtypes
+        self._scratch_local = threading.local()  # see _scratch
 
         self.is_fitted = False
         self.feature_columns = []
@@ -45,26 +77,15 @@ class FeatureExtractor:
 
         # Separate features and labels
         labels = df['label'].copy()
-        df_features = df.drop(columns=['label', 'alert_id'])
-
-        # Extract temporal features
-        df_features = self._extract_temporal_features(df_features)
-
-        # Create risk scoring features
-        df_features = self._create_risk_features(df_features)
 
-        # Drop non-feature columns
-        df_features = df_features.drop(columns=['timestamp', 'source_ip', 'destination_ip',
-                                                  'process_executed', 'encryption_protocol'], errors='ignore')
+        arrays = self._build_arrays(df, labels, fit=True)
 
-        # Encode categorical features
-        df_features = self._encode_categorical(df_features, labels, fit=True)
-
-        # Normalize numerical features
-        df_features = self._normalize_features(df_features, fit=True)
-
-        self.feature_columns = list(df_features.columns)
+        self.feature_columns = list(arrays.keys())
         self.is_fitted = True
+        self._feature_dtypes = None
+
+        # Compact dtypes (computed in float64 above, so values match a later cast)
+        df_features = self._to_frame(arrays, df.index)
 
         # Create feature metadata
         self._create_feature_metadata()
@@ -88,85 +109,166 @@ class FeatureExtractor:
 
         logger.info("Transforming features...")
 
-        # Remove label and alert_id if present
-        df_features = df.drop(columns=['label', 'alert_id'], errors='ignore')
+        arrays = self._build_arrays(df, None, fit=False)
 
-        # Extract temporal features
-        df_features = self._extract_temporal_features(df_features)
+        # Same columns as training (missing ones filled with 0, extra ones
+        # dropped), with the compact training dtypes
+        return self._to_frame(arrays, df.index)
 
-        # Create risk scoring features
-        df_features = self._create_risk_features(df_features)
+    def _build_arrays(self, df: pd.DataFrame, labels: pd.Series = None, fit: bool = False) -> Dict:
+        """
+        Compute every feature column as a NumPy array
 
-        # Drop non-feature columns
-        df_features = df_features.drop(columns=['timestamp', 'source_ip', 'destination_ip',
-                                                  'process_executed', 'encryption_protocol'], errors='ignore')
+        The raw frame is only read; results go into one ordered dict so the
+        output DataFrame is built once instead of growing column by column.
 
-        # Encode categorical features
-        df_features = self._encode_categorical(df_features, None, fit=False)
+        Args:
+            df: Raw alert DataFrame
+            labels: Alert labels (needed when fitting)
+            fit: Whether to fit the encoders and scalers
 
-        # Normalize numerical features
-        df_features = self._normalize_features(df_features, fit=False)
+        Returns:
+            Ordered dictionary of feature name to array
+        """
+        # Pass-through columns keep their position; label, ID, timestamp,
+        # unused and encoded source columns are left out
+        skip = {'label', 'alert_id', 'timestamp', 'source_country', 'protocol', *self.UNUSED_COLUMNS}
+        arrays = {col: df[col].to_numpy() for col in df.columns if col not in skip}
+
+        # Boolean features: Convert to int (0/1); bool arrays are reinterpreted
+        # as int8 here and copied once by _to_frame
+        boolean_features = [
+            'successful_login_after_failures', 'process_hash_known',
+            'admin_privilege_escalation', 'off_hours_activity',
+            'geo_impossible_travel', 'user_agent_anomaly',
+            'threat_intel_match', 'lateral_movement_detected'
+        ]
+        for col in boolean_features:
+            if col in arrays:
+                values = arrays[col]
+                arrays[col] = values.view(np.int8) if values.dtype == bool else values.astype(np.int8, copy=False)
+
+        # Temporal, risk and categorical features only read the raw frame,
+        # so each group fills its own dict; large batches run them in threads
+        # (NumPy/pandas release the GIL in the bulk operations)
+        parts = [{}, {}, {}]
+        steps = [
+            delayed(self._extract_temporal_features)(df, parts[0]),
+            delayed(self._create_risk_features)(df, parts[1]),
+            delayed(self._encode_categorical)(df, parts[2], labels, fit=fit)
+        ]
+        n_jobs = min(len(steps), os.cpu_count() or 1)
+        if n_jobs > 1 and len(df) >= self.PARALLEL_MIN_ROWS:
+            Parallel(n_jobs=n_jobs, prefer='threads')(steps)
+        else:
+            for function, args, kwargs in steps:
+                function(*args, **kwargs)
+
+        for part in parts:
+            arrays.update(part)
 
-        # Ensure same columns as training
-        for col in self.feature_columns:
-            if col not in df_features.columns:
-                df_features[col] = 0
+        # Normalize numerical features
+        self._normalize_features(arrays, fit=fit)
 
-        df_features = df_features[self.feature_columns]
+        return arrays
 
-        return df_features
+    def _to_frame(self, arrays: Dict, index: pd.Index) -> pd.DataFrame:
+        """
+        Build the features DataFrame in training column order and dtypes
 
-    def _extract_temporal_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Extract temporal features from timestamp"""
-        df = df.copy()
+        Args:
+            arrays: Feature arrays from _build_arrays
+            index: Index of the raw alert frame
 
-        # Parse timestamp
-        df['timestamp_dt'] = pd.to_datetime(df['timestamp'])
+        Returns:
+            Features DataFrame
+        """
+        n = len(index)
+        columns = {
+            col: np.asarray(arrays[col], dtype=dtype) if col in arrays else np.zeros(n, dtype=dtype)
+            for col, dtype in self._get_feature_dtypes().items()
+        }
+        # Copied so the features never share memory with the caller's alert
+        # frame (pass-through columns are views of it) or scratch buffers
+        return pd.DataFrame(columns, index=index, copy=True)
+
+    def _extract_temporal_features(self, df: pd.DataFrame, arrays: Dict):
+        """Extract temporal features from timestamp into arrays"""
+        # Parse timestamp unless already datetime64; an explicit ISO 8601
+        # format skips per-element format inference, unparsable values become
+        # NaT (tz-aware values keep their local wall-clock time)
+        timestamps = df['timestamp']
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps, format='ISO8601', errors='coerce')
+        if timestamps.dt.tz is not None:
+            timestamps = timestamps.dt.tz_localize(None)
+
+        # Integer math on the raw nanosecond epoch instead of one .dt pass per field
+        values = timestamps.to_numpy(dtype='datetime64[ns]')
+        ns = values.view(np.int64)
+        n = len(ns)
+        days = np.floor_divide(ns, 86_400_000_000_000, out=self._scratch('days', n, np.int64))
 
         # Extract hour of day (0-23)
-        df['hour_of_day'] = df['timestamp_dt'].dt.hour
+        hour = np.floor_divide(ns, 3_600_000_000_000, out=self._scratch('hour', n, np.int64))
+        np.remainder(hour, 24, out=hour)
 
-        # Extract day of week (0=Monday, 6=Sunday)
-        df['day_of_week'] = df['timestamp_dt'].dt.dayofweek
+        # Extract day of week (0=Monday, 6=Sunday); 1970-01-01 was a Thursday
+        dow = np.add(days, 3, out=days)
+        np.remainder(dow, 7, out=dow)
 
-        # Is weekend
-        df['is_weekend'] = (df['day_of_week'] >= 5).astype(int)
+        # Missing timestamps stay NaN, as with the .dt accessors
+        valid = ~np.isnat(values)
+        if not valid.all():
+            hour = np.where(valid, hour, np.nan)
+            dow = np.where(valid, dow, np.nan)
 
-        # Is night shift (0-6 AM)
-        df['is_night_shift'] = ((df['hour_of_day'] >= 0) & (df['hour_of_day'] < 6)).astype(int)
+        arrays['hour_of_day'] = hour
+        arrays['day_of_week'] = dow
 
-        df = df.drop(columns=['timestamp_dt'])
+        # Is weekend
+        arrays['is_weekend'] = (dow >= 5).view(np.int8)
 
-        return df
+        # Is night shift (0-6 AM)
+        arrays['is_night_shift'] = (hour < 6).view(np.int8)
 
-    def _create_risk_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create derived risk scoring features"""
-        df = df.copy()
+    def _create_risk_features(self, df: pd.DataFrame, arrays: Dict):
+        """Create derived risk scoring features into arrays"""
+        # One ufunc per feature on the underlying arrays, written straight in
+        # the compact output dtypes (see INT8_FEATURES / INT32_FEATURES);
+        # bool results are reinterpreted as int8 without a copy
+        n = len(df)
 
         # Login risk score: failed attempts * successful after failures
-        df['login_risk_score'] = df['failed_login_attempts'] * df['successful_login_after_failures'].astype(int)
+        login_risk_score = np.empty(n, dtype=np.int32)
+        np.multiply(df['failed_login_attempts'].to_numpy(dtype=np.int64),
+                    df['successful_login_after_failures'].to_numpy(dtype=bool),
+                    out=login_risk_score)
+        arrays['login_risk_score'] = login_risk_score
 
         # Privilege risk: admin escalation during off-hours
-        df['privilege_risk'] = (df['admin_privilege_escalation'].astype(int) *
-                                df['off_hours_activity'].astype(int))
+        arrays['privilege_risk'] = np.logical_and(
+            df['admin_privilege_escalation'].to_numpy(dtype=bool),
+            df['off_hours_activity'].to_numpy(dtype=bool)
+        ).view(np.int8)
 
         # Total threat indicators count
         threat_indicators = [
             'threat_intel_match', 'geo_impossible_travel',
             'user_agent_anomaly', 'lateral_movement_detected'
         ]
-        df['threat_indicator_count'] = df[threat_indicators].astype(int).sum(axis=1)
-
-        # Port risk: uncommon ports
-        common_ports = [80, 443, 22, 3389, 445]
-        df['uncommon_port'] = (~df['destination_port'].isin(common_ports)).astype(int)
-
-        return df
-
-    def _encode_categorical(self, df: pd.DataFrame, labels: pd.Series = None, fit: bool = False) -> pd.DataFrame:
-        """Encode categorical features"""
-        df = df.copy()
-
+        # Row-wise sum over one contiguous int8 block
+        arrays['threat_indicator_count'] = df[threat_indicators].to_numpy(dtype=np.int8).sum(axis=1, dtype=np.int8)
+
+        # Port risk: uncommon ports (binary search in the 5 sorted common
+        # ports; no hash set built per call)
+        ports = df['destination_port'].to_numpy(dtype=np.int64)
+        common_ports = self.COMMON_PORTS
+        idx = np.searchsorted(common_ports, ports).clip(max=len(common_ports) - 1)
+        arrays['uncommon_port'] = np.not_equal(common_ports[idx], ports).view(np.int8)
+
+    def _encode_categorical(self, df: pd.DataFrame, arrays: Dict, labels: pd.Series = None, fit: bool = False):
+        """Encode categorical features into arrays"""
         # High cardinality: Use simple mean encoding for source_country
         high_cardinality = ['source_country']
 
@@ -177,108 +279,252 @@ class FeatureExtractor:
                     label_map = {'benign': 0, 'suspicious': 1, 'malicious': 2}
                     numeric_labels = labels.map(label_map)
 
-                    # Calculate mean encoding manually
-                    temp_df = pd.DataFrame({col: df[col], 'target': numeric_labels})
-                    means = temp_df.groupby(col)['target'].transform('mean')
+                    # Calculate mean encoding manually: one factorize, then
+                    # per-category sums and counts with bincount
+                    codes, categories = pd.factorize(df[col], sort=True)
+                    targets = numeric_labels.to_numpy(dtype=float)
+                    seen = (codes >= 0) & ~np.isnan(targets)
+                    sums = np.bincount(codes[seen], weights=targets[seen], minlength=len(categories))
+                    counts = np.bincount(codes[seen], minlength=len(categories))
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        category_means = sums / counts
+
                     # Store mapping for later use
                     if not hasattr(self, 'country_encoding'):
-                        self.country_encoding = temp_df.groupby(col)['target'].mean().to_dict()
-                    df[f'{col}_encoded'] = means
-                    df = df.drop(columns=[col])
+                        self.country_encoding = dict(zip(categories.tolist(), category_means.tolist()))
+                        self._country_lookup = None
+                    # Missing countries stay NaN, as groupby excludes them
+                    arrays[f'{col}_encoded'] = np.where(codes >= 0, category_means[codes], np.nan)
         else:
             for col in high_cardinality:
                 if col in df.columns:
                     # Use stored mapping
                     if hasattr(self, 'country_encoding'):
-                        df[f'{col}_encoded'] = df[col].map(self.country_encoding).fillna(0.5)
+                        # Gather from a float32 table; code -1 (unseen) selects 0.5
+                        categories, lookup = self._get_country_lookup()
+                        codes = self._category_codes(df[col], categories)
+                        arrays[f'{col}_encoded'] = np.take(lookup, codes)
                     else:
-                        df[f'{col}_encoded'] = 0.5  # Default value
-                    df = df.drop(columns=[col])
+                        arrays[f'{col}_encoded'] = np.full(len(df), 0.5)  # Default value
 
         # Low cardinality: One-hot encoding
         low_cardinality = ['protocol']
 
-        if fit:
-            if any(col in df.columns for col in low_cardinality):
-                encoded_df = pd.DataFrame(
-                    self.onehot_encoder.fit_transform(df[low_cardinality]),
-                    index=df.index,
-                    columns=self.onehot_encoder.get_feature_names_out(low_cardinality)
-                )
-                df = pd.concat([df.drop(columns=low_cardinality), encoded_df], axis=1)
+        if any(col in df.columns for col in low_cardinality):
+            if fit:
+                # Fitted for its categories and column names; rows are encoded
+                # with the lookup table below
+                self.onehot_encoder.fit(df[low_cardinality])
+                self._onehot_lookup = None
+
+            categories, lookup = self._get_onehot_lookup()
+            codes = self._category_codes(df['protocol'], categories)
+            columns = self.onehot_encoder.get_feature_names_out(low_cardinality)
+
+            # Code -1 (unknown category) selects the all-zero last row; the
+            # block's columns are strided views, copied once by _to_frame
+            encoded = np.take(lookup, codes, axis=0)
+            for i, name in enumerate(columns):
+                arrays[name] = encoded[:, i]
+
+    def _get_feature_dtypes(self) -> Dict:
+        """
+        Output dtype of each feature column, cached on first use
+
+        Returns:
+            Dictionary of feature name to numpy dtype
+        """
+        if self._feature_dtypes is None:
+            onehot_columns = set(self.onehot_encoder.get_feature_names_out(['protocol']))
+            self._feature_dtypes = {
+                col: np.int8 if col in self.INT8_FEATURES or col in onehot_columns
+                else np.int32 if col in self.INT32_FEATURES
+                else np.float32
+                for col in self.feature_columns
+            }
+        return self._feature_dtypes
+
+    @staticmethod
+    def _category_codes(values: pd.Series, categories: pd.Index) -> np.ndarray:
+        """
+        Positions of values in categories (-1 if unknown or missing)
+
+        Categorical and Arrow-backed string columns are matched through
+        their own (small) dictionary, so the per-row work is an integer
+        gather instead of hashing every string; object columns are looked
+        up directly.
+
+        Args:
+            values: Column to encode
+            categories: Fitted categories
+
+        Returns:
+            Integer codes array
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            dictionary = values.cat.categories
+            indices = values.cat.codes.to_numpy()
+        elif isinstance(values.dtype, (pd.StringDtype, pd.ArrowDtype)) and values.dtype.storage == 'pyarrow':
+            encoded = pa.array(values)
+            if not pa.types.is_dictionary(encoded.type):
+                encoded = pc.dictionary_encode(encoded)
+            if isinstance(encoded, pa.ChunkedArray):
+                encoded = encoded.combine_chunks()
+            dictionary = encoded.dictionary.to_numpy(zero_copy_only=False)
+            indices = encoded.indices.fill_null(-1).to_numpy()
         else:
-            if any(col in df.columns for col in low_cardinality):
-                encoded_df = pd.DataFrame(
-                    self.onehot_encoder.transform(df[low_cardinality]),
-                    index=df.index,
-                    columns=self.onehot_encoder.get_feature_names_out(low_cardinality)
-                )
-                df = pd.concat([df.drop(columns=low_cardinality), encoded_df], axis=1)
+            return categories.get_indexer(values)
 
-        # Boolean features: Convert to int (0/1)
-        boolean_features = [
-            'successful_login_after_failures', 'process_hash_known',
-            'admin_privilege_escalation', 'off_hours_activity',
-            'geo_impossible_travel', 'user_agent_anomaly',
-            'threat_intel_match', 'lateral_movement_detected'
-        ]
-        for col in boolean_features:
-            if col in df.columns:
-                df[col] = df[col].astype(int)
+        # Missing values (index -1) select the trailing -1
+        mapping = np.append(categories.get_indexer(dictionary), -1)
+        return mapping[indices]
 
-        return df
+    def _get_onehot_lookup(self) -> Tuple[pd.Index, np.ndarray]:
+        """
+        Protocol categories and their int8 one-hot rows
+
+        Derived from the fitted OneHotEncoder (also for extractors saved
+        before the table existed) and cached on first use.
 
-    def _normalize_features(self, df: pd.DataFrame, fit: bool = False) -> pd.DataFrame:
-        """Normalize numerical features"""
-        df = df.copy()
+        Returns:
+            Tuple of (categories, lookup table with a trailing zero row)
+        """
+        if self._onehot_lookup is None:
+            # Index keeps its hash table between calls (get_indexer: -1 if unknown)
+            categories = pd.Index(self.onehot_encoder.categories_[0])
+            n = len(categories)
+            lookup = np.zeros((n + 1, n), dtype=np.int8)
+            lookup[np.arange(n), np.arange(n)] = 1
+            self._onehot_lookup = (categories, lookup)
+        return self._onehot_lookup
+
+    def _get_country_lookup(self) -> Tuple[pd.Index, np.ndarray]:
+        """
+        Countries and their float32 mean encodings, built from country_encoding
 
+        Returns:
+            Tuple of (categories, lookup table with a trailing 0.5 default)
+        """
+        if self._country_lookup is None:
+            categories = pd.Index(list(self.country_encoding.keys()), dtype=object)
+            lookup = np.fromiter(
+                (*self.country_encoding.values(), 0.5),
+                dtype=np.float32,
+                count=len(self.country_encoding) + 1
+            )
+            self._country_lookup = (categories, lookup)
+        return self._country_lookup
+
+    def _normalize_features(self, arrays: Dict, fit: bool = False):
+        """Normalize numerical features in arrays"""
         # Features to standardize (z-score normalization)
         standard_features = [
             'failed_login_attempts', 'data_volume_mb',
             'connection_duration_seconds', 'unique_destinations_count'
         ]
-        standard_features = [f for f in standard_features if f in df.columns]
+        standard_features = [f for f in standard_features if f in arrays]
+
+        if fit:
+            self._scaler_params = None
 
         if standard_features:
             if fit:
-                df[standard_features] = self.scaler.fit_transform(df[standard_features])
+                # Fitted on a frame so the scaler records feature_names_in_
+                values = self.scaler.fit_transform(
+                    pd.DataFrame({col: arrays[col] for col in standard_features})
+                )
+                columns = standard_features
             else:
-                df[standard_features] = self.scaler.transform(df[standard_features])
+                # Same arithmetic as StandardScaler.transform, minus its validation
+                columns, mean, scale = self._get_scaler_params()['standard']
+                values = self._stack_scratch('standard', arrays, columns)
+                values -= mean
+                values /= scale
+            for i, col in enumerate(columns):
+                arrays[col] = values[:, i]
 
         # Features to min-max normalize (0-1)
         minmax_features = ['hour_of_day', 'day_of_week']
-        minmax_features = [f for f in minmax_features if f in df.columns]
+        minmax_features = [f for f in minmax_features if f in arrays]
 
         if minmax_features:
             if fit:
-                df[minmax_features] = self.minmax_scaler.fit_transform(df[minmax_features])
+                values = self.minmax_scaler.fit_transform(
+                    pd.DataFrame({col: arrays[col] for col in minmax_features})
+                )
+                columns = minmax_features
             else:
-                df[minmax_features] = self.minmax_scaler.transform(df[minmax_features])
+                # Same arithmetic as MinMaxScaler.transform, minus its validation
+                columns, scale, offset = self._get_scaler_params()['minmax']
+                values = self._stack_scratch('minmax', arrays, columns)
+                values *= scale
+                values += offset
+            for i, col in enumerate(columns):
+                arrays[col] = values[:, i]
+
+    def _scratch(self, name: str, n: int, dtype, width: int = None) -> np.ndarray:
+        """
+        Reusable work array for intermediate results, kept per thread
 
-        return df
+        Buffers are reused while calls keep the same batch size (the usual
+        case for online inference) and dropped when it changes. Only use
+        them in a dtype _to_frame converts from, so the output never shares
+        memory with a buffer.
 
-    def _create_feature_metadata(self):
-        """Create metadata mapping technical features to human-readable names"""
-        self.feature_metadata = {}
+        Args:
+            name: Buffer name
+            n: Number of rows
+            dtype: Array dtype
+            width: Number of columns (None for a 1-D array)
 
-        for feature in self.feature_columns:
-            # Use predefined mapping if available
-            if feature in FEATURE_NAME_MAPPING:
-                human_readable = FEATURE_NAME_MAPPING[feature]
-            else:
-                # Convert snake_case to Title Case
-                human_readable = feature.replace('_', ' ').title()
+        Returns:
+            Uninitialized array of the requested shape
+        """
+        local = self._scratch_local
+        if getattr(local, 'n', None) != n:
+            local.n = n
+            local.buffers = {}
+        shape = (n,) if width is None else (n, width)
+        key = (name, shape, np.dtype(dtype))
+        if key not in local.buffers:
+            local.buffers[key] = np.empty(shape, dtype=dtype)
+        return local.buffers[key]
+
+    def _stack_scratch(self, name: str, arrays: Dict, columns: list) -> np.ndarray:
+        """Copy columns of arrays side by side into a float64 work array"""
+        values = self._scratch(name, len(arrays[columns[0]]), np.float64, len(columns))
+        for i, col in enumerate(columns):
+            values[:, i] = arrays[col]
+        return values
+
+    def _get_scaler_params(self) -> Dict:
+        """
+        Fitted scaler columns and parameter vectors, cached on first use
 
-            self.feature_metadata[feature] = {
-                'human_readable_name': human_readable,
-                'technical_name': feature
+        Returns:
+            Dictionary with 'standard' (columns, mean_, scale_) and
+            'minmax' (columns, scale_, min_) entries
+        """
+        if self._scaler_params is None:
+            self._scaler_params = {
+                'standard': (list(self.scaler.feature_names_in_), self.scaler.mean_, self.scaler.scale_),
+                'minmax': (list(self.minmax_scaler.feature_names_in_), self.minmax_scaler.scale_,
+                           self.minmax_scaler.min_)
             }
+        return self._scaler_params
+
+    def _create_feature_metadata(self):
+        """Create metadata mapping technical features to human-readable names"""
+        # Flat technical -> human-readable mapping; predefined names first,
+        # otherwise snake_case converted to Title Case
+        self.feature_metadata = {
+            feature: FEATURE_NAME_MAPPING.get(feature) or feature.replace('_', ' ').title()
+            for feature in self.feature_columns
+        }
 
     def get_feature_name(self, technical_name: str) -> str:
         """Get human-readable name for a feature"""
-        if technical_name in self.feature_metadata:
-            return self.feature_metadata[technical_name]['human_readable_name']
-        return technical_name.replace('_', ' ').title()
+        return self.feature_metadata.get(technical_name) or technical_name.replace('_', ' ').title()
 
     def save(self, directory: Path = None):
         """Save feature extractor to disk"""
@@ -288,17 +534,26 @@ class FeatureExtractor:
 
         save_path = directory / "feature_extractor.pkl"
 
-        with open(save_path, 'wb') as f:
-            pickle.dump({
-                'scaler': self.scaler,
-                'minmax_scaler': self.minmax_scaler,
-                'target_encoder': self.target_encoder,
-                'onehot_encoder': self.onehot_encoder,
-                'feature_columns': self.feature_columns,
-                'feature_metadata': self.feature_metadata,
-                'is_fitted': self.is_fitted,
-                'country_encoding': getattr(self, 'country_encoding', {})
-            }, f)
+        # Uncompressed joblib, so load() can memory-map the fitted arrays
+        # (including the prebuilt lookup tables) and workers share the pages
+        lookup_tables = {}
+        if self.is_fitted:
+            lookup_tables = {
+                'onehot': self._get_onehot_lookup(),
+                'country': self._get_country_lookup()
+            }
+
+        joblib.dump({
+            'scaler': self.scaler,
+            'minmax_scaler': self.minmax_scaler,
+            'target_encoder': self.target_encoder,
+            'onehot_encoder': self.onehot_encoder,
+            'feature_columns': self.feature_columns,
+            'feature_metadata': self.feature_metadata,
+            'is_fitted': self.is_fitted,
+            'country_encoding': getattr(self, 'country_encoding', {}),
+            'lookup_tables': lookup_tables
+        }, save_path, compress=0)
 
         logger.info(f"FeatureExtractor saved to {save_path}")
 
@@ -313,8 +568,7 @@ class FeatureExtractor:
         if not load_path.exists():
             raise FileNotFoundError(f"Feature extractor not found: {load_path}")
 
-        with open(load_path, 'rb') as f:
-            data = pickle.load(f)
+        data = joblib.load(load_path, mmap_mode='r')
 
         extractor = cls()
         extractor.scaler = data['scaler']
@@ -322,10 +576,19 @@ class FeatureExtractor:
         extractor.target_encoder = data['target_encoder']
         extractor.onehot_encoder = data['onehot_encoder']
         extractor.feature_columns = data['feature_columns']
-        extractor.feature_metadata = data['feature_metadata']
+        # Older files store {'human_readable_name': ..., 'technical_name': ...}
+        extractor.feature_metadata = {
+            feature: name['human_readable_name'] if isinstance(name, dict) else name
+            for feature, name in data['feature_metadata'].items()
+        }
         extractor.is_fitted = data['is_fitted']
         extractor.country_encoding = data.get('country_encoding', {})
 
+        # Older files have no lookup tables; they are rebuilt on first use
+        lookup_tables = data.get('lookup_tables', {})
+        extractor._onehot_lookup = lookup_tables.get('onehot')
+        extractor._country_lookup = lookup_tables.get('country')
+
         logger.info(f"FeatureExtractor loaded from {load_path}")
 
         return extractor
@@ -6,8 +6,8 @@ Simulates benign, suspicious, and malicious activities.
 """
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import uuid
+from datetime import datetime
+from pathlib import Path
 from typing import List, Dict
 from loguru import logger
 
@@ -20,10 +20,33 @@ from config.settings import (
 class AlertGenerator:
     """Generates synthetic SOC security alerts"""
 
+    # Compact dtypes of the generated frame: small integers and categoricals
+    # for the low-cardinality strings (bool columns are generated as NumPy
+    # bools already). data_volume_mb stays float64: as float32 its CSV text
+    # and parquet values would no longer parse to the same numbers.
+    COLUMN_DTYPES = {
+        "destination_port": "int32", "failed_login_attempts": "int16",
+        "connection_duration_seconds": "int32",
+        "unique_destinations_count": "int16",
+        "source_country": "category", "protocol": "category",
+        "process_executed": "category", "encryption_protocol": "category",
+        "label": "category"
+    }
+
+    # Bernoulli columns, drawn together by _random_flags
+    BOOL_COLUMNS = (
+        "successful_login_after_failures", "process_hash_known",
+        "admin_privilege_escalation", "off_hours_activity",
+        "geo_impossible_travel", "user_agent_anomaly",
+        "threat_intel_match", "lateral_movement_detected"
+    )
+
     def __init__(self, num_alerts: int = NUM_ALERTS, seed: int = RANDOM_SEED):
         self.num_alerts = num_alerts
         self.seed = seed
-        np.random.seed(seed)
+        # One PCG64 stream for the whole generator instead of the global
+        # legacy RandomState
+        self.rng = np.random.default_rng(np.random.SeedSequence(seed))
 
         # Calculate number of alerts per category
         self.num_benign = int(num_alerts * BENIGN_RATIO)
@@ -51,315 +74,474 @@ class AlertGenerator:
         """Generate all synthetic alerts"""
         logger.info("Generating synthetic alerts...")
 
-        benign_alerts = self._generate_benign_alerts(self.num_benign)
-        suspicious_alerts = self._generate_suspicious_alerts(self.num_suspicious)
-        malicious_alerts = self._generate_malicious_alerts(self.num_malicious)
-
-        # Combine all alerts
-        all_alerts = pd.concat([benign_alerts, suspicious_alerts, malicious_alerts], ignore_index=True)
+        batches = [
+            self._generate_benign_alerts(self.num_benign),
+            self._generate_suspicious_alerts(self.num_suspicious),
+            self._generate_malicious_alerts(self.num_malicious)
+        ]
 
-        # Shuffle
-        all_alerts = all_alerts.sample(frac=1, random_state=self.seed).reset_index(drop=True)
+        # Combine and shuffle in one pass: each column is concatenated and
+        # fancy-indexed by the same permutation
+        order = self.rng.permutation(self.num_alerts)
+        all_alerts = pd.DataFrame({
+            col: np.concatenate([np.asarray(batch[col]) for batch in batches])[order]
+            for col in batches[0]
+        }).astype(self.COLUMN_DTYPES, copy=False)
 
         logger.info(f"Generated {len(all_alerts)} total alerts")
         logger.info(f"Label distribution:\n{all_alerts['label'].value_counts()}")
 
         return all_alerts
 
-    def _generate_benign_alerts(self, n: int) -> pd.DataFrame:
-        """Generate benign (normal) alerts"""
-        alerts = []
-
-        for _ in range(n):
-            # Normal business hours (8 AM - 6 PM on weekdays)
-            timestamp = self._random_timestamp(business_hours=True)
-
-            alert = {
-                "alert_id": str(uuid.uuid4()),
-                "timestamp": timestamp.isoformat(),
-                "source_ip": self._random_ip(internal=True),
-                "source_country": np.random.choice(self.trusted_countries),
-                "destination_ip": self._random_ip(internal=True),
-                "destination_port": np.random.choice([80, 443, 22, 3389, 445]),
-                "protocol": np.random.choice(["TCP", "UDP"], p=[0.8, 0.2]),
-                "failed_login_attempts": np.random.choice([0, 1, 2], p=[0.7, 0.2, 0.1]),
-                "successful_login_after_failures": False,
-                "process_executed": np.random.choice(self.legitimate_processes),
-                "process_hash_known": True,
-                "admin_privilege_escalation": False,
-                "off_hours_activity": False,
-                "data_volume_mb": np.random.uniform(0.1, 50),
-                "connection_duration_seconds": int(np.random.uniform(10, 300)),
-                "unique_destinations_count": np.random.randint(1, 5),
-                "geo_impossible_travel": False,
-                "user_agent_anomaly": False,
-                "threat_intel_match": False,
-                "encryption_protocol": np.random.choice(["TLS", "SSL", "None"], p=[0.7, 0.2, 0.1]),
-                "lateral_movement_detected": False,
-                "label": LABEL_BENIGN
-            }
-            alerts.append(alert)
-
-        return pd.DataFrame(alerts)
-
-    def _generate_suspicious_alerts(self, n: int) -> pd.DataFrame:
-        """Generate suspicious (potentially risky) alerts"""
-        alerts = []
-
-        for _ in range(n):
-            # Mix of business and off-hours
-            timestamp = self._random_timestamp(business_hours=np.random.random() > 0.4)
-
-            alert = {
-                "alert_id": str(uuid.uuid4()),
-                "timestamp": timestamp.isoformat(),
-                "source_ip": self._random_ip(internal=np.random.random() > 0.3),
-                "source_country": np.random.choice(self.trusted_countries + self.suspicious_countries),
-                "destination_ip": self._random_ip(internal=True),
-                "destination_port": np.random.choice([80, 443, 22, 3389, 445, 8080, 1433]),
-                "protocol": np.random.choice(["TCP", "UDP"], p=[0.85, 0.15]),
-                "failed_login_attempts": np.random.choice([3, 4, 5, 6, 7], p=[0.3, 0.25, 0.2, 0.15, 0.1]),
-                "successful_login_after_failures": np.random.random() > 0.6,
-                "process_executed": np.random.choice(self.legitimate_processes + self.suspicious_processes[:2]),
-                "process_hash_known": np.random.random() > 0.3,
-                "admin_privilege_escalation": np.random.random() > 0.8,
-                "off_hours_activity": np.random.random() > 0.5,
-                "data_volume_mb": np.random.uniform(50, 200),
-                "connection_duration_seconds": int(np.random.uniform(300, 1800)),
-                "unique_destinations_count": np.random.randint(5, 15),
-                "geo_impossible_travel": np.random.random() > 0.85,
-                "user_agent_anomaly": np.random.random() > 0.7,
-                "threat_intel_match": False,  # Not on threat intel yet
-                "encryption_protocol": np.random.choice(["TLS", "SSL", "None"], p=[0.5, 0.3, 0.2]),
-                "lateral_movement_detected": np.random.random() > 0.9,
-                "label": LABEL_SUSPICIOUS
-            }
-            alerts.append(alert)
-
-        return pd.DataFrame(alerts)
-
-    def _generate_malicious_alerts(self, n: int) -> pd.DataFrame:
-        """Generate malicious (definitely bad) alerts"""
-        alerts = []
-
-        for _ in range(n):
-            # Mostly off-hours
-            timestamp = self._random_timestamp(business_hours=np.random.random() > 0.8)
-
-            # Choose attack type
-            attack_type = np.random.choice([
-                "brute_force", "data_exfiltration", "lateral_movement",
-                "privilege_escalation", "c2_communication"
-            ])
-
-            if attack_type == "brute_force":
-                alert = self._create_brute_force_alert(timestamp)
-            elif attack_type == "data_exfiltration":
-                alert = self._create_data_exfiltration_alert(timestamp)
-            elif attack_type == "lateral_movement":
-                alert = self._create_lateral_movement_alert(timestamp)
-            elif attack_type == "privilege_escalation":
-                alert = self._create_privilege_escalation_alert(timestamp)
-            else:  # c2_communication
-                alert = self._create_c2_communication_alert(timestamp)
-
-            alerts.append(alert)
-
-        return pd.DataFrame(alerts)
-
-    def _create_brute_force_alert(self, timestamp: datetime) -> Dict:
-        """Create brute force attack alert"""
+    def _generate_benign_alerts(self, n: int) -> Dict:
+        """Generate benign (normal) alert columns"""
+        # One vectorized draw per column instead of per-row RNG calls
+        # Normal business hours (8 AM - 6 PM on weekdays)
+        timestamps = self._random_timestamps(n, business_hours=True)
+
+        flags = self._random_flags(n, process_hash_known=1)
+
+        alerts = {
+            "alert_id": self._random_alert_ids(n),
+            "timestamp": timestamps,
+            "source_ip": self._random_ips(n, internal=True),
+            "source_country": self.rng.choice(self.trusted_countries, size=n),
+            "destination_ip": self._random_ips(n, internal=True),
+            "destination_port": self.rng.choice([80, 443, 22, 3389, 445], size=n),
+            "protocol": self.rng.choice(["TCP", "UDP"], size=n, p=[0.8, 0.2]),
+            "failed_login_attempts": self.rng.choice([0, 1, 2], size=n, p=[0.7, 0.2, 0.1]),
+            "successful_login_after_failures": flags["successful_login_after_failures"],
+            "process_executed": self.rng.choice(self.legitimate_processes, size=n),
+            "process_hash_known": flags["process_hash_known"],
+            "admin_privilege_escalation": flags["admin_privilege_escalation"],
+            "off_hours_activity": flags["off_hours_activity"],
+            "data_volume_mb": self.rng.uniform(0.1, 50, size=n),
+            "connection_duration_seconds": self.rng.uniform(10, 300, size=n).astype(np.int64),
+            "unique_destinations_count": self.rng.integers(1, 5, size=n),
+            "geo_impossible_travel": flags["geo_impossible_travel"],
+            "user_agent_anomaly": flags["user_agent_anomaly"],
+            "threat_intel_match": flags["threat_intel_match"],
+            "encryption_protocol": self.rng.choice(["TLS", "SSL", "None"], size=n, p=[0.7, 0.2, 0.1]),
+            "lateral_movement_detected": flags["lateral_movement_detected"],
+            "label": np.full(n, LABEL_BENIGN, dtype=object)
+        }
+
+        return alerts
+
+    def _generate_suspicious_alerts(self, n: int) -> Dict:
+        """Generate suspicious (potentially risky) alert columns"""
+        # Mix of business and off-hours
+        business_hours = self.rng.random(n) > 0.4
+        timestamps = self._random_timestamps(n, business_hours=business_hours)
+        source_internal = self.rng.random(n) > 0.3
+
+        flags = self._random_flags(
+            n,
+            successful_login_after_failures=0.4,
+            process_hash_known=0.7,
+            admin_privilege_escalation=0.2,
+            off_hours_activity=0.5,
+            geo_impossible_travel=0.15,
+            user_agent_anomaly=0.3,
+            lateral_movement_detected=0.1
+        )
+
+        alerts = {
+            "alert_id": self._random_alert_ids(n),
+            "timestamp": timestamps,
+            "source_ip": self._random_ips(n, internal=source_internal),
+            "source_country": self.rng.choice(self.trusted_countries + self.suspicious_countries, size=n),
+            "destination_ip": self._random_ips(n, internal=True),
+            "destination_port": self.rng.choice([80, 443, 22, 3389, 445, 8080, 1433], size=n),
+            "protocol": self.rng.choice(["TCP", "UDP"], size=n, p=[0.85, 0.15]),
+            "failed_login_attempts": self.rng.choice([3, 4, 5, 6, 7], size=n, p=[0.3, 0.25, 0.2, 0.15, 0.1]),
+            "successful_login_after_failures": flags["successful_login_after_failures"],
+            "process_executed": self.rng.choice(self.legitimate_processes + self.suspicious_processes[:2], size=n),
+            "process_hash_known": flags["process_hash_known"],
+            "admin_privilege_escalation": flags["admin_privilege_escalation"],
+            "off_hours_activity": flags["off_hours_activity"],
+            "data_volume_mb": self.rng.uniform(50, 200, size=n),
+            "connection_duration_seconds": self.rng.uniform(300, 1800, size=n).astype(np.int64),
+            "unique_destinations_count": self.rng.integers(5, 15, size=n),
+            "geo_impossible_travel": flags["geo_impossible_travel"],
+            "user_agent_anomaly": flags["user_agent_anomaly"],
+            "threat_intel_match": flags["threat_intel_match"],  # Not on threat intel yet
+            "encryption_protocol": self.rng.choice(["TLS", "SSL", "None"], size=n, p=[0.5, 0.3, 0.2]),
+            "lateral_movement_detected": flags["lateral_movement_detected"],
+            "label": np.full(n, LABEL_SUSPICIOUS, dtype=object)
+        }
+
+        return alerts
+
+    def _generate_malicious_alerts(self, n: int) -> Dict:
+        """Generate malicious (definitely bad) alert columns"""
+        # Mostly off-hours
+        business_hours = self.rng.random(n) > 0.8
+        timestamps = self._random_timestamps(n, business_hours=business_hours)
+
+        # Choose attack type
+        attack_types = self.rng.choice([
+            "brute_force", "data_exfiltration", "lateral_movement",
+            "privilege_escalation", "c2_communication"
+        ], size=n)
+
+        batch_generators = {
+            "brute_force": self._generate_brute_force_batch,
+            "data_exfiltration": self._generate_data_exfiltration_batch,
+            "lateral_movement": self._generate_lateral_movement_batch,
+            "privilege_escalation": self._generate_privilege_escalation_batch,
+            "c2_communication": self._generate_c2_communication_batch
+        }
+
+        # One batch per attack type, written back into the rows drawn for
+        # that type in pre-allocated column arrays (strings as object so a
+        # later batch's longer values are not truncated)
+        alerts = {}
+        for attack_type, generate_batch in batch_generators.items():
+            rows = np.flatnonzero(attack_types == attack_type)
+            for col, values in generate_batch(timestamps[rows]).items():
+                values = np.asarray(values)
+                if col not in alerts:
+                    dtype = object if values.dtype.kind in "OU" else values.dtype
+                    alerts[col] = np.empty(n, dtype=dtype)
+                alerts[col][rows] = values
+
+        return alerts
+
+    def _generate_brute_force_batch(self, timestamps: np.ndarray) -> Dict:
+        """Create brute force attack alert columns"""
+        n = len(timestamps)
+        flags = self._random_flags(
+            n,
+            successful_login_after_failures=0.5,
+            process_hash_known=1,
+            admin_privilege_escalation=0.4,
+            off_hours_activity=1,
+            geo_impossible_travel=0.5,
+            user_agent_anomaly=0.5,
+            threat_intel_match=0.7
+        )
         return {
-            "alert_id": str(uuid.uuid4()),
-            "timestamp": timestamp.isoformat(),
-            "source_ip": self._random_ip(internal=False),
-            "source_country": np.random.choice(self.suspicious_countries),
-            "destination_ip": self._random_ip(internal=True),
-            "destination_port": np.random.choice([22, 3389, 445]),
-            "protocol": "TCP",
-            "failed_login_attempts": np.random.randint(20, 150),
-            "successful_login_after_failures": np.random.random() > 0.5,
-            "process_executed": np.random.choice(self.legitimate_processes),
-            "process_hash_known": True,
-            "admin_privilege_escalation": np.random.random() > 0.6,
-            "off_hours_activity": True,
-            "data_volume_mb": np.random.uniform(1, 50),
-            "connection_duration_seconds": int(np.random.uniform(1800, 7200)),
-            "unique_destinations_count": np.random.randint(1, 3),
-            "geo_impossible_travel": np.random.random() > 0.5,
-            "user_agent_anomaly": np.random.random() > 0.5,
-            "threat_intel_match": np.random.random() > 0.3,
-            "encryption_protocol": "None",
-            "lateral_movement_detected": False,
-            "label": LABEL_MALICIOUS
+            "alert_id": self._random_alert_ids(n),
+            "timestamp": timestamps,
+            "source_ip": self._random_ips(n, internal=False),
+            "source_country": self.rng.choice(self.suspicious_countries, size=n),
+            "destination_ip": self._random_ips(n, internal=True),
+            "destination_port": self.rng.choice([22, 3389, 445], size=n),
+            "protocol": np.full(n, "TCP", dtype=object),
+            "failed_login_attempts": self.rng.integers(20, 150, size=n),
+            "successful_login_after_failures": flags["successful_login_after_failures"],
+            "process_executed": self.rng.choice(self.legitimate_processes, size=n),
+            "process_hash_known": flags["process_hash_known"],
+            "admin_privilege_escalation": flags["admin_privilege_escalation"],
+            "off_hours_activity": flags["off_hours_activity"],
+            "data_volume_mb": self.rng.uniform(1, 50, size=n),
+            "connection_duration_seconds": self.rng.uniform(1800, 7200, size=n).astype(np.int64),
+            "unique_destinations_count": self.rng.integers(1, 3, size=n),
+            "geo_impossible_travel": flags["geo_impossible_travel"],
+            "user_agent_anomaly": flags["user_agent_anomaly"],
+            "threat_intel_match": flags["threat_intel_match"],
+            "encryption_protocol": np.full(n, "None", dtype=object),
+            "lateral_movement_detected": flags["lateral_movement_detected"],
+            "label": np.full(n, LABEL_MALICIOUS, dtype=object)
         }
 
-    def _create_data_exfiltration_alert(self, timestamp: datetime) -> Dict:
-        """Create data exfiltration alert"""
+    def _generate_data_exfiltration_batch(self, timestamps: np.ndarray) -> Dict:
+        """Create data exfiltration alert columns"""
+        n = len(timestamps)
+        flags = self._random_flags(
+            n,
+            admin_privilege_escalation=1,
+            off_hours_activity=1,
+            user_agent_anomaly=1,
+            threat_intel_match=0.6
+        )
         return {
-            "alert_id": str(uuid.uuid4()),
-            "timestamp": timestamp.isoformat(),
-            "source_ip": self._random_ip(internal=True),
-            "source_country": np.random.choice(self.trusted_countries),
-            "destination_ip": self._random_ip(internal=False),
-            "destination_port": np.random.choice([80, 443, 21, 22]),
-            "protocol": "TCP",
-            "failed_login_attempts": np.random.randint(0, 3),
-            "successful_login_after_failures": False,
-            "process_executed": np.random.choice(self.suspicious_processes),
-            "process_hash_known": False,
-            "admin_privilege_escalation": True,
-            "off_hours_activity": True,
-            "data_volume_mb": np.random.uniform(500, 5000),  # Large data transfer
-            "connection_duration_seconds": int(np.random.uniform(3600, 14400)),
-            "unique_destinations_count": np.random.randint(1, 5),
-            "geo_impossible_travel": False,
-            "user_agent_anomaly": True,
-            "threat_intel_match": np.random.random() > 0.4,
-            "encryption_protocol": np.random.choice(["TLS", "None"], p=[0.6, 0.4]),
-            "lateral_movement_detected": False,
-            "label": LABEL_MALICIOUS
+            "alert_id": self._random_alert_ids(n),
+            "timestamp": timestamps,
+            "source_ip": self._random_ips(n, internal=True),
+            "source_country": self.rng.choice(self.trusted_countries, size=n),
+            "destination_ip": self._random_ips(n, internal=False),
+            "destination_port": self.rng.choice([80, 443, 21, 22], size=n),
+            "protocol": np.full(n, "TCP", dtype=object),
+            "failed_login_attempts": self.rng.integers(0, 3, size=n),
+            "successful_login_after_failures": flags["successful_login_after_failures"],
+            "process_executed": self.rng.choice(self.suspicious_processes, size=n),
+            "process_hash_known": flags["process_hash_known"],
+            "admin_privilege_escalation": flags["admin_privilege_escalation"],
+            "off_hours_activity": flags["off_hours_activity"],
+            "data_volume_mb": self.rng.uniform(500, 5000, size=n),  # Large data transfer
+            "connection_duration_seconds": self.rng.uniform(3600, 14400, size=n).astype(np.int64),
+            "unique_destinations_count": self.rng.integers(1, 5, size=n),
+            "geo_impossible_travel": flags["geo_impossible_travel"],
+            "user_agent_anomaly": flags["user_agent_anomaly"],
+            "threat_intel_match": flags["threat_intel_match"],
+            "encryption_protocol": self.rng.choice(["TLS", "None"], size=n, p=[0.6, 0.4]),
+            "lateral_movement_detected": flags["lateral_movement_detected"],
+            "label": np.full(n, LABEL_MALICIOUS, dtype=object)
         }
 
-    def _create_lateral_movement_alert(self, timestamp: datetime) -> Dict:
-        """Create lateral movement alert"""
+    def _generate_lateral_movement_batch(self, timestamps: np.ndarray) -> Dict:
+        """Create lateral movement alert columns"""
+        n = len(timestamps)
+        flags = self._random_flags(
+            n,
+            successful_login_after_failures=1,
+            admin_privilege_escalation=1,
+            off_hours_activity=1,
+            user_agent_anomaly=1,
+            threat_intel_match=0.5,
+            lateral_movement_detected=1
+        )
         return {
-            "alert_id": str(uuid.uuid4()),
-            "timestamp": timestamp.isoformat(),
-            "source_ip": self._random_ip(internal=True),
-            "source_country": np.random.choice(self.trusted_countries),
-            "destination_ip": self._random_ip(internal=True),
-            "destination_port": np.random.choice([445, 135, 139, 3389]),
-            "protocol": "TCP",
-            "failed_login_attempts": np.random.randint(5, 20),
-            "successful_login_after_failures": True,
-            "process_executed": np.random.choice(self.suspicious_processes),
-            "process_hash_known": False,
-            "admin_privilege_escalation": True,
-            "off_hours_activity": True,
-            "data_volume_mb": np.random.uniform(10, 100),
-            "connection_duration_seconds": int(np.random.uniform(300, 1800)),
-            "unique_destinations_count": np.random.randint(10, 50),  # Many internal hosts
-            "geo_impossible_travel": False,
-            "user_agent_anomaly": True,
-            "threat_intel_match": np.random.random() > 0.5,
-            "encryption_protocol": "None",
-            "lateral_movement_detected": True,
-            "label": LABEL_MALICIOUS
+            "alert_id": self._random_alert_ids(n),
+            "timestamp": timestamps,
+            "source_ip": self._random_ips(n, internal=True),
+            "source_country": self.rng.choice(self.trusted_countries, size=n),
+            "destination_ip": self._random_ips(n, internal=True),
+            "destination_port": self.rng.choice([445, 135, 139, 3389], size=n),
+            "protocol": np.full(n, "TCP", dtype=object),
+            "failed_login_attempts": self.rng.integers(5, 20, size=n),
+            "successful_login_after_failures": flags["successful_login_after_failures"],
+            "process_executed": self.rng.choice(self.suspicious_processes, size=n),
+            "process_hash_known": flags["process_hash_known"],
+            "admin_privilege_escalation": flags["admin_privilege_escalation"],
+            "off_hours_activity": flags["off_hours_activity"],
+            "data_volume_mb": self.rng.uniform(10, 100, size=n),
+            "connection_duration_seconds": self.rng.uniform(300, 1800, size=n).astype(np.int64),
+            "unique_destinations_count": self.rng.integers(10, 50, size=n),  # Many internal hosts
+            "geo_impossible_travel": flags["geo_impossible_travel"],
+            "user_agent_anomaly": flags["user_agent_anomaly"],
+            "threat_intel_match": flags["threat_intel_match"],
+            "encryption_protocol": np.full(n, "None", dtype=object),
+            "lateral_movement_detected": flags["lateral_movement_detected"],
+            "label": np.full(n, LABEL_MALICIOUS, dtype=object)
         }
 
-    def _create_privilege_escalation_alert(self, timestamp: datetime) -> Dict:
-        """Create privilege escalation alert"""
+    def _generate_privilege_escalation_batch(self, timestamps: np.ndarray) -> Dict:
+        """Create privilege escalation alert columns"""
+        n = len(timestamps)
+        flags = self._random_flags(
+            n,
+            successful_login_after_failures=1,
+            admin_privilege_escalation=1,
+            off_hours_activity=1,
+            geo_impossible_travel=0.3,
+            user_agent_anomaly=1,
+            threat_intel_match=0.6,
+            lateral_movement_detected=0.4
+        )
         return {
-            "alert_id": str(uuid.uuid4()),
-            "timestamp": timestamp.isoformat(),
-            "source_ip": self._random_ip(internal=True),
-            "source_country": np.random.choice(self.trusted_countries + self.suspicious_countries),
-            "destination_ip": self._random_ip(internal=True),
-            "destination_port": np.random.choice([22, 3389, 445]),
-            "protocol": "TCP",
-            "failed_login_attempts": np.random.randint(8, 25),
-            "successful_login_after_failures": True,
-            "process_executed": np.random.choice(self.suspicious_processes),
-            "process_hash_known": False,
-            "admin_privilege_escalation": True,
-            "off_hours_activity": True,
-            "data_volume_mb": np.random.uniform(5, 50),
-            "connection_duration_seconds": int(np.random.uniform(600, 3600)),
-            "unique_destinations_count": np.random.randint(2, 8),
-            "geo_impossible_travel": np.random.random() > 0.7,
-            "user_agent_anomaly": True,
-            "threat_intel_match": np.random.random() > 0.4,
-            "encryption_protocol": np.random.choice(["TLS", "None"], p=[0.4, 0.6]),
-            "lateral_movement_detected": np.random.random() > 0.6,
-            "label": LABEL_MALICIOUS
+            "alert_id": self._random_alert_ids(n),
+            "timestamp": timestamps,
+            "source_ip": self._random_ips(n, internal=True),
+            "source_country": self.rng.choice(self.trusted_countries + self.suspicious_countries, size=n),
+            "destination_ip": self._random_ips(n, internal=True),
+            "destination_port": self.rng.choice([22, 3389, 445], size=n),
+            "protocol": np.full(n, "TCP", dtype=object),
+            "failed_login_attempts": self.rng.integers(8, 25, size=n),
+            "successful_login_after_failures": flags["successful_login_after_failures"],
+            "process_executed": self.rng.choice(self.suspicious_processes, size=n),
+            "process_hash_known": flags["process_hash_known"],
+            "admin_privilege_escalation": flags["admin_privilege_escalation"],
+            "off_hours_activity": flags["off_hours_activity"],
+            "data_volume_mb": self.rng.uniform(5, 50, size=n),
+            "connection_duration_seconds": self.rng.uniform(600, 3600, size=n).astype(np.int64),
+            "unique_destinations_count": self.rng.integers(2, 8, size=n),
+            "geo_impossible_travel": flags["geo_impossible_travel"],
+            "user_agent_anomaly": flags["user_agent_anomaly"],
+            "threat_intel_match": flags["threat_intel_match"],
+            "encryption_protocol": self.rng.choice(["TLS", "None"], size=n, p=[0.4, 0.6]),
+            "lateral_movement_detected": flags["lateral_movement_detected"],
+            "label": np.full(n, LABEL_MALICIOUS, dtype=object)
         }
 
-    def _create_c2_communication_alert(self, timestamp: datetime) -> Dict:
-        """Create C2 (Command & Control) communication alert"""
+    def _generate_c2_communication_batch(self, timestamps: np.ndarray) -> Dict:
+        """Create C2 (Command & Control) communication alert columns"""
+        n = len(timestamps)
+        flags = self._random_flags(
+            n,
+            admin_privilege_escalation=0.4,
+            off_hours_activity=1,
+            user_agent_anomaly=1,
+            threat_intel_match=1,
+            lateral_movement_detected=0.3
+        )
         return {
-            "alert_id": str(uuid.uuid4()),
-            "timestamp": timestamp.isoformat(),
-            "source_ip": self._random_ip(internal=True),
-            "source_country": np.random.choice(self.trusted_countries),
-            "destination_ip": self._random_ip(internal=False),
-            "destination_port": np.random.choice([80, 443, 8080, 53]),
-            "protocol": np.random.choice(["TCP", "UDP"], p=[0.7, 0.3]),
-            "failed_login_attempts": 0,
-            "successful_login_after_failures": False,
-            "process_executed": np.random.choice(self.suspicious_processes),
-            "process_hash_known": False,
-            "admin_privilege_escalation": np.random.random() > 0.6,
-            "off_hours_activity": True,
-            "data_volume_mb": np.random.uniform(0.1, 10),  # Small beacons
-            "connection_duration_seconds": int(np.random.uniform(10, 120)),  # Short connections
-            "unique_destinations_count": np.random.randint(1, 3),
-            "geo_impossible_travel": False,
-            "user_agent_anomaly": True,
-            "threat_intel_match": True,  # Known C2 server
-            "encryption_protocol": np.random.choice(["TLS", "None"], p=[0.7, 0.3]),
-            "lateral_movement_detected": np.random.random() > 0.7,
-            "label": LABEL_MALICIOUS
+            "alert_id": self._random_alert_ids(n),
+            "timestamp": timestamps,
+            "source_ip": self._random_ips(n, internal=True),
+            "source_country": self.rng.choice(self.trusted_countries, size=n),
+            "destination_ip": self._random_ips(n, internal=False),
+            "destination_port": self.rng.choice([80, 443, 8080, 53], size=n),
+            "protocol": self.rng.choice(["TCP", "UDP"], size=n, p=[0.7, 0.3]),
+            "failed_login_attempts": np.zeros(n, dtype=np.int64),
+            "successful_login_after_failures": flags["successful_login_after_failures"],
+            "process_executed": self.rng.choice(self.suspicious_processes, size=n),
+            "process_hash_known": flags["process_hash_known"],
+            "admin_privilege_escalation": flags["admin_privilege_escalation"],
+            "off_hours_activity": flags["off_hours_activity"],
+            "data_volume_mb": self.rng.uniform(0.1, 10, size=n),  # Small beacons
+            "connection_duration_seconds": self.rng.uniform(10, 120, size=n).astype(np.int64),  # Short connections
+            "unique_destinations_count": self.rng.integers(1, 3, size=n),
+            "geo_impossible_travel": flags["geo_impossible_travel"],
+            "user_agent_anomaly": flags["user_agent_anomaly"],
+            "threat_intel_match": flags["threat_intel_match"],  # Known C2 server
+            "encryption_protocol": self.rng.choice(["TLS", "None"], size=n, p=[0.7, 0.3]),
+            "lateral_movement_detected": flags["lateral_movement_detected"],
+            "label": np.full(n, LABEL_MALICIOUS, dtype=object)
         }
 
-    def _random_timestamp(self, business_hours: bool = False) -> datetime:
-        """Generate random timestamp"""
+    def _random_flags(self, n: int, **probabilities: float) -> Dict[str, np.ndarray]:
+        """
+        Draw all boolean columns of a batch from one (columns, n) block
+
+        Args:
+            n: Number of rows
+            **probabilities: P(True) per column in BOOL_COLUMNS (0 if omitted)
+
+        Returns:
+            Dictionary of column name -> bool array (contiguous block rows)
+        """
+        unknown = set(probabilities).difference(self.BOOL_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown boolean columns: {sorted(unknown)}")
+
+        p = np.array([probabilities.get(col, 0.0) for col in self.BOOL_COLUMNS])
+        block = self.rng.random((len(p), n)) < p[:, None]
+        return dict(zip(self.BOOL_COLUMNS, block))
+
+    def _random_alert_ids(self, n: int) -> np.ndarray:
+        """
+        Generate n alert IDs in UUID4 format from the seeded generator
+
+        Args:
+            n: Number of IDs
+
+        Returns:
+            Array of UUID strings
+        """
+        raw = np.frombuffer(self.rng.bytes(n * 16), dtype=np.uint8).reshape(n, 16).copy()
+        # Version 4 and RFC 4122 variant bits, so the IDs parse as uuid4
+        raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+        raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+
+        hex_ids = raw.tobytes().hex()
+        return np.array([
+            f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+            for h in (hex_ids[i:i + 32] for i in range(0, len(hex_ids), 32))
+        ], dtype=object)
+
+    def _random_timestamps(self, n: int, business_hours=False) -> np.ndarray:
+        """
+        Generate n random timestamps
+
+        Args:
+            n: Number of timestamps
+            business_hours: Whether each timestamp falls on a weekday between
+                8 AM and 6 PM (bool or bool array); otherwise any time
+
+        Returns:
+            datetime64[us] array
+        """
+        business_hours = np.broadcast_to(np.asarray(business_hours, dtype=bool), (n,))
+
+        # Seconds and microseconds come from the current time, as before
+        now = np.datetime64(datetime.now(), 'us')
+        seconds = (now - now.astype('datetime64[D]')) % np.timedelta64(1, 'm')
+
         # Random date in the past 30 days
-        days_ago = np.random.randint(0, 30)
-        base_date = datetime.now() - timedelta(days=days_ago)
-
-        if business_hours:
-            # Weekday, 8 AM - 6 PM
-            weekday = np.random.randint(0, 5)  # Mon-Fri
-            hour = np.random.randint(8, 18)
-            base_date = base_date.replace(hour=hour, minute=np.random.randint(0, 60))
-            # Set to a weekday
-            while base_date.weekday() >= 5:
-                base_date -= timedelta(days=1)
-        else:
-            # Any time, including weekends and nights
-            hour = np.random.randint(0, 24)
-            base_date = base_date.replace(hour=hour, minute=np.random.randint(0, 60))
-
-        return base_date
-
-    def _random_ip(self, internal: bool = True) -> str:
-        """Generate random IP address"""
-        if internal:
-            # Internal IP ranges: 10.x.x.x or 192.168.x.x
-            if np.random.random() > 0.5:
-                return f"10.{np.random.randint(0, 256)}.{np.random.randint(0, 256)}.{np.random.randint(1, 256)}"
-            else:
-                return f"192.168.{np.random.randint(0, 256)}.{np.random.randint(1, 256)}"
-        else:
-            # External IP (avoiding private ranges)
-            octets = [np.random.randint(1, 256) for _ in range(4)]
-            # Avoid private ranges
-            while octets[0] in [10, 172, 192]:
-                octets[0] = np.random.randint(1, 256)
-            return ".".join(map(str, octets))
+        dates = now.astype('datetime64[D]') - self.rng.integers(0, 30, size=n).astype('timedelta64[D]')
+
+        # Business hours: 8 AM - 6 PM, moved back from a weekend to the Friday
+        # (1970-01-01 was a Thursday, so (days + 3) % 7 is 0 on Mondays).
+        # Otherwise any time, including weekends and nights
+        hours = np.where(business_hours, self.rng.integers(8, 18, size=n), self.rng.integers(0, 24, size=n))
+        minutes = self.rng.integers(0, 60, size=n)
+        weekday = (dates.astype(np.int64) + 3) % 7
+        dates = dates - np.where(business_hours & (weekday >= 5), weekday - 4, 0).astype('timedelta64[D]')
+
+        timestamps = (
+            dates.astype('datetime64[us]')
+            + hours.astype('timedelta64[h]')
+            + minutes.astype('timedelta64[m]')
+            + seconds
+        )
+        return timestamps
+
+    def _random_ips(self, n: int, internal=True) -> np.ndarray:
+        """
+        Generate n random IP addresses
+
+        Args:
+            n: Number of addresses
+            internal: Whether each address is internal (bool or bool array)
+
+        Returns:
+            Object array of dotted-quad strings
+        """
+        internal = np.broadcast_to(np.asarray(internal, dtype=bool), (n,))
+        ips = np.empty(n, dtype=object)
+
+        # Internal IP ranges: 10.x.x.x or 192.168.x.x
+        n_internal = int(internal.sum())
+        ten_net = (self.rng.random(n_internal) > 0.5).tolist()
+        x = self.rng.integers(0, 256, size=n_internal).tolist()
+        y = self.rng.integers(0, 256, size=n_internal).tolist()
+        z = self.rng.integers(1, 256, size=n_internal).tolist()
+        ips[internal] = [
+            f"10.{a}.{b}.{c}" if ten else f"192.168.{b}.{c}"
+            for ten, a, b, c in zip(ten_net, x, y, z)
+        ]
+
+        # External IP (avoiding private ranges): one (k, 4) draw, then only
+        # rows whose first octet is 10/172/192 are redrawn
+        octets = self.rng.integers(1, 256, size=(n - n_internal, 4))
+        redraw = np.isin(octets[:, 0], [10, 172, 192])
+        while redraw.any():
+            octets[redraw, 0] = self.rng.integers(1, 256, size=int(redraw.sum()))
+            redraw = np.isin(octets[:, 0], [10, 172, 192])
+        ips[~internal] = [".".join(map(str, row)) for row in octets.tolist()]
 
+        return ips
 
 def generate_and_save_alerts(output_path: str = None) -> pd.DataFrame:
     """
     Generate synthetic alerts and save to CSV
 
+    A parquet copy is written next to the CSV; AlertLoader.load_csv reads it
+    instead of re-parsing the CSV text. An output path ending in .parquet
+    writes only the parquet file. Timestamps are formatted as ISO 8601
+    strings once here, for both files; the returned frame keeps them as
+    datetime64.
+
     Args:
-        output_path: Path to save CSV file (default: from settings)
+        output_path: Path to save CSV (or .parquet) file (default: from settings)
 
     Returns:
         DataFrame of generated alerts
     """
     from config.settings import ALERTS_CSV_PATH
+    from src.ingestion.alert_loader import AlertLoader
 
     output_path = output_path or str(ALERTS_CSV_PATH)
 
     generator = AlertGenerator()
     alerts_df = generator.generate_alerts()
 
-    # Save to CSV
-    alerts_df.to_csv(output_path, index=False)
-    logger.info(f"Saved {len(alerts_df)} alerts to {output_path}")
+    export_df = alerts_df.assign(
+        timestamp=np.datetime_as_string(alerts_df["timestamp"].to_numpy(), unit="us")
+    )
+
+    parquet_path = Path(output_path).with_suffix(".parquet")
+    if Path(output_path).suffix != ".parquet":
+        # Save to CSV
+        export_df.to_csv(output_path, index=False)
+        logger.info(f"Saved {len(alerts_df)} alerts to {output_path}")
+
+    # Columnar copy for fast loading
+    AlertLoader.write_parquet(export_df, parquet_path)
+    logger.info(f"Saved {len(alerts_df)} alerts to {parquet_path}")
 
     return alerts_df
 
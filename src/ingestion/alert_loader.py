@@ -3,10 +3,11 @@ Alert Loader
 
 Loads and validates SOC alerts from CSV/JSON files.
 """
+import os
 import pandas as pd
 from pathlib import Path
 from loguru import logger
-from typing import Union
+from typing import List, Optional, Union
 
 
 class AlertLoader:
@@ -22,14 +23,186 @@ class AlertLoader:
         "user_agent_anomaly", "threat_intel_match", "encryption_protocol",
         "lateral_movement_detected", "label"
     ]
+    REQUIRED_COLUMNS_SET = frozenset(REQUIRED_COLUMNS)
+
+    # Explicit column types for the CSV reader (Arrow type aliases), so
+    # parsing skips type inference and timestamps stay ISO strings
+    COLUMN_TYPES = {
+        "alert_id": "string", "timestamp": "string", "source_ip": "string",
+        "source_country": "string", "destination_ip": "string",
+        "destination_port": "int64", "protocol": "string",
+        "failed_login_attempts": "int64", "successful_login_after_failures": "bool",
+        "process_executed": "string", "process_hash_known": "bool",
+        "admin_privilege_escalation": "bool", "off_hours_activity": "bool",
+        "data_volume_mb": "double", "connection_duration_seconds": "int64",
+        "unique_destinations_count": "int64", "geo_impossible_travel": "bool",
+        "user_agent_anomaly": "bool", "threat_intel_match": "bool",
+        "encryption_protocol": "string", "lateral_movement_detected": "bool",
+        "label": "string"
+    }
+
+    # The same types for the pandas CSV fallback
+    PANDAS_COLUMN_TYPES = {
+        col: {"string": "object", "double": "float64"}.get(alias, alias)
+        for col, alias in COLUMN_TYPES.items()
+    }
+
+    # pandas' default NA markers, so both CSV engines produce the same frame
+    NA_VALUES = [
+        "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+        "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+        "n/a", "nan", "null"
+    ]
+
+    # Small row groups let single alerts be read without decoding the file
+    PARQUET_ROW_GROUP_SIZE = 1024
+
+    # Parquet storage overrides: dictionary-encoded low-cardinality strings and
+    # narrower integers. Reads cast back to COLUMN_TYPES, so the DataFrame is
+    # the same whichever file it came from.
+    PARQUET_DICTIONARY_COLUMNS = [
+        "source_country", "protocol", "process_executed", "encryption_protocol", "label"
+    ]
+    PARQUET_INT32_COLUMNS = [
+        "destination_port", "failed_login_attempts",
+        "connection_duration_seconds", "unique_destinations_count"
+    ]
+
+    @staticmethod
+    def _arrow_schema(columns, storage: bool = False):
+        """
+        Arrow schema for the given alert columns
+
+        Args:
+            columns: Column names (unknown columns are left out)
+            storage: If True, apply the compact parquet storage types
+
+        Returns:
+            pyarrow.Schema
+        """
+        import pyarrow as pa
+
+        fields = []
+        for col in columns:
+            if col not in AlertLoader.COLUMN_TYPES:
+                continue
+            if storage and col in AlertLoader.PARQUET_DICTIONARY_COLUMNS:
+                arrow_type = pa.dictionary(pa.int32(), pa.string())
+            elif storage and col in AlertLoader.PARQUET_INT32_COLUMNS:
+                arrow_type = pa.int32()
+            else:
+                arrow_type = pa.type_for_alias(AlertLoader.COLUMN_TYPES[col])
+            fields.append(pa.field(col, arrow_type))
+        return pa.schema(fields)
+
+    @staticmethod
+    def arrow_to_pandas(table) -> pd.DataFrame:
+        """
+        Convert an Arrow table of alerts (e.g. a parquet row group) to pandas
+        with the standard alert dtypes
+
+        Args:
+            table: pyarrow.Table
+
+        Returns:
+            DataFrame of alerts
+        """
+        target = AlertLoader._arrow_schema(table.column_names)
+        for field in target:
+            idx = table.schema.get_field_index(field.name)
+            if table.schema.field(idx).type != field.type:
+                table = table.set_column(idx, field, table.column(idx).cast(field.type))
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    @staticmethod
+    def parquet_sibling(file_path: Union[str, Path]) -> Optional[Path]:
+        """
+        Return the parquet copy of a CSV if it exists and is up to date
+
+        Args:
+            file_path: Path to CSV file
+
+        Returns:
+            Path of the .parquet sibling, or None if missing or stale
+        """
+        file_path = Path(file_path)
+        parquet_path = file_path.with_suffix(".parquet")
+
+        if parquet_path.exists() and parquet_path.stat().st_mtime >= file_path.stat().st_mtime:
+            return parquet_path
+        return None
 
     @staticmethod
-    def load_csv(file_path: Union[str, Path]) -> pd.DataFrame:
+    def write_parquet(df: pd.DataFrame, file_path: Union[str, Path]) -> None:
+        """
+        Save alerts as parquet (zstd, PARQUET_ROW_GROUP_SIZE rows per group)
+
+        Written to a temporary file and renamed into place, so concurrent
+        readers (or other dashboard workers) never see a partial file.
+
+        Args:
+            df: DataFrame of alerts
+            file_path: Destination .parquet path
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(
+            df,
+            schema=AlertLoader._arrow_schema(df.columns, storage=True),
+            preserve_index=False
+        )
+        file_path = Path(file_path)
+        tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+        pq.write_table(
+            table,
+            tmp_path,
+            compression="zstd",
+            row_group_size=AlertLoader.PARQUET_ROW_GROUP_SIZE
+        )
+        os.replace(tmp_path, file_path)
+
+    @staticmethod
+    def _read_csv(file_path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Parse a CSV with pyarrow's multithreaded reader, falling back to pandas"""
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            df = pd.read_csv(file_path, usecols=columns, dtype=AlertLoader.PANDAS_COLUMN_TYPES)
+            return df[columns] if columns else df
+
+        convert_options = pa_csv.ConvertOptions(
+            column_types={
+                col: pa.type_for_alias(alias) for col, alias in AlertLoader.COLUMN_TYPES.items()
+            },
+            null_values=AlertLoader.NA_VALUES,
+            strings_can_be_null=True,
+            include_columns=columns or []
+        )
+        table = pa_csv.read_csv(file_path, convert_options=convert_options)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    @staticmethod
+    def _validate_columns(df: pd.DataFrame, columns: Optional[List[str]] = None):
+        """Raise ValueError if required (or requested) columns are missing"""
+        expected = set(columns) if columns else AlertLoader.REQUIRED_COLUMNS_SET
+        missing_cols = set(expected.difference(df.columns))
+        if missing_cols:
+            raise ValueError(f"Missing required columns: {missing_cols}")
+
+    @staticmethod
+    def load_csv(file_path: Union[str, Path], columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Load alerts from CSV file
 
+        If an up-to-date parquet copy exists alongside the CSV (written by
+        generate_and_save_alerts) it is read instead; a .parquet path is
+        read as parquet directly.
+
         Args:
             file_path: Path to CSV file
+            columns: Only load these columns, in this order (default: all)
 
         Returns:
             DataFrame of alerts
@@ -40,19 +213,56 @@ class AlertLoader:
         """
         file_path = Path(file_path)
 
+        if file_path.suffix == ".parquet":
+            return AlertLoader.load_parquet(file_path, columns)
+
         if not file_path.exists():
             raise FileNotFoundError(f"Alert file not found: {file_path}")
 
+        parquet_path = AlertLoader.parquet_sibling(file_path)
+        if parquet_path is not None:
+            return AlertLoader.load_parquet(parquet_path, columns)
+
         logger.info(f"Loading alerts from {file_path}")
-        df = pd.read_csv(file_path)
+        df = AlertLoader._read_csv(file_path, columns)
 
         # Validate columns
-        missing_cols = set(AlertLoader.REQUIRED_COLUMNS) - set(df.columns)
-        if missing_cols:
-            raise ValueError(f"Missing required columns: {missing_cols}")
+        AlertLoader._validate_columns(df, columns)
 
         logger.info(f"Loaded {len(df)} alerts with {len(df.columns)} columns")
-        logger.info(f"Label distribution:\n{df['label'].value_counts()}")
+        if 'label' in df.columns:
+            logger.info(f"Label distribution:\n{df['label'].value_counts()}")
+
+        return df
+
+    @staticmethod
+    def load_parquet(file_path: Union[str, Path], columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load alerts from parquet file
+
+        Args:
+            file_path: Path to parquet file
+            columns: Only read these columns, in this order (default: all)
+
+        Returns:
+            DataFrame of alerts
+        """
+        import pyarrow.parquet as pq
+
+        file_path = Path(file_path)
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"Alert file not found: {file_path}")
+
+        logger.info(f"Loading alerts from {file_path}")
+        df = AlertLoader.arrow_to_pandas(pq.read_table(file_path, columns=columns))
+
+        # Validate columns
+        AlertLoader._validate_columns(df, columns)
+
+        logger.info(f"Loaded {len(df)} alerts with {len(df.columns)} columns")
+        if 'label' in df.columns:
+            logger.info(f"Label distribution:\n{df['label'].value_counts()}")
 
         return df
 
@@ -76,21 +286,35 @@ class AlertLoader:
         df = pd.read_json(file_path)
 
         # Validate columns
-        missing_cols = set(AlertLoader.REQUIRED_COLUMNS) - set(df.columns)
-        if missing_cols:
-            raise ValueError(f"Missing required columns: {missing_cols}")
+        AlertLoader._validate_columns(df)
 
         logger.info(f"Loaded {len(df)} alerts")
 
         return df
 
+    @staticmethod
+    def build_index(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Index alerts by alert_id for repeated get_alert_by_id lookups
+
+        Args:
+            df: DataFrame of alerts
+
+        Returns:
+            Same alerts indexed by alert_id (the column is kept)
+        """
+        return df.set_index('alert_id', drop=False)
+
     @staticmethod
     def get_alert_by_id(df: pd.DataFrame, alert_id: str) -> pd.Series:
         """
         Get a specific alert by ID
 
+        A DataFrame from build_index is probed through its hash index;
+        otherwise the alert_id column is scanned.
+
         Args:
-            df: DataFrame of alerts
+            df: DataFrame of alerts (optionally from build_index)
             alert_id: Alert ID to find
 
         Returns:
@@ -99,6 +323,13 @@ class AlertLoader:
         Raises:
             ValueError: If alert ID not found
         """
+        if df.index.name == 'alert_id':
+            try:
+                # Duplicate IDs return the first match, like the scan below
+                return df.loc[alert_id] if df.index.is_unique else df.loc[[alert_id]].iloc[0]
+            except KeyError:
+                raise ValueError(f"Alert ID not found: {alert_id}") from None
+
         alert = df[df['alert_id'] == alert_id]
 
         if len(alert) == 0:
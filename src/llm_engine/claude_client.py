@@ -4,9 +4,18 @@ LLM Client (OpenAI) for Generating Human-Readable Explanations
 NOTE: This file now uses OpenAI API instead of Claude API.
 The name is kept for backward compatibility with existing imports.
 """
+from typing import TYPE_CHECKING
 
-# Import from the OpenAI client implementation
-from src.llm_engine.openai_client import LLMExplainer, ClaudeExplainer
+if TYPE_CHECKING:
+    from src.llm_engine.openai_client import ClaudeExplainer, LLMExplainer
 
 # For backward compatibility, alias ClaudeExplainer to LLMExplainer
 __all__ = ['ClaudeExplainer', 'LLMExplainer']
+
+
+def __getattr__(name):
+    """Re-export the OpenAI client implementation on first use"""
+    if name in __all__:
+        from src.llm_engine import openai_client
+        return getattr(openai_client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
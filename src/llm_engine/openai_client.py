@@ -3,15 +3,74 @@ OpenAI API Client for Generating Human-Readable Explanations
 
 Translates technical XAI output into SOC analyst-friendly explanations.
 """
+import asyncio
+import json
 import os
-from openai import OpenAI
-from typing import Dict
+import threading
+from importlib.util import find_spec
+
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
 from loguru import logger
 
 from config.settings import (
     OPENAI_API_KEY, OPENAI_MODEL,
-    LLM_MAX_TOKENS, LLM_TEMPERATURE
+    LLM_MAX_TOKENS, LLM_TEMPERATURE, LLM_CACHE_MAX_ENTRIES,
+    LLM_BATCH_MAX_PROMPT_TOKENS
 )
+from src.llm_engine.prompt_builder import PromptBuilder
+from src.llm_engine.response_cache import ResponseCache
+
+# openai (and its httpx stack) is imported when a client is first needed,
+# so importing the explainer, or running it offline, stays cheap
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# One sync client, and so one keep-alive connection pool, per API key for
+# all explainer instances in the process
+_shared_clients: Dict[str, "OpenAI"] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def get_shared_client(api_key: str) -> "OpenAI":
+    """
+    Return the process-wide OpenAI client for an API key
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        OpenAI client with a pooled (HTTP/2 when available) httpx client
+    """
+    with _shared_clients_lock:
+        client = _shared_clients.get(api_key)
+        if client is None:
+            import httpx
+            from openai import OpenAI
+
+            http_client = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+            )
+            client = OpenAI(api_key=api_key, http_client=http_client)
+            _shared_clients[api_key] = client
+        return client
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide LLM response cache, opening it on first use"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            from config.settings import LLM_CACHE_PATH
+            _response_cache = ResponseCache(LLM_CACHE_PATH, max_entries=LLM_CACHE_MAX_ENTRIES)
+        return _response_cache
 
 
 class LLMExplainer:
@@ -19,28 +78,242 @@ class LLMExplainer:
     Generates human-readable explanations using OpenAI API
     """
 
-    def __init__(self, api_key: str = None, model: str = None):
+    # Action codes the model may return (same vocabulary as _determine_action)
+    RECOMMENDED_ACTIONS = frozenset({
+        'investigate_immediately', 'investigate_soon', 'monitor_closely',
+        'mark_false_positive', 'review_later'
+    })
+
+    SYSTEM_PROMPT = (
+        "You are an expert SOC analyst explaining security alerts. "
+        "Respond with a JSON object with the keys \"explanation_text\" (string), "
+        "\"key_factors\" (list of short strings) and \"recommended_action\" "
+        f"(one of: {', '.join(sorted(RECOMMENDED_ACTIONS))})."
+    )
+
+    # Streamed replies are shown as they arrive, so they are requested as prose
+    STREAM_SYSTEM_PROMPT = "You are an expert SOC analyst explaining security alerts."
+
+    # System messages shared by every request (never mutated), so each call
+    # only builds the user message. They carry the static prompt
+    # instructions, leaving the per-alert context as the only part of a
+    # request that differs (and a long identical prefix for prompt caching)
+    SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": f"{SYSTEM_PROMPT}\n\n{PromptBuilder.STATIC_INSTRUCTIONS}"
+    }
+    STREAM_SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": f"{STREAM_SYSTEM_PROMPT}\n\n{PromptBuilder.STATIC_INSTRUCTIONS}"
+    }
+
+    # Batched requests explain several indexed alerts in one reply
+    BATCH_SYSTEM_PROMPT = (
+        "You are an expert SOC analyst explaining security alerts. "
+        "The user message contains several alerts tagged ALERT [1], ALERT [2], ... "
+        "Explain each one separately. Respond with a JSON object with the key "
+        "\"explanations\": a list with one object per alert, each with the keys "
+        "\"index\" (the alert's number), \"explanation_text\" (string), "
+        "\"key_factors\" (list of short strings) and \"recommended_action\" "
+        f"(one of: {', '.join(sorted(RECOMMENDED_ACTIONS))})."
+    )
+    BATCH_SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": f"{BATCH_SYSTEM_PROMPT}\n\n{PromptBuilder.STATIC_INSTRUCTIONS}"
+    }
+
+    # Legacy chat models that reject response_format; they still get the
+    # JSON instructions and their reply is parsed when it is valid JSON
+    JSON_MODE_UNSUPPORTED = frozenset({'gpt-4', 'gpt-4-0314', 'gpt-4-0613', 'gpt-4-32k', 'gpt-4-32k-0613'})
+
+    def __init__(self, api_key: str = None, model: str = None, use_cache: bool = True):
         """
         Initialize OpenAI client
 
         Args:
             api_key: OpenAI API key (default: from environment)
             model: OpenAI model to use (default: from settings)
+            use_cache: Answer repeated prompts from the on-disk response cache
         """
         self.api_key = api_key or OPENAI_API_KEY
         self.model = model or OPENAI_MODEL
+        self._async_client = None  # created on first agenerate_explanation
+
+        # Without a key every call goes straight to the template explanation,
+        # so no HTTP client (or response cache) is set up at all
+        self._offline = not self.api_key
+        if self._offline:
+            self.client = None
+            self.cache = None
+            logger.warning("OPENAI_API_KEY not set; using template explanations")
+            return
+
+        self.cache = get_response_cache() if use_cache else None
+        self.client = get_shared_client(self.api_key)
+        logger.info(f"OpenAI client initialized with model: {self.model}")
+
+    @property
+    def offline(self) -> bool:
+        """True when no API key is configured (template explanations only)"""
+        return self._offline
+
+    @property
+    def async_client(self) -> "AsyncOpenAI":
+        """Shared AsyncOpenAI client (one connection pool per explainer)"""
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(api_key=self.api_key)
+        return self._async_client
+
+    async def aclose(self):
+        """Close the async HTTP client if it was opened"""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    def _build_messages(
+        self,
+        prediction_data: Dict,
+        xai_data: Dict,
+        alert_data: Dict,
+        stream: bool = False
+    ) -> list:
+        """Build the chat messages for an explanation request"""
+        # Only the alert context; the static instructions are in the system message
+        prompt = PromptBuilder.build_alert_context(
+            prediction_data,
+            xai_data,
+            alert_data
+        )
 
-        if not self.api_key:
-            raise ValueError("OPENAI_API_KEY not set. Please set it in .env file")
+        return [
+            self.STREAM_SYSTEM_MESSAGE if stream else self.SYSTEM_MESSAGE,
+            {"role": "user", "content": prompt}
+        ]
+
+    def _request_kwargs(self, messages: list, stream: bool = False, max_tokens: int = LLM_MAX_TOKENS) -> Dict:
+        """Arguments for chat.completions.create"""
+        kwargs = {
+            'model': self.model,
+            'messages': messages,
+            'max_tokens': max_tokens,
+            'temperature': LLM_TEMPERATURE
+        }
+        if stream:
+            kwargs['stream'] = True
+        elif self.model not in self.JSON_MODE_UNSUPPORTED:
+            kwargs['response_format'] = {"type": "json_object"}
+        return kwargs
+
+    def _stream_tokens(self, messages: list) -> Iterator[str]:
+        """Yield the content deltas of a streamed chat completion"""
+        stream = self.client.chat.completions.create(**self._request_kwargs(messages, stream=True))
+        for chunk in stream:
+            if chunk.choices:
+                token = chunk.choices[0].delta.content
+                if token:
+                    yield token
+
+    def _cache_key(self, messages: list) -> str:
+        """Response cache key for a request"""
+        return ResponseCache.make_key(self.model, LLM_TEMPERATURE, LLM_MAX_TOKENS, messages)
+
+    def _cached_result(self, key: str, prediction_data: Dict) -> Optional[Dict]:
+        """Cached explanation for a request key, or None"""
+        if self.cache is None:
+            return None
+
+        result = self.cache.get(key)
+        if result is not None:
+            result['model_metadata']['cached'] = True
+            logger.debug("LLM response cache hit")
+        return result
+
+    def _store_result(self, key: str, result: Dict):
+        """Store a fresh API result in the response cache"""
+        if self.cache is not None:
+            self.cache.set(key, result)
+
+    def _build_result(
+        self,
+        content: str,
+        prediction_data: Dict,
+        completion_tokens: int,
+        total_tokens: Optional[int]
+    ) -> Dict:
+        """
+        Convert a model reply into the explanation dictionary
 
-        self.client = OpenAI(api_key=self.api_key)
-        logger.info(f"OpenAI client initialized with model: {self.model}")
+        Args:
+            content: Message content returned by the model
+            prediction_data: Prediction results
+            completion_tokens: Tokens in the reply
+            total_tokens: Prompt plus reply tokens (None when streamed)
+
+        Returns:
+            Explanation dictionary
+        """
+        explanation_text, key_factors, recommended_action = self._parse_content(content, prediction_data)
+
+        result = {
+            'explanation_text': explanation_text,
+            'recommended_action': recommended_action,
+            'key_factors': key_factors,
+            'model_metadata': {
+                'llm_model': self.model,
+                'tokens_used': completion_tokens,
+                'total_tokens': total_tokens,
+                'cached': False
+            }
+        }
+
+        logger.info(f"Generated explanation ({completion_tokens} tokens)")
+
+        return result
+
+    def _parse_content(self, content: str, prediction_data: Dict) -> Tuple[str, List[str], str]:
+        """
+        Split a JSON reply into explanation text, key factors and action
+
+        Plain-text replies are kept as the explanation; a missing or unknown
+        action falls back to the one derived from the prediction.
+
+        Args:
+            content: Message content returned by the model
+            prediction_data: Prediction results
+
+        Returns:
+            (explanation_text, key_factors, recommended_action)
+        """
+        try:
+            data = json.loads(content)
+        except (TypeError, ValueError):
+            data = None
+
+        if not isinstance(data, dict) or not data.get('explanation_text'):
+            return content, [], self._determine_action(prediction_data)
+
+        return self._parse_fields(data, prediction_data)
+
+    def _parse_fields(self, data: Dict, prediction_data: Dict) -> Tuple[str, List[str], str]:
+        """Explanation text, key factors and action of one parsed explanation object"""
+
+        key_factors = data.get('key_factors') or []
+        if not isinstance(key_factors, list):
+            key_factors = [key_factors]
+
+        action = data.get('recommended_action')
+        if action not in self.RECOMMENDED_ACTIONS:
+            action = self._determine_action(prediction_data)
+
+        return str(data['explanation_text']), [str(f) for f in key_factors], action
 
     def generate_explanation(
         self,
         prediction_data: Dict,
         xai_data: Dict,
-        alert_data: Dict
+        alert_data: Dict,
+        on_token: Callable[[str], None] = None
     ) -> Dict:
         """
         Generate human-readable explanation for a security alert classification
@@ -49,59 +322,355 @@ class LLMExplainer:
             prediction_data: Prediction results from ML model
             xai_data: SHAP explanation data
             alert_data: Original alert data
+            on_token: Called with each piece of text as it streams in; the
+                reply is then requested as prose rather than JSON
 
         Returns:
             Dictionary with explanation text and metadata
         """
-        from src.llm_engine.prompt_builder import PromptBuilder
+        if self._offline:
+            result = self._generate_fallback_explanation(prediction_data, xai_data)
+            if on_token is not None:
+                on_token(result['explanation_text'])
+            return result
 
-        # Build prompt
-        prompt = PromptBuilder.build_explanation_prompt(
-            prediction_data,
-            xai_data,
-            alert_data
-        )
+        messages = self._build_messages(prediction_data, xai_data, alert_data, stream=on_token is not None)
+
+        key = self._cache_key(messages)
+        cached = self._cached_result(key, prediction_data)
+        if cached is not None:
+            if on_token is not None:
+                on_token(cached['explanation_text'])
+            return cached
 
         logger.debug(f"Sending prompt to OpenAI API (model: {self.model})")
 
         try:
+            if on_token is not None:
+                tokens = []
+                for token in self._stream_tokens(messages):
+                    on_token(token)
+                    tokens.append(token)
+
+                # Streamed responses carry no usage; each chunk is one token
+                result = self._build_result("".join(tokens), prediction_data, len(tokens), None)
+                self._store_result(key, result)
+                return result
+
             # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert SOC analyst explaining security alerts."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=LLM_MAX_TOKENS,
-                temperature=LLM_TEMPERATURE
+            response = self.client.chat.completions.create(**self._request_kwargs(messages))
+
+            result = self._build_result(
+                response.choices[0].message.content, prediction_data,
+                response.usage.completion_tokens, response.usage.total_tokens
             )
+            self._store_result(key, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Error calling OpenAI API: {e}")
+            # Return fallback explanation
+            return self._generate_fallback_explanation(prediction_data, xai_data)
+
+    def generate_explanation_stream(
+        self,
+        prediction_data: Dict,
+        xai_data: Dict,
+        alert_data: Dict
+    ) -> Iterator[str]:
+        """
+        Stream the explanation text as the model produces it
+
+        Yields the whole template (or cached) text at once when offline or
+        on a cache hit, so callers can always just concatenate the pieces.
+
+        Args:
+            prediction_data: Prediction results from ML model
+            xai_data: SHAP explanation data
+            alert_data: Original alert data
+
+        Yields:
+            Pieces of the explanation text
+        """
+        if self._offline:
+            yield self._generate_fallback_explanation(prediction_data, xai_data)['explanation_text']
+            return
 
-            # Extract response
-            explanation_text = response.choices[0].message.content
+        messages = self._build_messages(prediction_data, xai_data, alert_data, stream=True)
 
-            # Determine recommended action from prediction
-            recommended_action = self._determine_action(prediction_data)
+        key = self._cache_key(messages)
+        cached = self._cached_result(key, prediction_data)
+        if cached is not None:
+            yield cached['explanation_text']
+            return
 
+        tokens = []
+        try:
+            for token in self._stream_tokens(messages):
+                tokens.append(token)
+                yield token
+
+        except Exception as e:
+            logger.error(f"Error streaming from OpenAI API: {e}")
+            if not tokens:
+                yield self._generate_fallback_explanation(prediction_data, xai_data)['explanation_text']
+            return
+
+        self._store_result(key, self._build_result("".join(tokens), prediction_data, len(tokens), None))
+
+    async def agenerate_explanation(
+        self,
+        prediction_data: Dict,
+        xai_data: Dict,
+        alert_data: Dict
+    ) -> Dict:
+        """
+        Async variant of generate_explanation for use inside an event loop
+
+        Several calls can be awaited together (e.g. with asyncio.gather) so
+        their network round-trips overlap.
+
+        Args:
+            prediction_data: Prediction results from ML model
+            xai_data: SHAP explanation data
+            alert_data: Original alert data
+
+        Returns:
+            Dictionary with explanation text and metadata
+        """
+        if self._offline:
+            return self._generate_fallback_explanation(prediction_data, xai_data)
+
+        messages = self._build_messages(prediction_data, xai_data, alert_data)
+
+        key = self._cache_key(messages)
+        cached = self._cached_result(key, prediction_data)
+        if cached is not None:
+            return cached
+
+        logger.debug(f"Sending prompt to OpenAI API (model: {self.model})")
+
+        try:
+            response = await self.async_client.chat.completions.create(**self._request_kwargs(messages))
+
+            result = self._build_result(
+                response.choices[0].message.content, prediction_data,
+                response.usage.completion_tokens, response.usage.total_tokens
+            )
+            self._store_result(key, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Error calling OpenAI API: {e}")
+            # Return fallback explanation
+            return self._generate_fallback_explanation(prediction_data, xai_data)
+
+    @staticmethod
+    def _batch_groups(pending: List[Tuple], batch_size: int) -> List[List[Tuple]]:
+        """
+        Pack pending alerts into request groups
+
+        A group is closed at batch_size alerts or when its estimated prompt
+        size (about 4 characters per token) would exceed
+        LLM_BATCH_MAX_PROMPT_TOKENS.
+
+        Args:
+            pending: (position, cache_key, alert_context) per alert
+            batch_size: Maximum alerts per group
+
+        Returns:
+            Lists of pending entries
+        """
+        groups, group, group_tokens = [], [], 0
+        for entry in pending:
+            tokens = len(entry[2]) // 4
+            if group and (len(group) >= batch_size or group_tokens + tokens > LLM_BATCH_MAX_PROMPT_TOKENS):
+                groups.append(group)
+                group, group_tokens = [], 0
+            group.append(entry)
+            group_tokens += tokens
+        if group:
+            groups.append(group)
+        return groups
+
+    @staticmethod
+    def _parse_batch_content(content: str) -> Dict[int, Dict]:
+        """Explanation objects of a batched JSON reply, by alert index"""
+        try:
+            data = json.loads(content)
+        except (TypeError, ValueError):
+            return {}
+
+        entries = data.get('explanations') if isinstance(data, dict) else None
+        parsed = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if isinstance(entry, dict) and entry.get('explanation_text'):
+                try:
+                    parsed[int(entry.get('index'))] = entry
+                except (TypeError, ValueError):
+                    continue
+        return parsed
+
+    async def _aexplain_group(self, items: List[Tuple[Dict, Dict, Dict]], group: List[Tuple], results: List):
+        """
+        Explain one group of alerts with a single batched request
+
+        The group is halved and retried when the request is too long for the
+        model's context window; alerts missing from the reply get their own
+        request. Results are written into results at each alert's position.
+
+        Args:
+            items: (prediction_data, xai_data, alert_data) per alert
+            group: (position, cache_key, alert_context) per alert in the group
+            results: Output list, indexed like items
+        """
+        prompt = PromptBuilder.join_alert_contexts([context for _, _, context in group])
+        messages = [self.BATCH_SYSTEM_MESSAGE, {"role": "user", "content": prompt}]
+
+        logger.debug(f"Sending batched prompt for {len(group)} alerts (model: {self.model})")
+
+        try:
+            response = await self.async_client.chat.completions.create(
+                **self._request_kwargs(messages, max_tokens=LLM_MAX_TOKENS * len(group))
+            )
+        except Exception as e:
+            if getattr(e, 'code', None) == 'context_length_exceeded' and len(group) > 1:
+                half = len(group) // 2
+                await self._aexplain_group(items, group[:half], results)
+                await self._aexplain_group(items, group[half:], results)
+                return
+
+            logger.error(f"Error calling OpenAI API: {e}")
+            for position, _, _ in group:
+                results[position] = self._generate_fallback_explanation(*items[position][:2])
+            return
+
+        parsed = self._parse_batch_content(response.choices[0].message.content)
+
+        # Usage is per request; each alert is credited an equal share
+        completion_tokens = response.usage.completion_tokens // len(group)
+        total_tokens = response.usage.total_tokens // len(group)
+
+        for i, (position, key, _) in enumerate(group, 1):
+            prediction_data, xai_data, alert_data = items[position]
+            entry = parsed.get(i)
+            if entry is None:
+                logger.warning(f"Batched reply has no explanation for alert {i}; requesting it alone")
+                results[position] = await self.agenerate_explanation(prediction_data, xai_data, alert_data)
+                continue
+
+            explanation_text, key_factors, recommended_action = self._parse_fields(entry, prediction_data)
             result = {
                 'explanation_text': explanation_text,
                 'recommended_action': recommended_action,
+                'key_factors': key_factors,
                 'model_metadata': {
                     'llm_model': self.model,
-                    'tokens_used': response.usage.completion_tokens,
-                    'total_tokens': response.usage.total_tokens
+                    'tokens_used': completion_tokens,
+                    'total_tokens': total_tokens,
+                    'cached': False,
+                    'batch_size': len(group)
                 }
             }
+            self._store_result(key, result)
+            results[position] = result
 
-            logger.info(f"Generated explanation ({response.usage.completion_tokens} tokens)")
+        logger.info(f"Generated {len(group)} explanations in one request ({response.usage.completion_tokens} tokens)")
 
-            return result
+    async def _agenerate_batched(
+        self,
+        items: List[Tuple[Dict, Dict, Dict]],
+        semaphore: asyncio.Semaphore,
+        batch_size: int
+    ) -> List[Dict]:
+        """Batched-prompt path of agenerate_explanations"""
+        results = [None] * len(items)
+
+        # Cache lookups use the single-alert request key, so batched and
+        # single requests share cache entries
+        pending = []
+        for position, (prediction_data, xai_data, alert_data) in enumerate(items):
+            messages = self._build_messages(prediction_data, xai_data, alert_data)
+            key = self._cache_key(messages)
+            cached = self._cached_result(key, prediction_data)
+            if cached is not None:
+                results[position] = cached
+            else:
+                pending.append((position, key, messages[1]["content"]))
 
-        except Exception as e:
-            logger.error(f"Error calling OpenAI API: {e}")
-            # Return fallback explanation
-            return self._generate_fallback_explanation(prediction_data, xai_data)
+        async def explain_group(group: List[Tuple]):
+            async with semaphore:
+                await self._aexplain_group(items, group, results)
+
+        await asyncio.gather(*(explain_group(group) for group in self._batch_groups(pending, batch_size)))
+        return results
+
+    async def agenerate_explanations(
+        self,
+        items: List[Tuple[Dict, Dict, Dict]],
+        concurrency: int = 8,
+        batch_size: int = 1
+    ) -> List[Dict]:
+        """
+        Generate explanations for several alerts with overlapping requests
+
+        Args:
+            items: (prediction_data, xai_data, alert_data) per alert
+            concurrency: Maximum requests in flight (stays under rate limits)
+            batch_size: Alerts packed into one request (1 = one request each)
+
+        Returns:
+            Explanation dictionaries, in the order of items
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        if batch_size > 1 and not self._offline:
+            return await self._agenerate_batched(items, semaphore, batch_size)
+
+        async def explain_one(prediction_data: Dict, xai_data: Dict, alert_data: Dict) -> Dict:
+            async with semaphore:
+                try:
+                    return await self.agenerate_explanation(prediction_data, xai_data, alert_data)
+                except Exception as e:
+                    logger.warning(f"LLM generation failed: {e}. Using fallback.")
+                    return self._generate_fallback_explanation(prediction_data, xai_data)
+
+        return await asyncio.gather(*(explain_one(*item) for item in items))
+
+    def generate_explanations_batch(
+        self,
+        items: List[Tuple[Dict, Dict, Dict]],
+        concurrency: int = 8,
+        batch_size: int = 1
+    ) -> List[Dict]:
+        """
+        Synchronous wrapper around agenerate_explanations
+
+        Runs its own event loop, so it must not be called from inside one
+        (use agenerate_explanations there).
+
+        Args:
+            items: (prediction_data, xai_data, alert_data) per alert
+            concurrency: Maximum requests in flight
+            batch_size: Alerts packed into one request (1 = one request each)
+
+        Returns:
+            Explanation dictionaries, in the order of items
+        """
+        if self._offline:
+            return [self._generate_fallback_explanation(p, x) for p, x, _ in items]
+
+        async def run() -> List[Dict]:
+            try:
+                return await self.agenerate_explanations(items, concurrency, batch_size)
+            finally:
+                # The async client is bound to this event loop
+                await self.aclose()
+
+        return asyncio.run(run())
 
-    def _determine_action(self, prediction_data: Dict) -> str:
+    @staticmethod
+    def _determine_action(prediction_data: Dict) -> str:
         """
         Determine recommended action based on prediction
 
@@ -127,7 +696,8 @@ class LLMExplainer:
             else:
                 return 'review_later'
 
-    def _generate_fallback_explanation(self, prediction_data: Dict, xai_data: Dict) -> Dict:
+    @staticmethod
+    def _generate_fallback_explanation(prediction_data: Dict, xai_data: Dict) -> Dict:
         """
         Generate fallback explanation if API call fails
 
@@ -153,7 +723,8 @@ class LLMExplainer:
 
         return {
             'explanation_text': fallback_text,
-            'recommended_action': self._determine_action(prediction_data),
+            'recommended_action': LLMExplainer._determine_action(prediction_data),
+            'key_factors': [f['human_readable_name'] for f in top_features],
             'model_metadata': {
                 'llm_model': 'fallback_template',
                 'tokens_used': 0,
@@ -173,7 +744,7 @@ if __name__ == "__main__":
     from src.xai.shap_explainer import SHAPExplainer
     from src.feature_engineering.feature_extractor import FeatureExtractor
     from src.ingestion.alert_loader import AlertLoader
-    from config.settings import ALERTS_CSV_PATH, ALERT_LABELS
+    from config.settings import ALERTS_CSV_PATH
 
     # Load components
     trainer = ModelTrainer.load()
@@ -192,7 +763,7 @@ if __name__ == "__main__":
     prediction = predictor.predict(X)
 
     # Generate SHAP explanation
-    predicted_class_idx = ALERT_LABELS.index(prediction['prediction'])
+    predicted_class_idx = predictor.class_index[prediction['prediction']]
     explainer = SHAPExplainer(
         trainer.model,
         extractor.feature_columns,
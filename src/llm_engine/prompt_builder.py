@@ -3,7 +3,66 @@ Prompt Builder for Claude API
 
 Constructs prompts for generating security alert explanations.
 """
-from typing import Dict
+from functools import lru_cache
+from string import Template
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from config.settings import LLM_PROMPT_TOP_FEATURES
+
+# Alert fields included in the prompt, in order, with their labels
+_KEY_FIELDS = (
+    ('timestamp', 'Timestamp'),
+    ('source_ip', 'Source IP'),
+    ('source_country', 'Source Country'),
+    ('destination_ip', 'Destination IP'),
+    ('destination_port', 'Destination Port'),
+    ('protocol', 'Protocol'),
+    ('failed_login_attempts', 'Failed Login Attempts'),
+    ('process_executed', 'Process Executed'),
+    ('data_volume_mb', 'Data Volume (MB)'),
+)
+
+# Feature value formatters keyed on exact type, so bool never falls
+# through to int; other types use str
+_VALUE_FMT = {
+    bool: lambda value: "Yes" if value else "No",
+    int: str,
+    float: lambda value: f"{value:.2f}",
+    np.float64: lambda value: f"{value:.2f}",
+}
+
+# Per-alert prompt body, parsed once at import
+_ALERT_CONTEXT_TEMPLATE = Template("""ALERT CLASSIFICATION:
+- Verdict: $verdict
+- Confidence: $confidence
+
+PROBABILITY BREAKDOWN:
+- Benign: $benign
+- Suspicious: $suspicious
+- Malicious: $malicious
+
+$factors_heading
+$factors
+
+ALERT DETAILS:
+$alert""")
+
+_FACTORS_HEADING = "TOP CONTRIBUTING FACTORS:"
+# Canned explanation for saturated benigns (see RealtimeProcessor.explain_batch)
+_GENERIC_FACTORS_HEADING = (
+    "TYPICAL HIGH-CONFIDENCE BENIGN PROFILE (generic factors, not computed for this alert):"
+)
+
+
+@lru_cache(maxsize=1024)
+def _format_key_fields(items: tuple) -> str:
+    """Alert details lines from (label, type, value) items; memoized for re-explained alerts"""
+    return "\n".join(
+        f"- {label}: {value:.2f}" if isinstance(value, float) else f"- {label}: {value}"
+        for label, _, value in items
+    )
 
 
 class PromptBuilder:
@@ -11,6 +70,23 @@ class PromptBuilder:
     Builds prompts for Claude API to generate SOC analyst explanations
     """
 
+    # Identical for every alert. It comes first (and can go in the system
+    # message) so providers' prompt caches can reuse the processed prefix;
+    # only the alert context after it changes between requests.
+    STATIC_INSTRUCTIONS = """You are a SOC (Security Operations Center) analyst explaining a security alert classification to a colleague.
+
+INSTRUCTIONS:
+For the alert below, write a clear, professional explanation (3-4 sentences) that:
+1. States the verdict and confidence level
+2. Explains the 2-3 most important factors that led to this decision
+3. Recommends a specific action:
+   - For MALICIOUS: "Investigate immediately" or "Escalate to incident response"
+   - For SUSPICIOUS: "Monitor closely" or "Investigate when possible"
+   - For BENIGN: "Mark as false positive" or "No action required"
+4. Uses SOC terminology, not ML jargon (e.g., say "threat intelligence match" not "SHAP value")
+
+Keep it concise, actionable, and write as if YOU are the analyst making the call. Avoid phrases like "the model thinks" or "AI analysis shows"."""
+
     @staticmethod
     def build_explanation_prompt(
         prediction_data: Dict,
@@ -26,13 +102,34 @@ class PromptBuilder:
             alert_data: Original alert data
 
         Returns:
-            Formatted prompt string
+            Formatted prompt string (static instructions, then alert context)
+        """
+        alert_context = PromptBuilder.build_alert_context(prediction_data, xai_data, alert_data)
+        return f"{PromptBuilder.STATIC_INSTRUCTIONS}\n\n{alert_context}"
+
+    @staticmethod
+    def build_alert_context(
+        prediction_data: Dict,
+        xai_data: Dict,
+        alert_data: Dict
+    ) -> str:
+        """
+        Build the per-alert part of the explanation prompt
+
+        Args:
+            prediction_data: ML model prediction results
+            xai_data: SHAP explanation data
+            alert_data: Original alert data
+
+        Returns:
+            Classification, probabilities, factors and alert details
         """
         prediction = prediction_data['prediction']
         confidence = prediction_data['confidence']
         probabilities = prediction_data['probabilities']
 
-        top_features = xai_data['top_contributing_features'][:5]
+        # Fixed top-K keeps the prompt (and its token count) bounded
+        top_features = xai_data['top_contributing_features'][:LLM_PROMPT_TOP_FEATURES]
 
         # Format top contributing factors
         factors_text = PromptBuilder._format_contributing_factors(top_features)
@@ -40,37 +137,47 @@ class PromptBuilder:
         # Format alert summary
         alert_summary = PromptBuilder._format_alert_summary(alert_data)
 
-        # Build prompt
-        prompt = f"""You are a SOC (Security Operations Center) analyst explaining a security alert classification to a colleague.
+        return _ALERT_CONTEXT_TEMPLATE.substitute(
+            verdict=prediction.upper(),
+            confidence=f"{confidence:.0%}",
+            benign=f"{probabilities.get('benign', 0):.0%}",
+            suspicious=f"{probabilities.get('suspicious', 0):.0%}",
+            malicious=f"{probabilities.get('malicious', 0):.0%}",
+            factors_heading=(
+                _GENERIC_FACTORS_HEADING if xai_data.get('generic_profile') else _FACTORS_HEADING
+            ),
+            factors=factors_text,
+            alert=alert_summary
+        )
 
-ALERT CLASSIFICATION:
-- Verdict: {prediction.upper()}
-- Confidence: {confidence:.0%}
+    @staticmethod
+    def build_batched_explanation_prompt(items: List[Tuple[Dict, Dict, Dict]]) -> str:
+        """
+        Build the per-alert part of a prompt covering several alerts
 
-PROBABILITY BREAKDOWN:
-- Benign: {probabilities.get('benign', 0):.0%}
-- Suspicious: {probabilities.get('suspicious', 0):.0%}
-- Malicious: {probabilities.get('malicious', 0):.0%}
+        Each alert context is tagged with a 1-based index (ALERT [1], ...)
+        that the model echoes back, so one request explains them all.
 
-TOP CONTRIBUTING FACTORS:
-{factors_text}
+        Args:
+            items: (prediction_data, xai_data, alert_data) per alert
 
-ALERT DETAILS:
-{alert_summary}
+        Returns:
+            Indexed alert contexts
+        """
+        return PromptBuilder.join_alert_contexts([PromptBuilder.build_alert_context(*item) for item in items])
 
-INSTRUCTIONS:
-Write a clear, professional explanation (3-4 sentences) that:
-1. States the verdict and confidence level
-2. Explains the 2-3 most important factors that led to this decision
-3. Recommends a specific action:
-   - For MALICIOUS: "Investigate immediately" or "Escalate to incident response"
-   - For SUSPICIOUS: "Monitor closely" or "Investigate when possible"
-   - For BENIGN: "Mark as false positive" or "No action required"
-4. Uses SOC terminology, not ML jargon (e.g., say "threat intelligence match" not "SHAP value")
+    @staticmethod
+    def join_alert_contexts(contexts: List[str]) -> str:
+        """
+        Tag already built alert contexts with their indexes for a batched prompt
 
-Keep it concise, actionable, and write as if YOU are the analyst making the call. Avoid phrases like "the model thinks" or "AI analysis shows"."""
+        Args:
+            contexts: build_alert_context output per alert
 
-        return prompt
+        Returns:
+            Indexed alert contexts
+        """
+        return "\n\n".join(f"ALERT [{i}]:\n{context}" for i, context in enumerate(contexts, 1))
 
     @staticmethod
     def _format_contributing_factors(top_features: list) -> str:
@@ -83,30 +190,13 @@ Keep it concise, actionable, and write as if YOU are the analyst making the call
         Returns:
             Formatted string
         """
-        lines = []
-        for i, feature in enumerate(top_features, 1):
-            name = feature['human_readable_name']
-            direction = feature['direction']
-            value = feature['feature_value']
-            contribution = feature['contribution_percentage']
-
-            # Format value nicely
-            if isinstance(value, bool):
-                value_str = "Yes" if value else "No"
-            elif isinstance(value, int):
-                value_str = str(value)
-            elif isinstance(value, float):
-                value_str = f"{value:.2f}"
-            else:
-                value_str = str(value)
-
-            direction_text = "increases" if direction == "increases_risk" else "decreases"
-
-            lines.append(
-                f"{i}. {name}: {value_str} ({direction_text} risk, {contribution:.1f}% contribution)"
-            )
-
-        return "\n".join(lines)
+        return "\n".join(
+            f"{i}. {feature['human_readable_name']}: "
+            f"{_VALUE_FMT.get(type(feature['feature_value']), str)(feature['feature_value'])} "
+            f"({'increases' if feature['direction'] == 'increases_risk' else 'decreases'} risk, "
+            f"{feature['contribution_percentage']:.1f}% contribution)"
+            for i, feature in enumerate(top_features, 1)
+        )
 
     @staticmethod
     def _format_alert_summary(alert_data: Dict) -> str:
@@ -119,29 +209,16 @@ Keep it concise, actionable, and write as if YOU are the analyst making the call
         Returns:
             Formatted string
         """
-        summary_lines = []
-
-        # Key fields to include
-        key_fields = [
-            ('timestamp', 'Timestamp'),
-            ('source_ip', 'Source IP'),
-            ('source_country', 'Source Country'),
-            ('destination_ip', 'Destination IP'),
-            ('destination_port', 'Destination Port'),
-            ('protocol', 'Protocol'),
-            ('failed_login_attempts', 'Failed Login Attempts'),
-            ('process_executed', 'Process Executed'),
-            ('data_volume_mb', 'Data Volume (MB)'),
-        ]
-
-        for field, label in key_fields:
-            if field in alert_data:
-                value = alert_data[field]
-                if isinstance(value, float):
-                    value = f"{value:.2f}"
-                summary_lines.append(f"- {label}: {value}")
-
-        return "\n".join(summary_lines)
+        # The type is part of the key: 1 and 1.0 hash alike but format differently
+        items = tuple(
+            (label, type(alert_data[field]), alert_data[field])
+            for field, label in _KEY_FIELDS
+            if field in alert_data
+        )
+        try:
+            return _format_key_fields(items)
+        except TypeError:  # unhashable value
+            return _format_key_fields.__wrapped__(items)
 
     @staticmethod
     def build_batch_summary_prompt(explanations: list) -> str:
@@ -0,0 +1,89 @@
+"""
+LLM Response Cache
+
+Bounded on-disk store of explanation results keyed on a hash of the
+request (model, sampling parameters and messages), so identical prompts
+are answered locally instead of by another API call.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from loguru import logger
+
+
+class ResponseCache:
+    """
+    SQLite-backed LRU-ish cache of LLM results
+
+    Args:
+        path: SQLite database file
+        max_entries: Entries kept; the least recently used are evicted
+    """
+
+    def __init__(self, path: Path, max_entries: int = 10000):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    @staticmethod
+    def make_key(model: str, temperature: float, max_tokens: int, messages: list) -> str:
+        """
+        Hash the parts of a request that determine its response
+
+        Args:
+            model: LLM model name
+            temperature: Sampling temperature
+            max_tokens: Completion token limit
+            messages: Chat messages sent to the model
+
+        Returns:
+            Hex sha256 digest
+        """
+        payload = json.dumps(messages, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{model}|{temperature}|{max_tokens}|{payload}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached result for a key, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Dict):
+        """Store a result, evicting the least recently used beyond max_entries"""
+        data = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, accessed) VALUES (?, ?, ?)",
+                (key, data, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+        logger.info(f"Cleared LLM response cache at {self.path}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
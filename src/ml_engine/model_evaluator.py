@@ -5,11 +5,9 @@ Evaluates model performance and generates metrics.
 """
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    classification_report, confusion_matrix, roc_auc_score, roc_curve
+    accuracy_score, precision_recall_fscore_support,
+    classification_report, confusion_matrix
 )
 from pathlib import Path
 from loguru import logger
@@ -18,6 +16,19 @@ from typing import Dict
 from config.settings import ALERT_LABELS, MODEL_DIR
 
 
+def _pyplot():
+    """
+    Import pyplot on first use with the headless Agg backend
+
+    matplotlib and seaborn are only needed for the plot_* methods, so
+    evaluate-only callers never pay for importing them.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
 class ModelEvaluator:
     """
     Evaluates trained model performance
@@ -40,25 +51,26 @@ class ModelEvaluator:
 
         # Predictions
         y_pred = model.predict(X_test)
-        y_pred_proba = model.predict_proba(X_test)
 
-        # Calculate metrics
+        # Calculate metrics (one precision/recall/F1 pass for all three)
+        precision, recall, f1, _ = precision_recall_fscore_support(
+            y_test, y_pred, average='weighted', zero_division=0
+        )
         metrics = {
             'accuracy': accuracy_score(y_test, y_pred),
-            'precision_weighted': precision_score(y_test, y_pred, average='weighted', zero_division=0),
-            'recall_weighted': recall_score(y_test, y_pred, average='weighted', zero_division=0),
-            'f1_weighted': f1_score(y_test, y_pred, average='weighted', zero_division=0)
+            'precision_weighted': precision,
+            'recall_weighted': recall,
+            'f1_weighted': f1
         }
 
-        # Per-class metrics
+        # Per-class metrics in one call
+        precision_per_class, recall_per_class, f1_per_class, _ = precision_recall_fscore_support(
+            y_test, y_pred, labels=ALERT_LABELS, average=None, zero_division=0
+        )
         for i, label in enumerate(ALERT_LABELS):
-            precision = precision_score(y_test, y_pred, labels=[label], average='binary', zero_division=0)
-            recall = recall_score(y_test, y_pred, labels=[label], average='binary', zero_division=0)
-            f1 = f1_score(y_test, y_pred, labels=[label], average='binary', zero_division=0)
-
-            metrics[f'precision_{label}'] = precision
-            metrics[f'recall_{label}'] = recall
-            metrics[f'f1_{label}'] = f1
+            metrics[f'precision_{label}'] = precision_per_class[i]
+            metrics[f'recall_{label}'] = recall_per_class[i]
+            metrics[f'f1_{label}'] = f1_per_class[i]
 
         # Confusion matrix
         cm = confusion_matrix(y_test, y_pred, labels=ALERT_LABELS)
@@ -68,7 +80,7 @@ class ModelEvaluator:
         report = classification_report(y_test, y_pred, labels=ALERT_LABELS, target_names=ALERT_LABELS)
         metrics['classification_report'] = report
 
-        logger.info(f"Evaluation complete. Accuracy: {metrics['accuracy']:.4f}")
+        logger.info("Evaluation complete. Accuracy: {:.4f}", metrics['accuracy'])
 
         return metrics
 
@@ -84,6 +96,9 @@ class ModelEvaluator:
             confusion_matrix: Confusion matrix array
             save_path: Optional path to save figure
         """
+        import seaborn as sns
+        plt = _pyplot()
+
         plt.figure(figsize=(8, 6))
         sns.heatmap(
             confusion_matrix,
@@ -100,7 +115,7 @@ class ModelEvaluator:
 
         if save_path:
             plt.savefig(save_path)
-            logger.info(f"Confusion matrix saved to {save_path}")
+            logger.info("Confusion matrix saved to {}", save_path)
 
         plt.close()
 
@@ -118,6 +133,7 @@ class ModelEvaluator:
             top_n: Number of top features to plot
             save_path: Optional path to save figure
         """
+        plt = _pyplot()
         top_features = feature_importance.head(top_n)
 
         plt.figure(figsize=(10, 8))
@@ -129,7 +145,7 @@ class ModelEvaluator:
 
         if save_path:
             plt.savefig(save_path)
-            logger.info(f"Feature importance plot saved to {save_path}")
+            logger.info("Feature importance plot saved to {}", save_path)
 
         plt.close()
 
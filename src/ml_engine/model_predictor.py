@@ -3,21 +3,127 @@ ML Model Prediction
 
 Makes predictions on new security alerts.
 """
+import threading
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
+from pathlib import Path
 from typing import Dict, List
 from loguru import logger
 
-from config.settings import ALERT_LABELS
-
 
 class ModelPredictor:
     """
     Makes predictions using trained Random Forest model
     """
 
-    def __init__(self, model):
+    # Feature rows whose (label, probabilities) are kept for reuse
+    PREDICTION_CACHE_SIZE = 10_000
+
+    def __init__(self, model, onnx_path: Path = None, cache_size: int = PREDICTION_CACHE_SIZE):
+        """
+        Args:
+            model: Trained RandomForestClassifier
+            onnx_path: Optional ONNX export of the same model (see
+                       ModelTrainer.save); served with onnxruntime when installed
+            cache_size: LRU size of the per-row prediction cache (0 disables it)
+        """
         self.model = model
+        self._onnx_session = None
+
+        # Probability columns follow model.classes_ (sorted labels), which
+        # is not the ALERT_LABELS order
+        self.classes = tuple(model.classes_)
+        self._class_array = np.asarray(model.classes_, dtype=object)
+        # Label -> probability column (also the SHAP output index)
+        self.class_index = {label: i for i, label in enumerate(self.classes)}
+
+        # Training column order; inputs are aligned to it before the float32
+        # conversion, since positional ONNX/array inputs cannot check names
+        self.feature_names = list(getattr(model, 'feature_names_in_', []))
+
+        # Row bytes (float32, as the trees compare them) -> (label, probabilities)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        if onnx_path is not None:
+            try:
+                import onnxruntime as ort
+
+                options = ort.SessionOptions()
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                self._onnx_session = ort.InferenceSession(
+                    str(onnx_path), sess_options=options, providers=['CPUExecutionProvider']
+                )
+                logger.info("Using ONNX Runtime for inference ({})", onnx_path)
+            except Exception as e:
+                logger.warning("ONNX Runtime unavailable, using sklearn: {}", e)
+
+    def _run_model(self, values: np.ndarray, columns) -> tuple:
+        """Return (labels, probabilities) for float32 rows from ONNX Runtime or sklearn"""
+        if self._onnx_session is not None:
+            # Trees compare float32 features either way, so results match sklearn
+            labels, probabilities = self._onnx_session.run(None, {'X': values})
+            return np.asarray(labels, dtype=object), probabilities
+
+        # One forest pass: predict() would traverse the trees again just to
+        # take the argmax of predict_proba
+        probabilities = self.model.predict_proba(pd.DataFrame(values, columns=columns))
+        return self._class_array[probabilities.argmax(axis=1)], probabilities
+
+    def predict_arrays(self, X: pd.DataFrame) -> tuple:
+        """
+        Return (labels, probabilities), running the model only on new rows
+
+        Identical rows within X are predicted once, and rows seen by earlier
+        calls are answered from the LRU cache. Batch callers can use the
+        arrays directly; predict() turns them into per-alert dictionaries.
+
+        Args:
+            X: Feature matrix
+
+        Returns:
+            (labels, probabilities) arrays aligned with X; probability
+            columns follow self.classes
+        """
+        if self.feature_names and list(X.columns) != self.feature_names:
+            missing = set(self.feature_names) - set(X.columns)
+            if missing:
+                raise ValueError(f"Missing feature columns: {sorted(missing)}")
+            X = X[self.feature_names]
+
+        values = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+        if self.cache_size <= 0 or len(values) == 0:
+            return self._run_model(values, X.columns)
+
+        # Each row as one opaque bytes value, so rows can be deduplicated and hashed
+        rows = values.view(np.dtype((np.void, values.dtype.itemsize * values.shape[1]))).ravel()
+        unique_rows, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+        keys = [row.tobytes() for row in unique_rows]
+
+        found = [None] * len(keys)
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                entry = self._cache.get(key)
+                if entry is not None:
+                    self._cache.move_to_end(key)
+                    found[i] = entry
+
+        misses = [i for i, entry in enumerate(found) if entry is None]
+        if misses:
+            labels, probabilities = self._run_model(values[first[misses]], X.columns)
+            with self._cache_lock:
+                for i, label, proba in zip(misses, labels, probabilities):
+                    found[i] = (label, proba)
+                    self._cache[keys[i]] = found[i]
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        unique_labels = np.array([label for label, _ in found], dtype=object)
+        unique_probabilities = np.stack([proba for _, proba in found])
+        return unique_labels[inverse], unique_probabilities[inverse]
 
     def predict(self, X: pd.DataFrame) -> Dict:
         """
@@ -34,30 +140,21 @@ class ModelPredictor:
             X = X.to_frame().T
 
         # Get predictions
-        predictions = self.model.predict(X)
-        probabilities = self.model.predict_proba(X)
-
-        results = []
-        for i in range(len(X)):
-            pred = predictions[i]
-            proba = probabilities[i]
-
-            # Create probability dictionary
-            proba_dict = {
-                label: float(prob)
-                for label, prob in zip(ALERT_LABELS, proba)
-            }
+        predictions, probabilities = self.predict_arrays(X)
 
-            # Get confidence (max probability)
-            confidence = float(max(proba))
-
-            result = {
+        # Confidence (max probability) in one pass; tolist() converts to
+        # Python str/float in C instead of per-element casts
+        confidences = probabilities.max(axis=1).tolist()
+        results = [
+            {
                 'prediction': pred,
                 'confidence': confidence,
-                'probabilities': proba_dict
+                'probabilities': dict(zip(self.classes, proba))
             }
-
-            results.append(result)
+            for pred, confidence, proba in zip(
+                np.asarray(predictions).tolist(), confidences, probabilities.tolist()
+            )
+        ]
 
         # Return single result if single input, otherwise list
         if len(results) == 1:
@@ -93,7 +190,7 @@ if __name__ == "__main__":
     X_test = extractor.transform(df.head(5))
 
     # Make predictions
-    predictor = ModelPredictor(trainer.model)
+    predictor = ModelPredictor(trainer.model, trainer.onnx_path)
     results = predictor.predict(X_test)
 
     print(f"\nPredictions for {len(X_test)} alerts:")
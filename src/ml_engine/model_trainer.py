@@ -6,21 +6,34 @@ Trains Random Forest classifier for security alert classification.
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, GridSearchCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import train_test_split, HalvingGridSearchCV
 from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
+    accuracy_score, precision_recall_fscore_support,
     classification_report, confusion_matrix
 )
-import pickle
+import joblib
+import json
+from importlib.util import find_spec
 from pathlib import Path
 from loguru import logger
 from typing import Tuple, Dict
 
 from config.settings import (
     RANDOM_SEED, TEST_SIZE, MODEL_DIR, ALERT_LABELS,
-    N_ESTIMATORS_OPTIONS, MAX_DEPTH_OPTIONS, MIN_SAMPLES_SPLIT_OPTIONS
+    N_ESTIMATORS_OPTIONS, MAX_DEPTH_OPTIONS, MIN_SAMPLES_SPLIT_OPTIONS,
+    RF_MAX_SAMPLES
 )
 
+# Training metrics are stored as JSON (scalars, report, best params) plus
+# a compressed .npz (confusion matrix, feature importance)
+METRICS_JSON = "training_metrics.json"
+METRICS_ARRAYS = "training_metrics.npz"
+LEGACY_METRICS = "training_metrics.pkl"
+
+# Model pickle compression: LZ4 when the optional lz4 package is installed
+MODEL_COMPRESSION = ('lz4', 3) if find_spec('lz4') else ('zlib', 3)
+
 
 class ModelTrainer:
     """
@@ -32,6 +45,7 @@ class ModelTrainer:
         self.model = None
         self.best_params = None
         self.training_metrics = {}
+        self.onnx_path = None  # set by save/load when an ONNX export exists
 
     def train(
         self,
@@ -50,14 +64,14 @@ class ModelTrainer:
         Returns:
             Trained RandomForestClassifier
         """
-        logger.info(f"Training Random Forest with {len(X)} samples, {X.shape[1]} features")
+        logger.info("Training Random Forest with {} samples, {} features", len(X), X.shape[1])
 
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=TEST_SIZE, random_state=self.random_seed, stratify=y
         )
 
-        logger.info(f"Train set: {len(X_train)}, Test set: {len(X_test)}")
+        logger.info("Train set: {}, Test set: {}", len(X_train), len(X_test))
 
         if hyperparameter_tuning:
             logger.info("Performing hyperparameter tuning...")
@@ -70,6 +84,8 @@ class ModelTrainer:
                 max_depth=20,
                 min_samples_split=5,
                 class_weight='balanced',
+                bootstrap=True,
+                max_samples=RF_MAX_SAMPLES,
                 random_state=self.random_seed,
                 n_jobs=-1
             )
@@ -90,7 +106,11 @@ class ModelTrainer:
         y_train: pd.Series
     ) -> RandomForestClassifier:
         """
-        Perform hyperparameter tuning using GridSearchCV
+        Perform hyperparameter tuning using successive halving
+
+        All grid candidates start on a small sample of the training rows;
+        each round keeps the best third and triples their samples, so only
+        the finalists are fitted on the full training set.
 
         Args:
             X_train: Training features
@@ -105,19 +125,25 @@ class ModelTrainer:
             'min_samples_split': MIN_SAMPLES_SPLIT_OPTIONS
         }
 
-        # Base model
+        # Base model. The search already runs candidates in parallel, so
+        # each forest fits single-threaded instead of competing for cores.
         base_model = RandomForestClassifier(
             class_weight='balanced',
+            bootstrap=True,
+            max_samples=RF_MAX_SAMPLES,
             random_state=self.random_seed,
-            n_jobs=-1
+            n_jobs=1
         )
 
-        # GridSearchCV
-        grid_search = GridSearchCV(
+        # Same grid as an exhaustive search, far fewer full-size fits
+        grid_search = HalvingGridSearchCV(
             base_model,
             param_grid,
+            factor=3,
+            resource='n_samples',
             cv=5,
             scoring='f1_weighted',
+            random_state=self.random_seed,
             n_jobs=-1,
             verbose=1
         )
@@ -125,9 +151,10 @@ class ModelTrainer:
         grid_search.fit(X_train, y_train)
 
         self.best_params = grid_search.best_params_
-        logger.info(f"Best parameters: {self.best_params}")
+        logger.info("Best parameters: {}", self.best_params)
 
-        return grid_search.best_estimator_
+        # Predict with all cores once the search is done
+        return grid_search.best_estimator_.set_params(n_jobs=-1)
 
     def _evaluate_model(self, X_test: pd.DataFrame, y_test: pd.Series) -> Dict:
         """
@@ -142,20 +169,22 @@ class ModelTrainer:
         """
         # Predictions
         y_pred = self.model.predict(X_test)
-        y_pred_proba = self.model.predict_proba(X_test)
 
-        # Calculate metrics
+        # Calculate metrics (one precision/recall/F1 pass for all three)
+        precision, recall, f1, _ = precision_recall_fscore_support(
+            y_test, y_pred, average='weighted', zero_division=0
+        )
         metrics = {
             'accuracy': accuracy_score(y_test, y_pred),
-            'precision_weighted': precision_score(y_test, y_pred, average='weighted', zero_division=0),
-            'recall_weighted': recall_score(y_test, y_pred, average='weighted', zero_division=0),
-            'f1_weighted': f1_score(y_test, y_pred, average='weighted', zero_division=0),
+            'precision_weighted': precision,
+            'recall_weighted': recall,
+            'f1_weighted': f1,
         }
 
         # Per-class metrics
-        precision_per_class = precision_score(y_test, y_pred, average=None, labels=ALERT_LABELS, zero_division=0)
-        recall_per_class = recall_score(y_test, y_pred, average=None, labels=ALERT_LABELS, zero_division=0)
-        f1_per_class = f1_score(y_test, y_pred, average=None, labels=ALERT_LABELS, zero_division=0)
+        precision_per_class, recall_per_class, f1_per_class, _ = precision_recall_fscore_support(
+            y_test, y_pred, average=None, labels=ALERT_LABELS, zero_division=0
+        )
 
         for i, label in enumerate(ALERT_LABELS):
             metrics[f'precision_{label}'] = precision_per_class[i]
@@ -185,32 +214,32 @@ class ModelTrainer:
         logger.info("=" * 60)
         logger.info("MODEL TRAINING METRICS")
         logger.info("=" * 60)
-        logger.info(f"Accuracy: {self.training_metrics['accuracy']:.4f}")
-        logger.info(f"Weighted Precision: {self.training_metrics['precision_weighted']:.4f}")
-        logger.info(f"Weighted Recall: {self.training_metrics['recall_weighted']:.4f}")
-        logger.info(f"Weighted F1-Score: {self.training_metrics['f1_weighted']:.4f}")
+        logger.info("Accuracy: {:.4f}", self.training_metrics['accuracy'])
+        logger.info("Weighted Precision: {:.4f}", self.training_metrics['precision_weighted'])
+        logger.info("Weighted Recall: {:.4f}", self.training_metrics['recall_weighted'])
+        logger.info("Weighted F1-Score: {:.4f}", self.training_metrics['f1_weighted'])
         logger.info("")
 
         logger.info("Per-Class Metrics:")
         for label in ALERT_LABELS:
-            logger.info(f"  {label.upper()}:")
-            logger.info(f"    Precision: {self.training_metrics[f'precision_{label}']:.4f}")
-            logger.info(f"    Recall:    {self.training_metrics[f'recall_{label}']:.4f}")
-            logger.info(f"    F1-Score:  {self.training_metrics[f'f1_{label}']:.4f}")
+            logger.info("  {}:", label.upper())
+            logger.info("    Precision: {:.4f}", self.training_metrics[f'precision_{label}'])
+            logger.info("    Recall:    {:.4f}", self.training_metrics[f'recall_{label}'])
+            logger.info("    F1-Score:  {:.4f}", self.training_metrics[f'f1_{label}'])
         logger.info("")
 
         logger.info("Confusion Matrix:")
-        logger.info(f"{self.training_metrics['confusion_matrix']}")
+        logger.info("{}", self.training_metrics['confusion_matrix'])
         logger.info("")
 
         logger.info("Classification Report:")
-        logger.info(f"\n{self.training_metrics['classification_report']}")
+        logger.info("\n{}", self.training_metrics['classification_report'])
         logger.info("")
 
         logger.info("Top 10 Most Important Features:")
         top_features = self.training_metrics['feature_importance'].head(10)
         for idx, row in top_features.iterrows():
-            logger.info(f"  {row['feature']}: {row['importance']:.4f}")
+            logger.info("  {}: {:.4f}", row['feature'], row['importance'])
         logger.info("=" * 60)
 
     def save(self, directory: Path = None):
@@ -220,20 +249,110 @@ class ModelTrainer:
         directory.mkdir(parents=True, exist_ok=True)
 
         model_path = directory / "random_forest_model.pkl"
-        metrics_path = directory / "training_metrics.pkl"
 
         # Save model
-        with open(model_path, 'wb') as f:
-            pickle.dump(self.model, f)
-        logger.info(f"Model saved to {model_path}")
+        joblib.dump(self.model, model_path, compress=MODEL_COMPRESSION)
+        logger.info("Model saved to {}", model_path)
+
+        # ONNX copy for ModelPredictor's fast inference path (optional)
+        self.onnx_path = self._export_onnx(directory / "random_forest_model.onnx")
 
         # Save metrics
-        with open(metrics_path, 'wb') as f:
-            pickle.dump({
-                'metrics': self.training_metrics,
+        self._save_metrics(directory)
+
+    def _save_metrics(self, directory: Path):
+        """Write scalar metrics as JSON and the metric arrays as a compressed .npz"""
+        metrics = dict(self.training_metrics)
+        confusion = metrics.pop('confusion_matrix', None)
+        importance = metrics.pop('feature_importance', None)
+
+        with open(directory / METRICS_JSON, 'w') as f:
+            json.dump({
+                'metrics': {k: v if isinstance(v, str) else float(v) for k, v in metrics.items()},
                 'best_params': self.best_params
-            }, f)
-        logger.info(f"Metrics saved to {metrics_path}")
+            }, f, indent=2)
+
+        arrays = {}
+        if confusion is not None:
+            arrays['cm'] = confusion
+        if importance is not None:
+            arrays['fi_index'] = importance.index.to_numpy()
+            arrays['fi_features'] = importance['feature'].to_numpy(dtype=str)
+            arrays['fi_importance'] = importance['importance'].to_numpy()
+        np.savez_compressed(directory / METRICS_ARRAYS, **arrays)
+
+        (directory / LEGACY_METRICS).unlink(missing_ok=True)
+        logger.info("Metrics saved to {}", directory / METRICS_JSON)
+
+    @staticmethod
+    def _load_metrics(directory: Path) -> tuple:
+        """
+        Read metrics written by _save_metrics (or an older training_metrics.pkl)
+
+        Args:
+            directory: Model directory
+
+        Returns:
+            (metrics, best_params), or (None, None) if no metrics were saved
+        """
+        json_path = directory / METRICS_JSON
+        if not json_path.exists():
+            legacy_path = directory / LEGACY_METRICS
+            if not legacy_path.exists():
+                return None, None
+            data = joblib.load(legacy_path)
+            return data['metrics'], data.get('best_params')
+
+        with open(json_path) as f:
+            data = json.load(f)
+        metrics = data['metrics']
+
+        arrays_path = directory / METRICS_ARRAYS
+        if arrays_path.exists():
+            with np.load(arrays_path) as arrays:
+                if 'cm' in arrays:
+                    metrics['confusion_matrix'] = arrays['cm']
+                if 'fi_features' in arrays:
+                    metrics['feature_importance'] = pd.DataFrame({
+                        'feature': arrays['fi_features'].astype(object),
+                        'importance': arrays['fi_importance']
+                    }, index=arrays['fi_index'])
+
+        return metrics, data.get('best_params')
+
+    def _export_onnx(self, onnx_path: Path):
+        """
+        Export the model to ONNX for onnxruntime inference
+
+        Requires skl2onnx; without it (or if conversion fails) any stale
+        export is removed so it can't be served for a different model.
+
+        Args:
+            onnx_path: Destination .onnx file
+
+        Returns:
+            Path of the export, or None if not exported
+        """
+        try:
+            from skl2onnx import convert_sklearn
+            from skl2onnx.common.data_types import FloatTensorType
+
+            onnx_model = convert_sklearn(
+                self.model,
+                initial_types=[('X', FloatTensorType([None, self.model.n_features_in_]))],
+                options={id(self.model): {'zipmap': False}},
+                # Released opsets only; onnxruntime rejects in-development ones
+                target_opset={'': 17, 'ai.onnx.ml': 3}
+            )
+            with open(onnx_path, 'wb') as f:
+                f.write(onnx_model.SerializeToString())
+            logger.info("ONNX model saved to {}", onnx_path)
+            return onnx_path
+
+        except Exception as e:
+            logger.warning("ONNX export skipped: {}", e)
+            onnx_path.unlink(missing_ok=True)
+            return None
 
     @classmethod
     def load(cls, directory: Path = None) -> 'ModelTrainer':
@@ -242,24 +361,25 @@ class ModelTrainer:
         directory = Path(directory)
 
         model_path = directory / "random_forest_model.pkl"
-        metrics_path = directory / "training_metrics.pkl"
 
         if not model_path.exists():
             raise FileNotFoundError(f"Model not found: {model_path}")
 
         trainer = cls()
 
-        # Load model
-        with open(model_path, 'rb') as f:
-            trainer.model = pickle.load(f)
-        logger.info(f"Model loaded from {model_path}")
+        # Load model (plain pickles from older saves load normally)
+        trainer.model = joblib.load(model_path)
+        logger.info("Model loaded from {}", model_path)
+
+        onnx_path = directory / "random_forest_model.onnx"
+        if onnx_path.exists():
+            trainer.onnx_path = onnx_path
 
         # Load metrics if available
-        if metrics_path.exists():
-            with open(metrics_path, 'rb') as f:
-                data = pickle.load(f)
-                trainer.training_metrics = data['metrics']
-                trainer.best_params = data.get('best_params')
+        metrics, best_params = cls._load_metrics(directory)
+        if metrics is not None:
+            trainer.training_metrics = metrics
+            trainer.best_params = best_params
 
         return trainer
 
@@ -0,0 +1,105 @@
+"""
+Bloom Filter
+
+Compact probabilistic set for string IDs: no false negatives, false
+positives at a bounded rate. Grows by adding larger layers once the
+configured capacity is reached, so the error rate holds as history grows.
+"""
+import hashlib
+import math
+from typing import Iterable
+
+import numpy as np
+
+
+class _BloomLayer:
+    """Fixed-size bit array with k hash functions"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def positions(self, h1: np.ndarray, h2: np.ndarray) -> np.ndarray:
+        """Bit positions (n, k) by double hashing"""
+        i = np.arange(self.num_hashes, dtype=np.uint64)
+        return (h1[:, None] + i * h2[:, None]) % np.uint64(self.num_bits)
+
+    def add(self, h1: np.ndarray, h2: np.ndarray):
+        pos = self.positions(h1, h2).ravel()
+        np.bitwise_or.at(self.bits, pos >> np.uint64(3), np.left_shift(1, pos & np.uint64(7)).astype(np.uint8))
+        self.count += len(h1)
+
+    def contains(self, h1: np.ndarray, h2: np.ndarray) -> np.ndarray:
+        pos = self.positions(h1, h2)
+        hits = (self.bits[pos >> np.uint64(3)] >> (pos & np.uint64(7)).astype(np.uint8)) & 1
+        return hits.all(axis=1)
+
+
+class BloomFilter:
+    """
+    Scalable Bloom filter of strings
+
+    Args:
+        capacity: Items in the first layer before a new one is added
+        error_rate: Target false positive rate
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        self.error_rate = error_rate
+        self._layers = [_BloomLayer(capacity, error_rate)]
+
+    @staticmethod
+    def _hashes(items) -> tuple:
+        """Two 64-bit hashes per item (blake2b, split in halves)"""
+        digests = b"".join(hashlib.blake2b(str(item).encode(), digest_size=16).digest() for item in items)
+        halves = np.frombuffer(digests, dtype=np.uint64).reshape(-1, 2)
+        return halves[:, 0], halves[:, 1] | np.uint64(1)
+
+    def update(self, items: Iterable[str]):
+        """Add many items"""
+        items = list(items)
+        h1, h2 = self._hashes(items)
+
+        start = 0
+        while start < len(items):
+            layer = self._layers[-1]
+            if layer.count >= layer.capacity:
+                layer = _BloomLayer(layer.capacity * 2, self.error_rate)
+                self._layers.append(layer)
+            end = start + (layer.capacity - layer.count)
+            layer.add(h1[start:end], h2[start:end])
+            start = end
+
+    def add(self, item: str):
+        """Add one item"""
+        self.update([item])
+
+    def contains_many(self, items: Iterable[str]) -> np.ndarray:
+        """
+        Vectorized membership test
+
+        Args:
+            items: Strings to test
+
+        Returns:
+            Boolean array, True where the item may have been added
+        """
+        items = list(items)
+        if not items:
+            return np.zeros(0, dtype=bool)
+
+        h1, h2 = self._hashes(items)
+        result = np.zeros(len(items), dtype=bool)
+        for layer in self._layers:
+            if layer.count:
+                result |= layer.contains(h1, h2)
+        return result
+
+    def __contains__(self, item: str) -> bool:
+        return bool(self.contains_many([item])[0])
+
+    def __len__(self) -> int:
+        return sum(layer.count for layer in self._layers)
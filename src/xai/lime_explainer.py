@@ -16,7 +16,13 @@ class LIMEExplainer:
     LIME-based explainer for model predictions
     """
 
-    def __init__(self, training_data: pd.DataFrame, feature_names: list, class_names: list):
+    def __init__(
+        self,
+        training_data: pd.DataFrame,
+        feature_names: list,
+        class_names: list,
+        training_data_stats: Dict = None
+    ):
         """
         Initialize LIME explainer
 
@@ -24,21 +30,40 @@ class LIMEExplainer:
             training_data: Training data for LIME reference
             feature_names: List of feature names
             class_names: List of class labels
+            training_data_stats: Optional precomputed LIME statistics (means,
+                mins, maxs, stds, bins, feature_values, feature_frequencies)
+                so the reference statistics are not recomputed from the data
         """
         self.feature_names = feature_names
         self.class_names = class_names
 
+        # One contiguous float32 copy; .values on mixed dtypes would give an
+        # object array, and float64 doubles the reference data LIME keeps
+        reference = np.ascontiguousarray(training_data.to_numpy(dtype=np.float32))
+
         self.explainer = LimeTabularExplainer(
-            training_data.values,
+            reference,
             feature_names=feature_names,
             class_names=class_names,
             mode='classification',
+            discretize_continuous=True,
+            training_data_stats=training_data_stats,
             verbose=False
         )
 
         logger.info("LIME explainer initialized")
 
-    def explain_prediction(self, model, X_instance: pd.DataFrame, num_features: int = 10) -> Dict:
+    # Perturbations per explanation; LIME's default of 5000 is rarely
+    # needed for stable top features
+    NUM_SAMPLES = 1000
+
+    def explain_prediction(
+        self,
+        model,
+        X_instance: pd.DataFrame,
+        num_features: int = 10,
+        num_samples: int = NUM_SAMPLES
+    ) -> Dict:
         """
         Generate LIME explanation for a single prediction
 
@@ -46,6 +71,7 @@ class LIMEExplainer:
             model: Trained model
             X_instance: Single instance to explain
             num_features: Number of top features to show
+            num_samples: Perturbed samples scored by the model
 
         Returns:
             Dictionary with LIME explanation
@@ -53,11 +79,17 @@ class LIMEExplainer:
         # Convert to array
         instance = X_instance.values[0] if isinstance(X_instance, pd.DataFrame) else X_instance
 
+        # All perturbations are scored in one predict_proba call; trees
+        # work in float32, so handing them float32 avoids another copy
+        def predict_fn(samples: np.ndarray) -> np.ndarray:
+            return model.predict_proba(samples.astype(np.float32, copy=False))
+
         # Generate explanation
         explanation = self.explainer.explain_instance(
             instance,
-            model.predict_proba,
-            num_features=num_features
+            predict_fn,
+            num_features=num_features,
+            num_samples=num_samples
         )
 
         # Extract feature importance
@@ -3,21 +3,126 @@ SHAP Explainer for Model Interpretability
 
 Generates SHAP explanations for Random Forest predictions.
 """
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
+import joblib
 import shap
+from joblib import Parallel, delayed, effective_n_jobs
 from typing import Dict, List
 from loguru import logger
 
 from config.settings import TOP_N_FEATURES
 
 
+@dataclass(frozen=True, eq=False)
+class FeatureImpacts:
+    """
+    SHAP impacts of every feature for one alert, kept as arrays
+
+    Explanations only need dictionaries for their top features; the rest
+    are materialized on demand with records() or to_list_of_dicts().
+    """
+    names: List[str]
+    human_names: List[str]
+    impacts: np.ndarray
+    values: np.ndarray
+    contributions: np.ndarray
+
+    def records(self, indices) -> List[Dict]:
+        """Feature dictionaries for the given feature indices, in that order"""
+        impacts = self.impacts.tolist()
+        values = self.values.tolist()
+        contributions = self.contributions.tolist()
+        return [
+            {
+                'feature': self.names[i],
+                'human_readable_name': self.human_names[i],
+                'impact_score': impacts[i],
+                'direction': 'increases_risk' if impacts[i] > 0 else 'decreases_risk',
+                'feature_value': values[i],
+                'contribution_percentage': contributions[i]
+            }
+            for i in np.asarray(indices, dtype=int).tolist()
+        ]
+
+    def to_list_of_dicts(self, start: int = 0, stop: int = None) -> List[Dict]:
+        """Feature dictionaries for a slice of features, in feature order"""
+        return self.records(range(len(self.names))[start:stop])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def _tree_shap_values(explainer, model_hash: str, values: np.ndarray, columns: tuple, direct: bool):
+    """
+    Raw TreeExplainer output for a feature matrix
+
+    model_hash is unused here; it keys the optional disk cache so entries
+    computed for another model are never returned.
+    """
+    if direct:
+        return explainer.shap_values(values, check_additivity=False)
+    return explainer.shap_values(pd.DataFrame(values, columns=list(columns)))
+
+
+@lru_cache(maxsize=1)
+def shap_releases_gil() -> bool:
+    """
+    Whether shap's Tree SHAP C extension releases the GIL
+
+    Checked once from the extension binary: code that drops the GIL
+    imports PyEval_SaveThread. Without it, threads cannot overlap the
+    traversal and explain_threaded uses processes instead.
+    """
+    try:
+        from shap import _cext
+        return b"PyEval_SaveThread" in Path(_cext.__file__).read_bytes()
+    except Exception:
+        return False
+
+
+# Per-process explainer for explain_distributed workers
+_worker_explainer = None
+
+
+def _init_distributed_worker(model, feature_names: List[str], feature_metadata: Dict):
+    """ProcessPoolExecutor initializer: build the worker's explainer once"""
+    global _worker_explainer
+    _worker_explainer = SHAPExplainer(model, feature_names, feature_metadata)
+
+
+def _explain_distributed_batch(values: np.ndarray, predictions: List[str], predicted_indices: List[int]) -> List[Dict]:
+    """Explain one batch of rows with the worker's explainer"""
+    return _worker_explainer.explain_multiple(values, predictions, predicted_indices)
+
+
 class SHAPExplainer:
     """
     Generates SHAP-based explanations for model predictions
     """
 
-    def __init__(self, model, feature_names: List[str], feature_metadata: Dict = None):
+    # Up to this many rows (the per-alert paths), SHAP skips its additivity
+    # check, which re-runs the whole forest just to validate the result
+    DIRECT_SHAP_MAX_ROWS = 4
+
+    # Below this many features a stable argsort beats argpartition's extra
+    # NumPy calls (measured crossover is several hundred features)
+    PARTITION_MIN_FEATURES = 512
+
+    def __init__(
+        self,
+        model,
+        feature_names: List[str],
+        feature_metadata: Dict = None,
+        use_cache: bool = False,
+        use_gpu: bool = None
+    ):
         """
         Initialize SHAP explainer
 
@@ -25,14 +130,74 @@ class SHAPExplainer:
             model: Trained RandomForestClassifier
             feature_names: List of feature names
             feature_metadata: Optional mapping of technical to human-readable names
+            use_cache: Keep SHAP values on disk (SHAP_CACHE_DIR), keyed on the
+                       model and feature rows, so re-explained alerts skip Tree SHAP
+            use_gpu: Run Tree SHAP on CUDA with shap's GPUTree explainer
+                     (default: the SHAP_USE_GPU setting); falls back to the
+                     CPU explainer if shap was built without CUDA
         """
         self.model = model
         self.feature_names = feature_names
         self.feature_metadata = feature_metadata or {}
 
-        # Create TreeExplainer for Random Forest
-        logger.info("Initializing SHAP TreeExplainer...")
-        self.explainer = shap.TreeExplainer(self.model)
+        # Human-readable names resolved once, aligned with feature_names
+        self._human_names = [
+            self.feature_metadata.get(name) or name.replace('_', ' ').title()
+            for name in feature_names
+        ]
+
+        if use_gpu is None:
+            from config.settings import SHAP_USE_GPU
+            use_gpu = SHAP_USE_GPU
+
+        # Create TreeExplainer for Random Forest. Path-dependent Tree SHAP
+        # uses the cover stored in the trees, so it needs no background data
+        # and never falls back to the slower interventional algorithm;
+        # base_risk is then the forest's mean predicted probability.
+        # Output layout of the installed shap is resolved once with a probe
+        # row so the per-call paths need no type checks: older releases
+        # return a list of per-class arrays, newer ones a (rows, features,
+        # classes) array. The probe also surfaces a missing CUDA build.
+        probe_row = np.zeros((1, len(feature_names)))
+        probe = None
+        if use_gpu:
+            try:
+                logger.info("Initializing SHAP GPUTree explainer...")
+                self.explainer = shap.explainers.GPUTree(
+                    self.model,
+                    feature_perturbation="tree_path_dependent",
+                    model_output="raw"
+                )
+                probe = self.explainer.shap_values(probe_row, check_additivity=False)
+            except Exception as e:
+                logger.warning("GPU SHAP unavailable, using CPU TreeExplainer: {}", e)
+
+        if probe is None:
+            logger.info("Initializing SHAP TreeExplainer...")
+            self.explainer = shap.TreeExplainer(
+                self.model,
+                feature_perturbation="tree_path_dependent",
+                model_output="raw"
+            )
+            probe = self.explainer.shap_values(probe_row, check_additivity=False)
+        self._per_class_list = isinstance(probe, list)
+        self._classes_last = not self._per_class_list and np.ndim(probe) == 3
+
+        # Base value per class (a scalar expected_value is shared by all)
+        expected = np.atleast_1d(np.asarray(self.explainer.expected_value, dtype=np.float64))
+        self._base_values = np.resize(expected, max(len(expected), len(getattr(model, 'classes_', ()))))
+
+        self._cache_enabled = use_cache
+        if use_cache:
+            from config.settings import SHAP_CACHE_DIR
+
+            # shap's version is part of the key: output layouts differ between releases
+            self._model_hash = joblib.hash((self.model, shap.__version__))
+            memory = joblib.Memory(SHAP_CACHE_DIR, verbose=0)
+            self._tree_shap = memory.cache(_tree_shap_values, ignore=['explainer'])
+        else:
+            self._model_hash = None
+            self._tree_shap = _tree_shap_values
         logger.info("SHAP explainer ready")
 
     def explain_prediction(
@@ -45,102 +210,191 @@ class SHAPExplainer:
         Generate SHAP explanation for a single prediction
 
         Args:
-            X_instance: Feature values for single alert (DataFrame with one row)
+            X_instance: Feature values for single alert (one-row DataFrame,
+                        Series, or array in feature_names order)
             predicted_class: Predicted class label
             predicted_class_idx: Index of predicted class
 
         Returns:
             Dictionary with explanation data
         """
-        # Ensure X_instance is DataFrame
-        if isinstance(X_instance, pd.Series):
-            X_instance = X_instance.to_frame().T
-
-        # Get SHAP values
-        shap_values = self.explainer.shap_values(X_instance)
+        values = self._as_matrix(X_instance)
 
-        # For multi-class, shap_values is a list of arrays (one per class)
         # Get SHAP values for the predicted class
-        if isinstance(shap_values, list):
-            shap_values_class = shap_values[predicted_class_idx][0]
-        else:
-            shap_values_class = shap_values[0]
-
-        # Get base value (expected value for predicted class)
-        if isinstance(self.explainer.expected_value, (list, np.ndarray)):
-            base_value = self.explainer.expected_value[predicted_class_idx]
-        else:
-            base_value = self.explainer.expected_value
-
-        # Create feature importance ranking
-        feature_importance = []
-        for i, feature_name in enumerate(self.feature_names):
-            impact_score = float(shap_values_class[i])
-            feature_value = float(X_instance.iloc[0, i])
-
-            # Get human-readable name
-            if self.feature_metadata and feature_name in self.feature_metadata:
-                human_readable = self.feature_metadata[feature_name]['human_readable_name']
-            else:
-                human_readable = feature_name.replace('_', ' ').title()
+        shap_values_class = self.predicted_class_shap_values(values, [predicted_class_idx])[0]
+
+        return self.explanation_from_values(
+            shap_values_class,
+            values[0],
+            predicted_class,
+            predicted_class_idx
+        )
+
+    @staticmethod
+    def _as_matrix(X) -> np.ndarray:
+        """2-D float64 feature array from a DataFrame, Series (one row) or array"""
+        if isinstance(X, pd.Series):
+            return X.to_numpy(dtype=np.float64)[None, :]
+        if isinstance(X, pd.DataFrame):
+            return X.to_numpy(dtype=np.float64)
+        return np.atleast_2d(np.asarray(X, dtype=np.float64))
+
+    def explanation_from_values(
+        self,
+        shap_values_class: np.ndarray,
+        feature_values: np.ndarray,
+        predicted_class: str,
+        predicted_class_idx: int
+    ) -> Dict:
+        """
+        Assemble the explanation dictionary for one alert
 
-            feature_importance.append({
-                'feature': feature_name,
-                'human_readable_name': human_readable,
-                'impact_score': impact_score,
-                'direction': 'increases_risk' if impact_score > 0 else 'decreases_risk',
-                'feature_value': feature_value
-            })
+        Args:
+            shap_values_class: SHAP values of the predicted class for this alert
+            feature_values: Feature values for this alert
+            predicted_class: Predicted class label
+            predicted_class_idx: Index of predicted class
 
-        # Sort by absolute impact
-        feature_importance.sort(key=lambda x: abs(x['impact_score']), reverse=True)
+        Returns:
+            Dictionary with explanation data; top_contributing_features is
+            ranked by absolute impact, all_features holds every feature as
+            FeatureImpacts arrays (in feature order)
+        """
+        # Get base value (expected value for predicted class)
+        base_value = self._base_values[predicted_class_idx]
 
-        # Calculate contribution percentages
-        total_impact = sum(abs(f['impact_score']) for f in feature_importance)
+        # Post-processing in float32 (half the bytes per ranking); sums
+        # accumulate in float64
+        impact = np.asarray(shap_values_class, dtype=np.float32)
+        abs_impact = np.abs(impact)
+        total_impact = abs_impact.sum(dtype=np.float64)
         if total_impact > 0:
-            for f in feature_importance:
-                f['contribution_percentage'] = (abs(f['impact_score']) / total_impact) * 100
+            contribution = abs_impact / np.float32(total_impact) * np.float32(100)
         else:
-            for f in feature_importance:
-                f['contribution_percentage'] = 0.0
+            contribution = np.zeros(len(impact), dtype=np.float32)
+
+        all_features = FeatureImpacts(
+            names=self.feature_names,
+            human_names=self._human_names,
+            impacts=impact,
+            values=np.asarray(feature_values, dtype=np.float64),
+            contributions=contribution
+        )
 
-        # Get top N features
-        top_features = feature_importance[:TOP_N_FEATURES]
+        # Top N by absolute impact without sorting the tail; only these
+        # become dictionaries
+        top_features = all_features.records(self._top_indices(abs_impact, TOP_N_FEATURES))
 
         explanation = {
             'explanation_method': 'SHAP',
             'predicted_class': predicted_class,
             'base_risk': float(base_value),
-            'final_risk': float(base_value + shap_values_class.sum()),
+            'final_risk': float(base_value + impact.sum(dtype=np.float64)),
             'top_contributing_features': top_features,
-            'all_features': feature_importance
+            'all_features': all_features
         }
 
         return explanation
 
+    @classmethod
+    def _top_indices(cls, abs_impact: np.ndarray, k: int) -> np.ndarray:
+        """
+        Indices of the k largest absolute impacts, largest first
+
+        For wide feature sets a partition selects them in O(F); equal
+        impacts keep feature order (including at the k-th place), matching
+        a stable full sort.
+
+        Args:
+            abs_impact: Absolute SHAP values per feature
+            k: Number of indices
+
+        Returns:
+            Index array of length min(k, F)
+        """
+        if len(abs_impact) < cls.PARTITION_MIN_FEATURES:
+            return np.argsort(-abs_impact, kind='stable')[:k]
+
+        if k < len(abs_impact):
+            kth = -np.partition(-abs_impact, k - 1)[k - 1]
+            above = np.flatnonzero(abs_impact > kth)
+            ties = np.flatnonzero(abs_impact == kth)[:k - len(above)]
+            top = np.concatenate([above, ties])
+        else:
+            top = np.arange(len(abs_impact))
+        return top[np.argsort(-abs_impact[top], kind='stable')]
+
+    def predicted_class_shap_values(self, X, predicted_indices: List[int]) -> np.ndarray:
+        """
+        SHAP values of each row's predicted class
+
+        Args:
+            X: Feature matrix (DataFrame or array in feature_names order)
+            predicted_indices: List of predicted class indices
+
+        Returns:
+            Array of shape (n_rows, n_features)
+        """
+        values = self._as_matrix(X)
+
+        # One TreeExplainer pass over the whole matrix instead of one per row
+        shap_values = self._tree_shap(
+            self.explainer,
+            self._model_hash,
+            values,
+            tuple(self.feature_names),
+            len(values) <= self.DIRECT_SHAP_MAX_ROWS
+        )
+        rows = np.arange(len(values))
+        classes = np.asarray(predicted_indices, dtype=int)
+
+        if self._per_class_list:
+            return np.stack(shap_values)[classes, rows]
+        if self._classes_last:
+            return np.asarray(shap_values)[rows, :, classes]
+        return np.asarray(shap_values)
+
     def explain_multiple(
         self,
         X: pd.DataFrame,
         predictions: List[str],
-        predicted_indices: List[int]
+        predicted_indices: List[int],
+        n_jobs: int = 1
     ) -> List[Dict]:
         """
         Generate SHAP explanations for multiple predictions
 
         Args:
-            X: Feature matrix (multiple rows)
+            X: Feature matrix (DataFrame or array in feature_names order)
             predictions: List of predicted class labels
             predicted_indices: List of predicted class indices
+            n_jobs: Worker processes for the SHAP computation (joblib
+                    convention, -1 uses all cores); rows are split into one
+                    chunk per worker and ranked afterwards in this process
 
         Returns:
             List of explanation dictionaries
         """
+        # Converted once; workers and the per-row ranking slice this array
+        feature_values = self._as_matrix(X)
+
+        workers = min(effective_n_jobs(n_jobs), len(feature_values))
+        if workers > 1:
+            chunks = np.array_split(np.arange(len(feature_values)), workers)
+            indices = np.asarray(predicted_indices, dtype=int)
+            shap_values_class = np.concatenate(Parallel(n_jobs=workers)(
+                delayed(self.predicted_class_shap_values)(feature_values[rows], indices[rows])
+                for rows in chunks
+            ))
+        else:
+            shap_values_class = self.predicted_class_shap_values(feature_values, predicted_indices)
+
         explanations = []
 
-        for i in range(len(X)):
-            X_single = X.iloc[i:i+1]
-            explanation = self.explain_prediction(
-                X_single,
+        for i in range(len(feature_values)):
+            explanation = self.explanation_from_values(
+                shap_values_class[i],
+                feature_values[i],
                 predictions[i],
                 predicted_indices[i]
             )
@@ -148,24 +402,128 @@ class SHAPExplainer:
 
         return explanations
 
-    def get_feature_summary(self, X: pd.DataFrame) -> pd.DataFrame:
+    def explain_distributed(
+        self,
+        X: pd.DataFrame,
+        predictions: List[str],
+        predicted_indices: List[int],
+        n_workers: int = None,
+        batch_size: int = 256
+    ) -> List[Dict]:
+        """
+        Explain many alerts across worker processes
+
+        Each worker builds its own TreeExplainer once (pool initializer) and
+        then explains batch_size-row batches; results come back in row order.
+        Worth it for large backlogs, where process startup and shipping the
+        model are small next to the Tree SHAP work.
+
+        Args:
+            X: Feature matrix (DataFrame or array in feature_names order)
+            predictions: List of predicted class labels
+            predicted_indices: List of predicted class indices
+            n_workers: Worker processes (default: CPU count)
+            batch_size: Rows per task
+
+        Returns:
+            List of explanation dictionaries, in row order
+        """
+        values = self._as_matrix(X)
+        starts = range(0, len(values), batch_size)
+        n_workers = min(n_workers or os.cpu_count() or 1, len(starts))
+        if n_workers <= 1:
+            return self.explain_multiple(values, predictions, predicted_indices)
+
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_distributed_worker,
+            initargs=(self.model, self.feature_names, self.feature_metadata)
+        ) as pool:
+            batches = pool.map(
+                _explain_distributed_batch,
+                [values[start:start + batch_size] for start in starts],
+                [list(predictions[start:start + batch_size]) for start in starts],
+                [list(predicted_indices[start:start + batch_size]) for start in starts]
+            )
+            return [explanation for batch in batches for explanation in batch]
+
+    def explain_threaded(
+        self,
+        X: pd.DataFrame,
+        predictions: List[str],
+        predicted_indices: List[int],
+        n_threads: int = 4
+    ) -> List[Dict]:
+        """
+        Explain many alerts with threads sharing this explainer
+
+        Contiguous row chunks run through the one TreeExplainer (read-only
+        after init) on a thread pool, avoiding process startup and model
+        copies. Only worthwhile if the installed shap releases the GIL in
+        Tree SHAP (shap_releases_gil); otherwise this defers to
+        explain_distributed.
+
+        Args:
+            X: Feature matrix (DataFrame or array in feature_names order)
+            predictions: List of predicted class labels
+            predicted_indices: List of predicted class indices
+            n_threads: Worker threads
+
+        Returns:
+            List of explanation dictionaries, in row order
+        """
+        if not shap_releases_gil():
+            logger.debug("shap holds the GIL during Tree SHAP; using worker processes")
+            return self.explain_distributed(X, predictions, predicted_indices, n_workers=n_threads)
+
+        feature_values = self._as_matrix(X)
+        n_threads = min(n_threads, len(feature_values))
+        if n_threads <= 1:
+            return self.explain_multiple(feature_values, predictions, predicted_indices)
+
+        chunks = np.array_split(np.arange(len(feature_values)), n_threads)
+        indices = np.asarray(predicted_indices, dtype=int)
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            shap_values_class = np.concatenate(list(pool.map(
+                lambda rows: self.predicted_class_shap_values(feature_values[rows], indices[rows]),
+                chunks
+            )))
+
+        return [
+            self.explanation_from_values(shap_values_class[i], feature_values[i], predictions[i], predicted_indices[i])
+            for i in range(len(feature_values))
+        ]
+
+    def get_feature_summary(self, X: pd.DataFrame, batch_size: int = 1024) -> pd.DataFrame:
         """
         Get overall feature importance across multiple predictions
 
+        SHAP values are computed batch_size rows at a time and only their
+        absolute sums are kept, so peak memory does not grow with len(X).
+
         Args:
             X: Feature matrix
+            batch_size: Rows per SHAP call
 
         Returns:
             DataFrame with mean absolute SHAP values per feature
         """
-        shap_values = self.explainer.shap_values(X)
+        abs_sum = 0.0
+        for start in range(0, len(X), batch_size):
+            shap_values = self.explainer.shap_values(X.iloc[start:start + batch_size])
+
+            # Normalise to (n_classes, n_rows, n_features)
+            if self._per_class_list:
+                shap_values = np.stack(shap_values)
+            elif self._classes_last:
+                shap_values = np.asarray(shap_values).transpose(2, 0, 1)
+            else:
+                shap_values = np.asarray(shap_values)[None]
 
-        # Average absolute SHAP values across all samples and classes
-        if isinstance(shap_values, list):
-            # Multi-class: average across classes
-            mean_abs_shap = np.mean([np.abs(sv).mean(axis=0) for sv in shap_values], axis=0)
-        else:
-            mean_abs_shap = np.abs(shap_values).mean(axis=0)
+            abs_sum = abs_sum + np.abs(shap_values).sum(axis=1)
+
+        # Average absolute SHAP values across all samples, then classes
+        mean_abs_shap = (abs_sum / max(len(X), 1)).mean(axis=0)
 
         summary_df = pd.DataFrame({
             'feature': self.feature_names,
@@ -181,7 +539,7 @@ if __name__ == "__main__":
     from src.ml_engine.model_predictor import ModelPredictor
     from src.feature_engineering.feature_extractor import FeatureExtractor
     from src.ingestion.alert_loader import AlertLoader
-    from config.settings import ALERTS_CSV_PATH, ALERT_LABELS
+    from config.settings import ALERTS_CSV_PATH
 
     # Load model and extractor
     logger.info("Loading model and feature extractor...")
@@ -205,7 +563,7 @@ if __name__ == "__main__":
     logger.info(f"Predicted: {prediction['prediction']} (confidence: {prediction['confidence']:.2%})")
 
     # Generate SHAP explanation
-    predicted_class_idx = ALERT_LABELS.index(prediction['prediction'])
+    predicted_class_idx = predictor.class_index[prediction['prediction']]
 
     explainer = SHAPExplainer(
         trainer.model,
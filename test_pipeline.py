@@ -39,6 +39,15 @@ def test_pipeline():
         alert = df[df['label'] == label].iloc[0:1]
         test_alerts.append((label, alert))
 
+    # Built once and reused for every test alert
+    predictor = ModelPredictor(trainer.model, trainer.onnx_path)
+    shap_explainer = SHAPExplainer(
+        trainer.model,
+        extractor.feature_columns,
+        extractor.feature_metadata
+    )
+    llm = LLMExplainer()
+
     # Test each alert type
     for true_label, alert in test_alerts:
         logger.info("\n" + "=" * 60)
@@ -58,7 +67,6 @@ def test_pipeline():
 
         # Step 2: ML Prediction
         logger.info("\n[2/4] ML Classification...")
-        predictor = ModelPredictor(trainer.model)
         prediction = predictor.predict(X)
         logger.info(f"✓ Prediction: {prediction['prediction'].upper()}")
         logger.info(f"✓ Confidence: {prediction['confidence']:.1%}")
@@ -66,12 +74,7 @@ def test_pipeline():
 
         # Step 3: SHAP Explanation
         logger.info("\n[3/4] Generating SHAP explanation...")
-        predicted_class_idx = ALERT_LABELS.index(prediction['prediction'])
-        shap_explainer = SHAPExplainer(
-            trainer.model,
-            extractor.feature_columns,
-            extractor.feature_metadata
-        )
+        predicted_class_idx = predictor.class_index[prediction['prediction']]
         xai_explanation = shap_explainer.explain_prediction(X, prediction['prediction'], predicted_class_idx)
         logger.info(f"✓ Top contributing features:")
         for i, feature in enumerate(xai_explanation['top_contributing_features'][:3], 1):
@@ -80,7 +83,6 @@ def test_pipeline():
         # Step 4: LLM Explanation (GPT-4)
         logger.info("\n[4/4] Generating GPT-4 explanation...")
         try:
-            llm = LLMExplainer()
             llm_explanation = llm.generate_explanation(prediction, xai_explanation, alert_data)
             logger.info(f"✓ GPT-4 Explanation:")
             logger.info(f"\n{llm_explanation['explanation_text']}\n")
@@ -88,7 +90,6 @@ def test_pipeline():
             logger.info(f"✓ Tokens Used: {llm_explanation['model_metadata']['tokens_used']}")
         except Exception as e:
             logger.warning(f"⚠ GPT-4 API Error (using fallback): {e}")
-            llm = LLMExplainer()
             llm_explanation = llm._generate_fallback_explanation(prediction, xai_explanation)
             logger.info(f"✓ Fallback Explanation:")
             logger.info(f"\n{llm_explanation['explanation_text']}\n")